@@ -198,6 +198,8 @@ class CreatorBase(
         verbose_name = "creator"
         ordering = ('name_sort', 'slug', 'publishing_is_draft')
         unique_together = ('slug', 'publishing_is_draft',)
+        # Supports keyset pagination of collection APIs
+        index_together = (('dt_modified', 'id'),)
 
     def __unicode__(self):
         return self.get_title()
@@ -401,6 +403,8 @@ class WorkBase(
         verbose_name = "work"
         ordering = ('slug', 'publishing_is_draft', )
         unique_together = ('slug', 'publishing_is_draft',)
+        # Supports keyset pagination of collection APIs
+        index_together = (('dt_modified', 'id'),)
 
     def __unicode__(self):
         if self.creation_date_display:
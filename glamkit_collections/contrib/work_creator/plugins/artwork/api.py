@@ -2,7 +2,7 @@ import rest_framework_filters as filters
 from rest_framework import routers
 
 from icekit.api.base_serializers import ModelSubSerializer
-from icekit.api.base_views import ModelViewSet
+from icekit.api.base_views import BulkWriteViewSetMixin, ModelViewSet
 from icekit.api.base_filters import CaseInsensitiveBooleanFilter, \
     WorkHasImagesFilter
 
@@ -62,14 +62,14 @@ class ArtworkFilter(filters.FilterSet):
         exclude = ('date', 'origin', 'url', 'dimensions',)
 
 
-class APIViewSet(ModelViewSet):
+class APIViewSet(BulkWriteViewSetMixin, ModelViewSet):
     """
     Artwork resource
     """
-    queryset = ArtworkModel.objects.all() \
-        .prefetch_related('creators', 'images')
+    queryset = ArtworkModel.objects.all()
 
     serializer_class = Artwork
+    modified_field = 'dt_modified'
     filter_class = ArtworkFilter
 
 
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from rest_framework import routers
 
-from icekit.api.base_views import ModelViewSet
+from icekit.api.base_views import BulkWriteViewSetMixin, ModelViewSet
 
 from ...api_serializers import MovingImageWork
 from .models import Film as FilmModel, Format as FormatModel
@@ -42,14 +42,14 @@ class Film(MovingImageWork):
             MovingImageWork.Meta.disable_unique_together_constraint_fields
 
 
-class APIViewSet(ModelViewSet):
+class APIViewSet(BulkWriteViewSetMixin, ModelViewSet):
     """
     Film resource
     """
-    queryset = FilmModel.objects.all() \
-        .prefetch_related('creators', 'images')
+    queryset = FilmModel.objects.all()
 
     serializer_class = Film
+    modified_field = 'dt_modified'
 
 
 router = routers.DefaultRouter()
@@ -1,7 +1,7 @@
 from rest_framework import routers
 from rest_framework import serializers
 
-from icekit.api.base_views import ModelViewSet
+from icekit.api.base_views import BulkWriteViewSetMixin, ModelViewSet
 
 from ...api_serializers import Creator
 from .models import OrganizationCreator as OrganizationCreatorModel
@@ -73,12 +73,13 @@ class Organization(Creator):
         return obj.get_type_plural()
 
 
-class APIViewSet(ModelViewSet):
+class APIViewSet(BulkWriteViewSetMixin, ModelViewSet):
     """
     Organization resource.
     """
     queryset = OrganizationCreatorModel.objects.all()
     serializer_class = Organization
+    modified_field = 'dt_modified'
 
 
 router = routers.DefaultRouter()
@@ -1,7 +1,7 @@
 from rest_framework import routers, serializers
 
 from icekit.api.base_serializers import ModelSubSerializer
-from icekit.api.base_views import ModelViewSet
+from icekit.api.base_views import BulkWriteViewSetMixin, ModelViewSet
 
 from ...api_serializers import Creator
 from .models import PersonCreator as PersonCreatorModel
@@ -117,12 +117,13 @@ class Person(Creator):
             Creator.Meta.disable_unique_together_constraint_fields
 
 
-class APIViewSet(ModelViewSet):
+class APIViewSet(BulkWriteViewSetMixin, ModelViewSet):
     """
     Artist resource.
     """
     queryset = PersonCreatorModel.objects.all()
     serializer_class = Person
+    modified_field = 'dt_modified'
     ordering_fields = (
             'name_display',
             'name_sort',
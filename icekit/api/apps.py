@@ -5,3 +5,20 @@ class APIConfig(AppConfig):
     name = '.'.join(__name__.split('.')[:-1])  # Package with `apps` module
     label = '_'.join(__name__.split('.')[:-1])
     verbose_name = 'ICEkitAPI'
+
+    def ready(self):
+        from .base_views import ConditionalGetMixin
+        from .caching import connect_version_signals
+        from .routers import router
+
+        # Versions are part of conditional request validators, so are bumped
+        # even if responses aren't cached, for the models of registered
+        # viewsets and the related models included in their responses.
+        versioned_models = set()
+        for prefix, viewset, basename in router.registry:
+            if not issubclass(viewset, ConditionalGetMixin):
+                continue
+            if getattr(viewset, 'queryset', None) is not None:
+                versioned_models.add(viewset.queryset.model)
+            versioned_models |= viewset().get_dependent_models()
+        connect_version_signals(versioned_models)
@@ -0,0 +1,7 @@
+from django.conf import settings
+
+ICEKIT = getattr(settings, 'ICEKIT', {})
+
+# Seconds to cache serialized responses of API viewsets that support
+# conditional requests, or `None` to disable response caching.
+API_RESPONSE_CACHE_TIMEOUT = ICEKIT.get('API_RESPONSE_CACHE_TIMEOUT', None)
@@ -1,7 +1,9 @@
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 
 import attr
 
+from django.db.models import Prefetch
+
 from rest_framework import serializers
 from rest_framework.relations import HyperlinkedIdentityField
 from rest_framework.validators import UniqueValidator, UniqueTogetherValidator
@@ -118,6 +120,10 @@ class WritableSerializerHelperMixin(object):
                     'related_1': WritableRelatedFieldSettings(
                         can_create=False, can_update=True)
                 }
+
+    When writing many records, related instances can be looked up in bulk
+    with `prefetch_related_instances` if the serializers share a
+    `related_instance_cache` dict in their context.
     """
 
     def _populate_validated_data_with_sub_field_data(self, validated_data):
@@ -131,22 +137,12 @@ class WritableSerializerHelperMixin(object):
                 if field_data:
                     validated_data.update(field_data)
 
-    def _prepare_related_single_or_m2m_relations(self, validated_data):
+    def _get_writable_related_fields(self):
         """
-        Handle writing to nested related model fields for both single and
-        many-to-many relationships.
-
-        For single relationships, any existing or new instance resulting from
-        the provided data is set back into the provided `validated_data` to
-        be applied by DjangoRestFramework's default handling.
-
-        For M2M relationships, any existing or new instances resulting from
-        the provided data are returned in a dictionary mapping M2M field names
-        to a list of instances to be related. The actual relationship is then
-        applied by `_write_related_m2m_relations` because DjangoRestFramework
-        does not support assigning M2M fields.
+        Return a list of `(fieldname, field, is_list_field, ModelClass)` for
+        the nested related model fields that can be written.
         """
-        many_to_many_relationships = {}
+        writable_fields = []
         for fieldname, field in self.get_fields().items():
             if (
                 # `ModelSubSerializer` is handled separately
@@ -162,12 +158,114 @@ class WritableSerializerHelperMixin(object):
                 continue  # Skip field
 
             is_list_field = isinstance(field, serializers.ListSerializer)
-
             if is_list_field:
                 ModelClass = field.child.Meta.model
-                field_data_list = validated_data.pop(fieldname, [])
             else:
                 ModelClass = field.Meta.model
+            writable_fields.append(
+                (fieldname, field, is_list_field, ModelClass))
+        return writable_fields
+
+    def _get_related_instance_cache(self):
+        """
+        Return the cache of related instances shared by serializers writing
+        many records, mapping `(ModelClass, lookup_field)` to a dict of lookup
+        values to instances, or `None` if there is no shared cache.
+        """
+        return self.context.get('related_instance_cache')
+
+    def prefetch_related_instances(self, validated_data_list):
+        """
+        Look up the existing related instances referred to in a list of
+        validated data for this serializer, with one `__in` query per related
+        model and lookup field, and store them in the shared related instance
+        cache so `_get_or_update_or_create_related_instance` need not query
+        for each record.
+
+        Lookup values without a matching instance are cached as `None`, while
+        values that match multiple instances are left uncached so they fail
+        as usual.
+        """
+        cache = self._get_related_instance_cache()
+        if cache is None:
+            return
+        writable_related_fields = getattr(
+            self.Meta, 'writable_related_fields', {})
+
+        lookup_values = defaultdict(set)
+        for fieldname, field, is_list_field, ModelClass \
+                in self._get_writable_related_fields():
+            field_settings = writable_related_fields.get(fieldname)
+            if not isinstance(field_settings, WritableRelatedFieldSettings):
+                continue  # Will fail properly when the record is written
+            lookup_fields = field_settings.lookup_field
+            if not isinstance(lookup_fields, (list, tuple)):
+                lookup_fields = [lookup_fields]
+            for validated_data in validated_data_list:
+                field_data_list = validated_data.get(fieldname)
+                if not field_data_list:
+                    continue
+                if not is_list_field:
+                    field_data_list = [field_data_list]
+                for field_data in field_data_list:
+                    # Use the first lookup field provided, as when writing
+                    for lookup_field in lookup_fields:
+                        if lookup_field in field_data:
+                            if field_data[lookup_field] is not None:
+                                lookup_values[(ModelClass, lookup_field)] \
+                                    .add(field_data[lookup_field])
+                            break
+
+        for (ModelClass, lookup_field), values in lookup_values.items():
+            instances = cache.setdefault((ModelClass, lookup_field), {})
+            values = values.difference(instances)
+            if not values:
+                continue
+            found = {}
+            ambiguous = set()
+            for instance in ModelClass.objects.filter(
+                    **{'%s__in' % lookup_field: values}):
+                value = getattr(instance, lookup_field)
+                if value in found:
+                    ambiguous.add(value)
+                found[value] = instance
+            for value in values.difference(ambiguous):
+                instances[value] = found.get(value)
+
+    def _get_related_instance(self, ModelClass, lookup_field, lookup_value):
+        """
+        Return the related instance for the lookup, from the shared related
+        instance cache if possible.
+        """
+        cache = self._get_related_instance_cache()
+        instances = (cache or {}).get((ModelClass, lookup_field), {})
+        if lookup_value in instances:
+            if instances[lookup_value] is None:
+                raise ModelClass.DoesNotExist
+            return instances[lookup_value]
+        return ModelClass.objects.get(**{lookup_field: lookup_value})
+
+    def _prepare_related_single_or_m2m_relations(self, validated_data):
+        """
+        Handle writing to nested related model fields for both single and
+        many-to-many relationships.
+
+        For single relationships, any existing or new instance resulting from
+        the provided data is set back into the provided `validated_data` to
+        be applied by DjangoRestFramework's default handling.
+
+        For M2M relationships, any existing or new instances resulting from
+        the provided data are returned in a dictionary mapping M2M field names
+        to a list of instances to be related. The actual relationship is then
+        applied by `_write_related_m2m_relations` because DjangoRestFramework
+        does not support assigning M2M fields.
+        """
+        many_to_many_relationships = {}
+        for fieldname, field, is_list_field, ModelClass \
+                in self._get_writable_related_fields():
+            if is_list_field:
+                field_data_list = validated_data.pop(fieldname, [])
+            else:
                 field_data_list = validated_data.pop(fieldname, None)
                 field_data_list = field_data_list and [field_data_list] or []
 
@@ -275,8 +373,8 @@ class WritableSerializerHelperMixin(object):
 
         # Fetch existing instance using lookup field
         try:
-            related_instance = ModelClass.objects.get(
-                **{lookup_field: lookup_value})
+            related_instance = self._get_related_instance(
+                ModelClass, lookup_field, lookup_value)
 
             # Update existing related instance with values provided in
             # parent's create/update operation, if such updates are
@@ -324,6 +422,12 @@ class WritableSerializerHelperMixin(object):
             field_data.update({lookup_field: lookup_value})
             related_instance = ModelClass.objects.create(**field_data)
 
+            # Make the new instance available to later records in bulk writes
+            cache = self._get_related_instance_cache()
+            if cache is not None:
+                cache.setdefault((ModelClass, lookup_field), {})[
+                    lookup_value] = related_instance
+
         return related_instance
 
     def _write_related_m2m_relations(self, obj, many_to_many_relationships):
@@ -384,10 +488,13 @@ class PolymorphicHyperlinkedModelSerializer(
     serializer_url_field = PolymorphicHyperlinkedRelatedField
 
     def get_child_detail_view_name(self, obj):
-        real_obj = obj.get_real_instance()
+        # Look up the real class from the polymorphic content type, which is
+        # cached by Django, instead of fetching the real child instance from
+        # the DB for every object we serialize.
+        real_class = obj.get_real_instance_class()
         return self.get_child_view_name_data().get(
-            type(real_obj),
-            'TODO-add-child-detail-view-name-for-type-%s' % type(real_obj)
+            real_class,
+            'TODO-add-child-detail-view-name-for-type-%s' % real_class
         ) + '-detail'
 
     def get_child_view_name_data(self, obj):
@@ -427,3 +534,111 @@ class DisableUniqueTogetherValidatorMixin(object):
                 )
             ]
         return validators
+
+
+def _prefix_related_lookup(prefix, lookup):
+    """
+    Return the given `select_related` or `prefetch_related` lookup, which may
+    be a `Prefetch` object, relative to the relationship at `prefix`.
+    """
+    if isinstance(lookup, Prefetch):
+        return Prefetch(
+            '%s__%s' % (prefix, lookup.prefetch_through),
+            queryset=lookup.queryset,
+        )
+    return '%s__%s' % (prefix, lookup)
+
+
+def get_serializer_related_lookups(serializer_class, field_names=None):
+    """
+    Return a 2-tuple of `select_related` and `prefetch_related` lookups that
+    must be applied to a queryset to serialize its items with the given
+    serializer class without triggering further per-item queries.
+
+    Lookups are derived from the nested serializer fields declared on the
+    serializer class:
+
+    - nested `ModelSerializer` fields map to `select_related` of the field's
+      source relationship, plus the nested serializer's own lookups
+    - nested `ListSerializer` fields (i.e. `many=True`) map to a `Prefetch`
+      of the field's source relationship, with the nested serializer's own
+      lookups applied to the prefetch queryset
+    - `ModelSubSerializer` fields contribute their own lookups directly since
+      they use the same instance as the parent
+
+    Relationships touched in other ways, such as by `SerializerMethodField`s,
+    can be declared explicitly in `select_related` and `prefetch_related`
+    tuples in the serializer's `Meta` class.
+
+    If `field_names` is given, only lookups for these fields are returned.
+    """
+    meta = getattr(serializer_class, 'Meta', None)
+    select_related = list(getattr(meta, 'select_related', ()))
+    prefetch_related = list(getattr(meta, 'prefetch_related', ()))
+
+    meta_fields = getattr(meta, 'fields', None)
+    if meta_fields == serializers.ALL_FIELDS:
+        meta_fields = None
+
+    for fieldname, field in serializer_class._declared_fields.items():
+        if meta_fields is not None and fieldname not in meta_fields:
+            continue
+        if field_names is not None and fieldname not in field_names:
+            continue
+        source = (field.source or fieldname).replace('.', '__')
+        if source == '*':
+            continue
+
+        if isinstance(field, ModelSubSerializer):
+            sub_select, sub_prefetch = \
+                get_serializer_related_lookups(type(field))
+            select_related.extend(sub_select)
+            prefetch_related.extend(sub_prefetch)
+        elif (
+            isinstance(field, serializers.ListSerializer) and
+            isinstance(field.child, serializers.ModelSerializer)
+        ):
+            child_class = type(field.child)
+            child_select, child_prefetch = \
+                get_serializer_related_lookups(child_class)
+            queryset = child_class.Meta.model._default_manager.all()
+            if child_select:
+                queryset = queryset.select_related(*child_select)
+            if child_prefetch:
+                queryset = queryset.prefetch_related(*child_prefetch)
+            prefetch_related.append(Prefetch(source, queryset=queryset))
+        elif isinstance(field, serializers.ModelSerializer):
+            child_select, child_prefetch = \
+                get_serializer_related_lookups(type(field))
+            select_related.append(source)
+            select_related.extend(
+                _prefix_related_lookup(source, lookup)
+                for lookup in child_select)
+            prefetch_related.extend(
+                _prefix_related_lookup(source, lookup)
+                for lookup in child_prefetch)
+
+    return select_related, prefetch_related
+
+
+def get_serializer_models(serializer_class):
+    """
+    Return the set of models whose items are included in the output of the
+    given serializer class by its nested serializer fields, recursively, not
+    including the serializer's own model.
+
+    Models touched in other ways, such as by `SerializerMethodField`s, can be
+    declared explicitly in a `dependent_models` tuple in the serializer's
+    `Meta` class.
+    """
+    meta = getattr(serializer_class, 'Meta', None)
+    models = set(getattr(meta, 'dependent_models', ()))
+    for field in serializer_class._declared_fields.values():
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        if isinstance(field, ModelSubSerializer):
+            models.update(get_serializer_models(type(field)))
+        elif isinstance(field, serializers.ModelSerializer):
+            models.add(field.Meta.model)
+            models.update(get_serializer_models(type(field)))
+    return models
@@ -1,18 +1,325 @@
-from django.core.exceptions import FieldError
+import hashlib
+from calendar import timegm
 
+from django.core.exceptions import FieldError, ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
 from django.http import Http404, HttpResponseRedirect
-from rest_framework import viewsets
+from django.utils.encoding import force_bytes, force_text
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, \
+    quote_etag
+from django.utils.translation import get_language
+
+from rest_framework import status, viewsets
+from rest_framework.decorators import list_route
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 
+from drf_queryfields import QueryFieldsMixin
+
+from icekit.publishing.middleware import is_draft_request_context
+
+from . import appsettings, caching
+from .base_serializers import get_serializer_models, \
+    get_serializer_related_lookups
+
+
+class ConditionalGetMixin(object):
+    """
+    Mixin for model viewsets to support conditional `GET` requests, with
+    `ETag` and `Last-Modified` headers, for listings and item details, and to
+    cache serialized responses if the `API_RESPONSE_CACHE_TIMEOUT` setting in
+    `ICEKIT` is set.
+
+    Viewsets must name their last-modified field in `modified_field`.
+
+    For listings the validators are derived from the latest modified value and
+    the count of all the filtered results, which takes one aggregate query, so
+    a `304 Not Modified` response needs no items to be fetched or serialized.
+    They also vary by host, URL, query parameters, language and draft context,
+    and by the API response versions of the model and of the related models
+    included in responses, which are bumped on save, delete and publish
+    signals, see `icekit.api.caching`.
+
+    Related models are found from the serializer's nested serializer fields,
+    see `get_serializer_models`, and others can be listed in
+    `dependent_models`.
+    """
+    modified_field = None
+    dependent_models = ()
+
+    def get_dependent_models(self):
+        """
+        Return the related models whose changes can change responses.
+        """
+        return set(self.dependent_models) | \
+            get_serializer_models(self.get_serializer_class())
+
+    def get_etag(self, count, last_modified, model):
+        parts = [
+            # Responses include absolute URLs
+            self.request.get_host(),
+            self.request.get_full_path(),
+            self.request.accepted_renderer.format,
+            get_language(),
+            is_draft_request_context(),
+            count,
+            last_modified and last_modified.isoformat(),
+            caching.get_model_version(model),
+        ]
+        dependent_models = sorted(
+            self.get_dependent_models(),
+            key=lambda m: (m._meta.app_label, m._meta.model_name))
+        parts.extend(caching.get_model_version(m) for m in dependent_models)
+        return hashlib.md5(
+            force_bytes(u'|'.join(force_text(p) for p in parts))).hexdigest()
+
+    def get_not_modified_response(self, request, etag, last_modified):
+        """
+        Return a `304 Not Modified` response if the request's conditions
+        match the validators, otherwise `None`.
+
+        `last_modified` is `None` if it doesn't change with every change to
+        the response, in which case only the `ETag` is checked.
+        """
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            if etag in etags or '*' in etags:
+                return Response(status=status.HTTP_304_NOT_MODIFIED)
+            return None
+        if_modified_since = parse_http_date_safe(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'))
+        if (
+            if_modified_since and last_modified and
+            timegm(last_modified.utctimetuple()) <= if_modified_since
+        ):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return None
+
+    def get_conditional_response(self, etag, last_modified, get_response,
+                                 last_modified_is_validator=True):
+        """
+        Return a `304 Not Modified` response, a cached response, or the
+        response from calling `get_response`, with validator headers set.
+        """
+        response = self.get_not_modified_response(
+            self.request,
+            etag,
+            last_modified if last_modified_is_validator else None,
+        )
+        if response is None:
+            timeout = appsettings.API_RESPONSE_CACHE_TIMEOUT
+            data = None
+            if timeout:
+                data = caching.get_cached_response_data(etag)
+            if data is not None:
+                response = Response(data)
+            else:
+                response = get_response()
+                if timeout and response.status_code == status.HTTP_200_OK:
+                    caching.set_cached_response_data(
+                        etag, response.data, timeout)
+        response['ETag'] = quote_etag(etag)
+        if last_modified:
+            response['Last-Modified'] = http_date(
+                timegm(last_modified.utctimetuple()))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if not self.modified_field:
+            return super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        state = queryset.order_by().aggregate(
+            count=Count('pk'), last_modified=Max(self.modified_field))
+        etag = self.get_etag(
+            state['count'], state['last_modified'], queryset.model)
+        return self.get_conditional_response(
+            etag,
+            state['last_modified'],
+            lambda: super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs),
+            # The latest modified value doesn't change when items are
+            # deleted or unpublished
+            last_modified_is_validator=False,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.modified_field:
+            return super(ConditionalGetMixin, self).retrieve(
+                request, *args, **kwargs)
+        instance = self.get_object()
+        last_modified = getattr(instance, self.modified_field)
+        etag = self.get_etag(1, last_modified, type(instance))
+        return self.get_conditional_response(
+            etag,
+            last_modified,
+            lambda: Response(self.get_serializer(instance).data),
+            # Nor when related items included in the response change
+            last_modified_is_validator=not self.get_dependent_models(),
+        )
+
 
-class ModelViewSet(viewsets.ModelViewSet):
+class ModelViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ICEkit default API model viewset, ready for any customisation required.
+
+    The related lookups required by the serializer class are applied to the
+    queryset automatically, see `get_serializer_related_lookups`, and
+    conditional requests are supported, see `ConditionalGetMixin`.
     """
     lookup_field = 'pk'
 
+    def get_serializer_field_names(self):
+        """
+        Return the set of field names requested with the `fields` query
+        parameter if the serializer supports it, or `None` for all fields.
+        """
+        request = getattr(self, 'request', None)
+        if request is None or request.method != 'GET':
+            return None
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, QueryFieldsMixin):
+            return None
+        field_names = set(
+            name
+            for names in request.query_params.getlist(
+                serializer_class.include_arg_name)
+            for name in names.split(serializer_class.delimiter)
+            if name
+        )
+        return field_names or None
+
+    def get_queryset(self):
+        queryset = super(ModelViewSet, self).get_queryset()
+        select_related, prefetch_related = get_serializer_related_lookups(
+            self.get_serializer_class(),
+            field_names=self.get_serializer_field_names(),
+        )
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class BulkWriteViewSetMixin(object):
+    """
+    Mixin for model viewsets to add a `bulk/` endpoint that accepts a `POST`
+    of a list of records to create, or to update if the record includes the
+    ID of an existing item, and returns a result for each record.
+
+    Instead of looking up the related instances of every record one by one,
+    all related lookups for the valid records are resolved together with one
+    `__in` query per related model and lookup field, see
+    `WritableSerializerHelperMixin.prefetch_related_instances`, and existing
+    items are fetched with one query.
+
+    All records are written in one transaction, with a savepoint per record
+    so a failed record does not prevent writing the others.
+    """
+    bulk_lookup_field = 'id'
+
+    def check_bulk_update_permissions(self, request):
+        """
+        Require the permissions for updating items, in addition to the
+        permissions for `POST` that are already checked.
+        """
+        model = self.get_queryset().model
+        for permission in self.get_permissions():
+            if not hasattr(permission, 'get_required_permissions'):
+                continue
+            perms = permission.get_required_permissions('PUT', model)
+            if not request.user.has_perms(perms):
+                self.permission_denied(request)
+
+    @list_route(methods=['post'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        records = request.data
+        if not isinstance(records, list) or \
+                not all(isinstance(r, dict) for r in records):
+            return Response(
+                {'detail': 'Expected a list of records.'},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        ids = [
+            r[self.bulk_lookup_field] for r in records
+            if r.get(self.bulk_lookup_field) not in (None, '')
+        ]
+        if ids:
+            self.check_bulk_update_permissions(request)
+        try:
+            existing = dict(
+                (force_text(pk), instance)
+                for pk, instance in self.get_queryset().in_bulk(ids).items()
+            )
+        except (TypeError, ValueError):
+            return Response(
+                {'detail': 'Invalid %s value.' % self.bulk_lookup_field},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        # Serializers share a context, and so a related instance cache
+        context = self.get_serializer_context()
+        context['related_instance_cache'] = {}
+        serializer_class = self.get_serializer_class()
+
+        results = []
+        valid_serializers = []
+        for record in records:
+            instance = None
+            record_id = record.get(self.bulk_lookup_field)
+            if record_id not in (None, ''):
+                instance = existing.get(force_text(record_id))
+                if instance is None:
+                    results.append({
+                        'status': status.HTTP_404_NOT_FOUND,
+                        'errors': {'detail': 'Not found.'},
+                    })
+                    continue
+            serializer = serializer_class(
+                instance, data=record, context=context)
+            if serializer.is_valid():
+                valid_serializers.append(serializer)
+                results.append(serializer)
+            else:
+                results.append({
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'errors': serializer.errors,
+                })
+
+        if valid_serializers:
+            valid_serializers[0].prefetch_related_instances(
+                [s.validated_data for s in valid_serializers])
+
+        with transaction.atomic():
+            for i, result in enumerate(results):
+                if isinstance(result, dict):
+                    continue
+                serializer = result
+                is_create = serializer.instance is None
+                try:
+                    with transaction.atomic():
+                        serializer.save()
+                except (TypeError, ValidationError, IntegrityError) as ex:
+                    # Instances cached while writing this record may have
+                    # been rolled back
+                    context['related_instance_cache'].clear()
+                    results[i] = {
+                        'status': status.HTTP_400_BAD_REQUEST,
+                        'errors': {'detail': force_text(ex)},
+                    }
+                    continue
+                results[i] = {
+                    'status': is_create and status.HTTP_201_CREATED
+                    or status.HTTP_200_OK,
+                    self.bulk_lookup_field: getattr(
+                        serializer.instance, self.bulk_lookup_field),
+                }
+
+        return Response(results)
+
 
 class RedirectViewset(viewsets.ReadOnlyModelViewSet):
     lookup_field = 'slug'
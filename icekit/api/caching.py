@@ -0,0 +1,131 @@
+"""
+Versioning of API responses per model, so cached responses are invalidated
+when items of the model, or content related to them, change.
+"""
+import time
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from fluent_contents.models import ContentItem
+
+from icekit.publishing import signals as publishing_signals
+
+VERSION_CACHE_KEY = 'icekit-api-version:%s'
+RESPONSE_CACHE_KEY = 'icekit-api-response:%s'
+
+# Models whose API response versions are bumped, and their subclasses, see
+# `connect_version_signals()`.
+_versioned_models = ()
+
+
+def _get_model_version_keys(model):
+    """
+    Return the version cache keys for a model and its concrete parents, since
+    changes to a child item of a polymorphic model affect parent listings too.
+    """
+    models = [model._meta.concrete_model] + \
+        list(model._meta.get_parent_list())
+    return [
+        VERSION_CACHE_KEY % '%s.%s' % (m._meta.app_label, m._meta.model_name)
+        for m in models
+    ]
+
+
+def get_model_version(model):
+    """
+    Return the current API response version for the model.
+    """
+    key = _get_model_version_keys(model)[0]
+    version = cache.get(key)
+    if version is None:
+        # Start from the current time, not 1, to avoid reusing the version of
+        # any responses still cached after the version key was evicted.
+        version = int(time.time() * 1000)
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+def bump_model_version(model):
+    """
+    Invalidate cached API responses for the model and its parents.
+    """
+    for key in _get_model_version_keys(model):
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass  # No version yet, so nothing to invalidate
+
+
+def is_versioned_model(model):
+    return isinstance(model, type) and issubclass(model, _versioned_models)
+
+
+def bump_model_version_for_instance(sender, instance, **kwargs):
+    """
+    Signal handler to invalidate cached API responses for the model of a
+    saved, deleted or (un)published instance, or of the parent of a content
+    item.
+    """
+    if is_versioned_model(type(instance)):
+        bump_model_version(type(instance))
+    if isinstance(instance, ContentItem) and instance.parent_type_id:
+        parent_model = ContentType.objects.get_for_id(
+            instance.parent_type_id).model_class()
+        if is_versioned_model(parent_model):
+            bump_model_version(parent_model)
+
+
+def bump_model_versions_for_m2m(sender, instance, action, model, **kwargs):
+    """
+    Signal handler to invalidate cached API responses for the models on both
+    sides of changed many-to-many relationships.
+    """
+    if not action.startswith('post_'):
+        return
+    bump_model_version_for_instance(sender, instance)
+    if is_versioned_model(model):
+        bump_model_version(model)
+
+
+def connect_version_signals(versioned_models):
+    """
+    Bump the API response versions of `versioned_models`, and of their
+    subclasses, when their items change, or the content items or
+    many-to-many relationships of their items do.
+    """
+    global _versioned_models
+    _versioned_models = tuple(versioned_models)
+    for model in apps.get_models():
+        if not (is_versioned_model(model) or issubclass(model, ContentItem)):
+            continue
+        for signal in (
+            post_save,
+            post_delete,
+            publishing_signals.publishing_post_publish,
+            publishing_signals.publishing_post_unpublish,
+        ):
+            signal.connect(
+                bump_model_version_for_instance,
+                sender=model,
+                dispatch_uid='icekit_api_bump_model_version',
+            )
+    for model in apps.get_models():
+        for field in model._meta.many_to_many:
+            if is_versioned_model(model) or is_versioned_model(field.rel.to):
+                m2m_changed.connect(
+                    bump_model_versions_for_m2m,
+                    sender=field.rel.through,
+                    dispatch_uid='icekit_api_bump_model_version',
+                )
+
+
+def get_cached_response_data(etag):
+    return cache.get(RESPONSE_CACHE_KEY % etag)
+
+
+def set_cached_response_data(etag, data, timeout):
+    cache.set(RESPONSE_CACHE_KEY % etag, data, timeout)
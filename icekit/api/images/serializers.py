@@ -53,6 +53,9 @@ class ImageSerializer(
             'image',
             'width',
             'height',
+            'image_size',
+            'image_content_type',
+            'image_hash',
             'title',
             'alt_text',
             'caption',
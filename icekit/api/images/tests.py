@@ -1,11 +1,19 @@
+import base64
+import json
+
 from django.apps import apps
+from django.utils import six
+from django.utils.encoding import force_bytes
 
 from django_dynamic_fixture import G
+from mock import patch
 
 from icekit.utils.testing import get_test_image, setup_with_context_manager
 
 from .. import base_tests
 from ..base_tests import Image
+from ..pagination import KeysetPagination
+from .views import ImageViewSet
 
 MediaCategory = apps.get_model('icekit.MediaCategory')
 
@@ -43,6 +51,9 @@ class ImageAPITests(base_tests._BaseAPITestCase):
                     'image': 'http://testserver%s' % self.image.image.url,
                     'width': self.image.width,
                     'height': self.image.height,
+                    'image_size': self.image.image_size,
+                    'image_content_type': self.image.image_content_type,
+                    'image_hash': self.image.image_hash,
                     'title': self.image.title,
                     'alt_text': self.image.alt_text,
                     'caption': self.image.caption,
@@ -88,6 +99,9 @@ class ImageAPITests(base_tests._BaseAPITestCase):
                 'image': 'http://testserver%s' % self.image.image.url,
                 'width': self.image.width,
                 'height': self.image.height,
+                'image_size': self.image.image_size,
+                'image_content_type': self.image.image_content_type,
+                'image_hash': self.image.image_hash,
                 'title': self.image.title,
                 'alt_text': self.image.alt_text,
                 'caption': self.image.caption,
@@ -118,6 +132,11 @@ class ImageAPITests(base_tests._BaseAPITestCase):
         self.assertEqual(201, response.status_code)
         new_image = Image.objects.get(pk=response.data['id'])
         self.assertEqual('New image', new_image.title)
+        # File metadata is recorded on upload
+        self.assertEqual(self.image.image.size, new_image.image_size)
+        self.assertEqual(self.image.image_hash, new_image.image_hash)
+        self.assertEqual(64, len(new_image.image_hash))
+        self.assertTrue(new_image.image_content_type.startswith('image/'))
 
     def test_replace_image_with_put(self):
         response = self.client.get(self.detail_url(self.image.pk))
@@ -284,3 +303,45 @@ class ImageAPITests(base_tests._BaseAPITestCase):
         self.assertEqual(
             set(['New category 1', 'New category 2']),
             set([c.name for c in updated_image.categories.all()]))
+
+    def test_list_images_with_keyset_pagination(self):
+        for i in range(4):
+            G(Image, title='Another image %d' % i)
+        expected_ids = list(
+            Image.objects.order_by('date_modified', 'pk')
+            .values_list('pk', flat=True))
+
+        with patch.object(ImageViewSet, 'pagination_class', KeysetPagination):
+            response = self.client.get(
+                self.listing_url() + '?page_size=2&count=1')
+            self.assertEqual(200, response.status_code)
+            # Count may be an estimate, depending on the DB
+            self.assertTrue('count' in response.data)
+            listed_ids = [item['id'] for item in response.data['results']]
+
+            while response.data['next']:
+                response = self.client.get(response.data['next'])
+                self.assertEqual(200, response.status_code)
+                self.assertFalse('count' in response.data)
+                listed_ids += [item['id'] for item in response.data['results']]
+
+            # Malformed cursors are not found, rather than server errors
+            for position in (
+                    'bogus',
+                    [None, 1],
+                    ['2017-01-01T00:00:00', 'bogus'],
+                    ['bogus', 1],
+                    [1, 1],
+                    {'a': 1},
+            ):
+                if isinstance(position, six.string_types):
+                    cursor = position
+                else:
+                    cursor = base64.urlsafe_b64encode(
+                        force_bytes(json.dumps(position))).decode('ascii')
+                response = self.client.get(
+                    self.listing_url() + '?cursor=' + cursor)
+                self.assertEqual(404, response.status_code)
+                self.assertEqual('Invalid cursor', response.data['detail'])
+
+        self.assertEqual(expected_ids, listed_ids)
@@ -2,6 +2,7 @@ from django.apps import apps
 
 from rest_framework import viewsets
 
+from icekit.api.base_views import ConditionalGetMixin
 from icekit.utils.pagination import ICEKitAPIPagination
 
 from . import serializers
@@ -10,12 +11,13 @@ from . import serializers
 Image = apps.get_model('icekit_plugins_image.Image')
 
 
-class ImageViewSet(viewsets.ModelViewSet):
+class ImageViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     Read and write viewset for image objects.
     """
     pagination_class = ICEKitAPIPagination
     serializer_class = serializers.ImageSerializer
+    modified_field = 'date_modified'
     # NOTE: `get_queryset` method is used instead of this `queryset` class
     # attribute to return results, but we still need this defined here so
     # the API router can auto-generate the right endpoint URL and apply
@@ -3,6 +3,8 @@ from fluent_pages.models import Page
 from rest_framework import serializers
 from drf_queryfields import QueryFieldsMixin
 
+from icekit.utils.fluent_contents import render_content_item
+
 
 class ContentSerializer(serializers.Serializer):
     """
@@ -11,7 +13,7 @@ class ContentSerializer(serializers.Serializer):
     content = serializers.SerializerMethodField()
 
     def get_content(self, obj):
-        return obj.plugin.render(self.context['request'], obj)
+        return render_content_item(self.context['request'], obj).html
 
 
 class PageSerializer(QueryFieldsMixin, serializers.ModelSerializer):
@@ -31,11 +33,19 @@ class PageSerializer(QueryFieldsMixin, serializers.ModelSerializer):
     def get_content(self, obj):
         """
         Obtain the QuerySet of content items.
+
+        Items are fetched as their base class so that cached output can be
+        used without querying each item's derived data. This method is only
+        called when the `content` field is requested.
+
         :param obj: Page object.
         :return: List of rendered content items.
         """
+        content_items = obj.contentitem_set \
+            .non_polymorphic() \
+            .select_related('placeholder')
         serializer = ContentSerializer(
-            instance=obj.contentitem_set.all(),
+            instance=content_items,
             many=True,
             context=self.context,
         )
@@ -1,4 +1,7 @@
 from django_dynamic_fixture import G
+from mock import patch
+
+from fluent_contents.plugins.rawhtml.content_plugins import RawHtmlPlugin
 
 from fluent_contents.plugins.rawhtml.models import RawHtmlItem
 
@@ -57,6 +60,55 @@ class PagesAPITests(base_tests._BaseAPITestCase):
             },
             response.data)
 
+    def test_list_pages_with_conditional_get(self):
+        self.layoutpage_1.publish()
+        response = self.client.get(self.listing_url())
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.has_header('Last-Modified'))
+        etag = response['ETag']
+
+        response = self.client.get(
+            self.listing_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+
+        # Validators differ by query parameters
+        response = self.client.get(
+            self.listing_url() + '?fields=title', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+
+        # Publishing another page changes the listing
+        LayoutPage.objects.create(
+            author=self.superuser,
+            title='Another LayoutPage',
+            layout=self.layout_1,
+        ).publish()
+        response = self.client.get(
+            self.listing_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
+
+    def test_page_content_is_rendered_from_cache(self):
+        self.layoutpage_1.publish()
+        published_id = self.layoutpage_1.get_published().id
+        response = self.client.get(self.detail_url(published_id))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            ['<b>test 1</b>', '<b>test 2</b>', '<b>test 3</b>'],
+            [item['content'] for item in response.data['content']])
+
+        # Cached output is used rather than rendering the items again
+        with patch.object(RawHtmlPlugin, 'render') as render:
+            response = self.client.get(self.detail_url(published_id))
+            self.assertEqual(
+                ['<b>test 1</b>', '<b>test 2</b>', '<b>test 3</b>'],
+                [item['content'] for item in response.data['content']])
+            self.assertFalse(render.called)
+
+            # Content isn't rendered at all when it isn't requested
+            response = self.client.get(
+                self.detail_url(published_id) + '?fields=title')
+            self.assertEqual({'title': 'Test LayoutPage'}, response.data)
+
     def test_page_api(self):
         self.layoutpage_1.publish()
         for j in range(20):
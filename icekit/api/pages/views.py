@@ -5,16 +5,18 @@ from rest_framework.permissions import AllowAny
 from rest_framework.decorators import permission_classes
 
 from . import serializers
+from icekit.api.base_views import ConditionalGetMixin
 from icekit.utils.pagination import ICEKitAPIPagination
 
 
 @permission_classes((AllowAny, ))
-class PageViewSet(viewsets.ReadOnlyModelViewSet):
+class PageViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     Read only viewset for published page objects.
     """
     pagination_class = ICEKitAPIPagination
     serializer_class = serializers.PageSerializer
+    modified_field = 'modification_date'
     # NOTE: `get_queryset` method is used instead of this `queryset` class
     # attribute to return results, but we still need this defined here so
     # the API router can auto-generate the right page endpoint URL.
@@ -1,5 +1,19 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_bytes, force_text
+
+from rest_framework.compat import coreapi
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, \
+    replace_query_param
 
 
 class DefaultPageNumberPagination(PageNumberPagination):
@@ -16,3 +30,163 @@ class SlowPageNumberPagination(PageNumberPagination):
     page_size = 1
     page_size_query_param = 'page_size'
     max_page_size = 5
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (or "seek") pagination on a stable `(modified, pk)` ordering,
+    suitable for clients like harvesters that walk through an entire resource.
+
+    Unlike page number pagination, which uses OFFSET and a COUNT(*) query for
+    every page, each page is fetched by filtering on the position of the last
+    item in the previous page. Fetching deep pages is therefore as cheap as
+    fetching the first page. Because items are ordered by last-modified time,
+    clients can also resume syncing from a stored cursor.
+
+    The position is returned as an opaque `cursor` in the `next` link. A
+    `count` of results, which is approximate where the DB can estimate it
+    cheaply, is included only if the client asks for it with `?count=1`.
+
+    Views set the name of the last-modified field to order by with a
+    `modified_field` attribute, or `None` to order by `pk` only.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    modified_field = 'modified'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.modified_field = getattr(
+            view, 'modified_field', self.modified_field)
+
+        if self.modified_field:
+            queryset = queryset.order_by(self.modified_field, 'pk')
+        else:
+            queryset = queryset.order_by('pk')
+
+        self.count = None
+        if self.is_count_requested(request):
+            self.count = self.get_approximate_count(queryset)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(*position))
+
+        # Fetch one extra item to find out if there is a next page
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                page_size = int(
+                    request.query_params[self.page_size_query_param])
+                if page_size > 0:
+                    return min(page_size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def is_count_requested(self, request):
+        return request.query_params.get(self.count_query_param) \
+            in ('1', 'true', 'True')
+
+    def get_approximate_count(self, queryset):
+        """
+        Return the planner's row estimate for the queryset on PostgreSQL,
+        which avoids a full COUNT(*), or an exact count on other DBs.
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return queryset.count()
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+        if not isinstance(plan, list):
+            plan = json.loads(plan)
+        return plan[0]['Plan']['Plan Rows']
+
+    def get_position_filter(self, modified, pk):
+        """
+        Return a filter matching items after the given position.
+        """
+        if not self.modified_field:
+            return Q(pk__gt=pk)
+        return (
+            Q(**{'%s__gt' % self.modified_field: modified}) |
+            Q(**{self.modified_field: modified, 'pk__gt': pk})
+        )
+
+    def encode_cursor(self, obj):
+        modified = None
+        if self.modified_field:
+            modified = getattr(obj, self.modified_field).isoformat()
+        data = json.dumps([modified, obj.pk])
+        return force_text(base64.urlsafe_b64encode(force_bytes(data)))
+
+    def decode_cursor(self, request):
+        """
+        Return the `(modified, pk)` position encoded in the request's cursor,
+        or `None` if no cursor was provided.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            modified, pk = json.loads(force_text(
+                base64.urlsafe_b64decode(force_bytes(encoded))))
+            pk = int(pk)
+            if self.modified_field:
+                modified = parse_datetime(modified)
+                if modified is None:
+                    raise ValueError
+            else:
+                modified = None
+        except (TypeError, ValueError):
+            raise NotFound('Invalid cursor')
+        return modified, pk
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        # Only the first page includes the count, if requested
+        url = remove_query_param(self.base_url, self.count_query_param)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        response_data = OrderedDict()
+        if self.count is not None:
+            response_data['count'] = self.count
+        response_data['next'] = self.get_next_link()
+        response_data['results'] = data
+        return Response(response_data)
+
+    def get_schema_fields(self, view):
+        assert coreapi is not None, \
+            'coreapi must be installed to use `get_schema_fields()`'
+        return [
+            coreapi.Field(
+                name=self.cursor_query_param,
+                required=False,
+                location='query',
+            ),
+            coreapi.Field(
+                name=self.page_size_query_param,
+                required=False,
+                location='query',
+            ),
+            coreapi.Field(
+                name=self.count_query_param,
+                required=False,
+                location='query',
+            ),
+        ]
@@ -0,0 +1,40 @@
+"""
+The router of the base API provided by `icekit.api.urls`, with local APIs
+and those of the routers named in `EXTRA_API_ROUTERS`.
+"""
+import logging
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from rest_framework import routers
+
+from .images import views as images_views
+from .pages import views as pages_views
+from .media_category import views as media_category_views
+
+logger = logging.getLogger(__name__)
+
+
+# Obtain the default router and register local APIs
+router = routers.DefaultRouter()
+router.register(r'image', images_views.ImageViewSet, 'image-api')
+router.register(r'page', pages_views.PageViewSet, 'page-api')
+router.register(r'media-category', media_category_views.MediaCategoryViewSet,
+                'media-category-api')
+
+# Register pluggable API routers defined elsewhere
+for api_section_name, pluggable_router \
+        in getattr(settings, 'EXTRA_API_ROUTERS', []):
+    if isinstance(pluggable_router, basestring):
+        try:
+            pluggable_router = import_string(pluggable_router)
+        except ImportError, ex:
+            logger.warn(
+                "Failed to load API router '%s' from EXTRA_API_ROUTERS: %s"
+                % (pluggable_router, ex))
+            raise
+    for prefix, viewset, basename in pluggable_router.registry:
+        if api_section_name:
+            prefix = api_section_name + prefix
+        router.register(prefix, viewset, basename)
@@ -1,7 +1,14 @@
 from django.apps import apps
+from django.contrib.sites.models import Site
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from . import base_tests
+from django_dynamic_fixture import G
+from mock import patch
+
+from . import base_tests, caching
+from .base_tests import Image
 
 Artwork = apps.get_model('gk_collections_artwork.Artwork')
 Film = apps.get_model('gk_collections_film.Film')
@@ -13,6 +20,10 @@ WorkCreator = apps.get_model(
     'gk_collections_work_creator.WorkCreator')
 Role = apps.get_model(
     'gk_collections_work_creator.Role')
+WorkImage = apps.get_model(
+    'gk_collections_work_creator.WorkImage')
+WorkImageType = apps.get_model(
+    'gk_collections_work_creator.WorkImageType')
 
 
 class _BaseCollectionAPITestCase(base_tests._BaseAPITestCase):
@@ -206,6 +217,100 @@ class ArtworkAPITestCase(_BaseCollectionAPITestCase):
             extra_item_data_for_writes_fn=extra_item_data_for_writes_fn
         )
 
+    def _create_artwork_with_relationships(self):
+        n = self.get_unique_int()
+        artwork = Artwork.objects.create(
+            title='Related Artwork %d' % n,
+        )
+        for creator in (
+            Person.objects.create(name_full='Person %d' % n),
+            Organization.objects.create(name_full='Organization %d' % n),
+        ):
+            WorkCreator.objects.create(
+                work=artwork,
+                creator=creator,
+                role=Role.objects.create(
+                    slug='role-%d-%d' % (n, creator.pk),
+                    title='Role %d' % creator.pk,
+                ),
+            )
+        WorkImage.objects.create(
+            work=artwork,
+            image=G(Image, title='Image %d' % n),
+            type=WorkImageType.objects.create(
+                slug='type-%d' % n,
+                title='Type %d' % n,
+            ),
+        )
+        return artwork
+
+    def _count_listing_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.listing_url())
+        self.assertEqual(200, response.status_code)
+        return len(context)
+
+    def test_list_artworks_query_count_is_constant(self):
+        self._create_artwork_with_relationships()
+        queries_for_few = self._count_listing_queries()
+        for i in range(5):
+            self._create_artwork_with_relationships()
+        queries_for_many = self._count_listing_queries()
+        self.assertEqual(queries_for_few, queries_for_many)
+
+    def test_list_artworks_with_conditional_get(self):
+        artwork = self._create_artwork_with_relationships()
+        response = self.client.get(self.listing_url())
+        self.assertEqual(200, response.status_code)
+        etag = response['ETag']
+        last_modified = response['Last-Modified']
+        response = self.client.get(
+            self.listing_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+
+        # Validators differ by language
+        response = self.client.get(
+            self.listing_url(), HTTP_ACCEPT_LANGUAGE='fr')
+        self.assertNotEqual(etag, response['ETag'])
+
+        # and by host, since responses include absolute URLs
+        response = self.client.get(
+            self.listing_url(), HTTP_HOST='other.example.com')
+        self.assertNotEqual(etag, response['ETag'])
+
+        # Changes to nested creators change the listing
+        person = Person.objects.get(workcreator__work=artwork)
+        person.name_display = 'Renamed Person'
+        person.save()
+        response = self.client.get(
+            self.listing_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
+        self.assertIn('Renamed Person', response.content.decode('utf-8'))
+
+        # Deleting items doesn't change the latest modified time, so that
+        # alone doesn't validate listings
+        Artwork.objects.filter(pk=self.artwork.pk).delete()
+        response = self.client.get(
+            self.listing_url(), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(200, response.status_code)
+
+    def test_model_versions_are_bumped_for_api_models_only(self):
+        with patch.object(caching, 'bump_model_version') as bump:
+            G(Site, domain='other.example.com')
+            self.assertFalse(bump.called)
+            self._create_artwork_with_relationships()
+            self.assertTrue(bump.called)
+
+        # Only once many-to-many relationships have changed
+        with patch.object(caching, 'bump_model_version') as bump:
+            caching.bump_model_versions_for_m2m(
+                None, self.artwork, 'pre_add', Artwork)
+            self.assertFalse(bump.called)
+            caching.bump_model_versions_for_m2m(
+                None, self.artwork, 'post_add', Artwork)
+            self.assertTrue(bump.called)
+
 
 class GameAPITestCase(_BaseCollectionAPITestCase):
     API_NAME = 'game-api'  # Set to reverse-able name for API URLs
@@ -1194,6 +1299,66 @@ class WorkCreatorRelationshipAPITestCase(_BaseCollectionAPITestCase):
         self.assertEqual(self.organization, new_workcreator.creator)
         self.assertEqual('funder', new_workcreator.role.slug)
 
+    def test_bulk_write_workcreators_with_post(self):
+        film = Film.objects.create(
+            title='Test Film',
+        )
+        new_role_data = {
+            'slug': 'funder',
+            'title': 'Funder',
+            'title_plural': 'Funders',
+            'past_tense': 'Funded',
+        }
+        response = self.client.post(
+            reverse('api:%s-bulk' % self.API_NAME),
+            [
+                # Create relationships sharing a new role
+                {
+                    'work': {'id': self.artwork.pk},
+                    'creator': {'id': self.organization.pk},
+                    'role': new_role_data,
+                },
+                {
+                    'work': {'id': film.pk},
+                    'creator': {'id': self.organization.pk},
+                    'role': new_role_data,
+                },
+                # Update existing relationship
+                {
+                    'id': self.workcreator.pk,
+                    'work': {'id': film.pk},
+                    'creator': {'id': self.person.pk},
+                    'role': {'slug': 'painter'},
+                },
+                # Fail to update unknown relationship
+                {
+                    'id': self.workcreator.pk + 1000,
+                    'work': {'id': film.pk},
+                    'creator': {'id': self.person.pk},
+                },
+                # Fail to create relationship for unknown creator
+                {
+                    'work': {'id': film.pk},
+                    'creator': {'id': self.organization.pk + 1000},
+                },
+            ],
+            format='json',
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            [201, 201, 200, 404, 400],
+            [result['status'] for result in response.data])
+        self.assertEqual(self.workcreator.pk, response.data[2]['id'])
+
+        self.assertEqual(3, WorkCreator.objects.count())
+        self.assertEqual(1, Role.objects.filter(slug='funder').count())
+        new_workcreator = WorkCreator.objects.get(pk=response.data[1]['id'])
+        self.assertEqual(film, new_workcreator.work)
+        self.assertEqual(self.organization, new_workcreator.creator)
+        self.assertEqual('funder', new_workcreator.role.slug)
+        updated_workcreator = WorkCreator.objects.get(pk=self.workcreator.pk)
+        self.assertEqual(film, updated_workcreator.work)
+
     def test_replace_workcreator_creator_with_put(self):
         self.assertEqual(self.person, self.workcreator.creator)
 
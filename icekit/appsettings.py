@@ -10,3 +10,43 @@ FILE_CLASS = ICEKIT.get('FILE_CLASS', 'icekit_plugins_file.File')
 
 DASHBOARD_FEATURED_APPS = ICEKIT.get('DASHBOARD_FEATURED_APPS', ())
 DASHBOARD_SORTED_APPS = ICEKIT.get('DASHBOARD_SORTED_APPS', ())
+
+# Seconds to wait after an object with a readability score is saved before
+# calculating the score. Saves within this time are coalesced.
+READABILITY_SCORE_DELAY = ICEKIT.get('READABILITY_SCORE_DELAY', 10)
+
+# Number of objects to score at a time.
+READABILITY_SCORE_BATCH_SIZE = ICEKIT.get('READABILITY_SCORE_BATCH_SIZE', 100)
+
+# Seconds that OEmbed data is considered fresh, after which it is refreshed in
+# the background the next time it is used.
+OEMBED_CACHE_TIMEOUT = ICEKIT.get('OEMBED_CACHE_TIMEOUT', 60 * 60 * 24)
+
+# Seconds that stale OEmbed data is kept for after that.
+OEMBED_CACHE_STALE_TIMEOUT = ICEKIT.get(
+    'OEMBED_CACHE_STALE_TIMEOUT', 60 * 60 * 24 * 30)
+
+# Seconds to wait before requesting OEmbed data for a URL again after the
+# provider failed to respond, e.g. while it is down.
+OEMBED_CACHE_ERROR_TIMEOUT = ICEKIT.get('OEMBED_CACHE_ERROR_TIMEOUT', 60 * 5)
+
+# Seconds to wait for a response from embed providers, e.g. Instagram.
+EMBED_REQUEST_TIMEOUT = ICEKIT.get('EMBED_REQUEST_TIMEOUT', 10)
+
+# Seconds to wait after an embed item is saved before fetching its data.
+EMBED_FETCH_DELAY = ICEKIT.get('EMBED_FETCH_DELAY', 5)
+
+# Seconds that stored embed data is considered fresh, after which it is
+# refreshed by the `refresh_stale_embed_items` task.
+EMBED_REFRESH_INTERVAL = ICEKIT.get('EMBED_REFRESH_INTERVAL', 60 * 60 * 24 * 7)
+
+# Number of embed items refreshed by each task, and the number requested from
+# providers at once.
+EMBED_REFRESH_BATCH_SIZE = ICEKIT.get('EMBED_REFRESH_BATCH_SIZE', 50)
+EMBED_REFRESH_CONCURRENCY = ICEKIT.get('EMBED_REFRESH_CONCURRENCY', 10)
+
+# Generate missing thumbnails in a background task, instead of while a
+# request waits. Until they exist, the URL of the placeholder image, or of the
+# source image if there is none, is used.
+THUMBNAIL_ASYNC = ICEKIT.get('THUMBNAIL_ASYNC', False)
+THUMBNAIL_PLACEHOLDER_URL = ICEKIT.get('THUMBNAIL_PLACEHOLDER_URL', None)
@@ -0,0 +1,56 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from easy_thumbnails.files import get_thumbnailer
+
+from icekit.tasks import generate_thumbnail
+from icekit.utils.thumbnails import get_alias_options
+
+
+class Command(BaseCommand):
+    help = "Generate missing thumbnails for the given aliases of all images, " \
+        "e.g. before deploying templates that use a new alias."
+
+    def add_arguments(self, parser):
+        parser.add_argument('aliases', nargs='+', metavar='alias')
+        parser.add_argument(
+            '--field', default='icekit_plugins_image.Image.image',
+            metavar='app_label.ModelName.field',
+            help="Image field to generate thumbnails for.")
+        parser.add_argument(
+            '--sync', action='store_true', default=False,
+            help="Generate thumbnails in this process, instead of queueing "
+                 "tasks to be processed in parallel by Celery workers.")
+
+    def handle(self, *args, **options):
+        try:
+            app_label, model_name, field_name = options['field'].split('.')
+            model = apps.get_model(app_label, model_name)
+            model._meta.get_field(field_name)
+        except (ValueError, LookupError):
+            raise CommandError("Unknown field: %s" % options['field'])
+
+        qs = model._default_manager.exclude(**{field_name: ''}) \
+            .only('pk', field_name).order_by('pk')
+        missing = 0
+        for obj in qs.iterator():
+            thumbnailer = get_thumbnailer(getattr(obj, field_name))
+            for alias in options['aliases']:
+                try:
+                    alias_options = get_alias_options(thumbnailer, alias)
+                except KeyError:
+                    raise CommandError("Unknown thumbnail alias: %s" % alias)
+                if thumbnailer.get_existing_thumbnail(alias_options):
+                    continue
+                missing += 1
+                if options['sync']:
+                    try:
+                        thumbnailer[alias]
+                    except Exception as e:
+                        self.stderr.write("Could not generate %s for %s: %s" % (
+                            alias, thumbnailer.name, e))
+                else:
+                    generate_thumbnail.delay(
+                        model._meta.app_label, model._meta.model_name,
+                        obj.pk, field_name, alias)
+        self.stdout.write("%s %d missing thumbnails." % (
+            "Generated" if options['sync'] else "Queued", missing))
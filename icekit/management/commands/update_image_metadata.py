@@ -0,0 +1,64 @@
+from multiprocessing.pool import ThreadPool
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+Image = apps.get_model('icekit_plugins_image.Image')
+
+
+def _get_image_metadata(image):
+    try:
+        return image.get_image_metadata()
+    except (OSError, IOError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Record the file size, content type and hash of images uploaded " \
+        "before they were recorded on upload."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true', default=False,
+            help="Update all images, not just those without metadata.")
+        parser.add_argument(
+            '--threads', type=int, default=10,
+            help="Number of image files to read from storage at once.")
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Number of images to load from the database at a time.")
+
+    def handle(self, *args, **options):
+        qs = Image.objects.exclude(image='').order_by('pk')
+        if not options['all']:
+            qs = qs.filter(image_size__isnull=True)
+        pks = list(qs.values_list('pk', flat=True))
+
+        updated = failed = 0
+        pool = ThreadPool(options['threads'])
+        try:
+            batch_size = options['batch_size']
+            for i in range(0, len(pks), batch_size):
+                images = list(
+                    Image.objects.filter(pk__in=pks[i:i + batch_size])
+                    .only('pk', 'image'))
+                # Reading files from remote storage is slow, so is done in
+                # threads. Database connections are per thread, so images are
+                # updated in this one.
+                results = pool.map(_get_image_metadata, images)
+                for image, metadata in zip(images, results):
+                    if metadata is None:
+                        self.stderr.write(
+                            "Could not read image %s: %s" % (image.pk, image.image))
+                        failed += 1
+                        continue
+                    # Update without saving, which would change the modified
+                    # date.
+                    Image.objects.filter(pk=image.pk).update(**metadata)
+                    updated += 1
+        finally:
+            pool.close()
+            pool.join()
+
+        self.stdout.write(
+            "Updated %d images, %d could not be read." % (updated, failed))
@@ -0,0 +1,48 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from icekit import appsettings
+from icekit.mixins import ReadabilityMixin
+from icekit.tasks import store_readability_scores
+
+
+class Command(BaseCommand):
+    help = "Calculate and store readability scores for all objects of the " \
+        "given models, e.g. `icekit_article.Article`."
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='+', metavar='app_label.ModelName')
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=appsettings.READABILITY_SCORE_BATCH_SIZE,
+            help="Number of objects scored by each task.")
+        parser.add_argument(
+            '--sync', action='store_true', default=False,
+            help="Score objects in this process, instead of queueing tasks "
+                 "to be processed in parallel by Celery workers.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for label in options['models']:
+            try:
+                app_label, model_name = label.split('.')
+                cls = apps.get_model(app_label, model_name)
+            except (ValueError, LookupError):
+                raise CommandError("Unknown model: %s" % label)
+            if not issubclass(cls, ReadabilityMixin):
+                raise CommandError(
+                    "%s does not have a readability score" % label)
+
+            pks = list(cls.objects.values_list('pk', flat=True))
+            for i in range(0, len(pks), batch_size):
+                args = (
+                    cls._meta.app_label,
+                    cls._meta.model_name,
+                    pks[i:i + batch_size],
+                )
+                if options['sync']:
+                    store_readability_scores(*args)
+                else:
+                    store_readability_scores.delay(*args)
+            self.stdout.write("%s %s: %d objects" % (
+                "Scored" if options['sync'] else "Queued", label, len(pks)))
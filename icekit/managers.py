@@ -1,5 +1,10 @@
+import math
+
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.functions import Coalesce
+
+EARTH_RADIUS_IN_KM = 6371
 
 
 class LayoutQuerySet(models.query.QuerySet):
@@ -15,37 +20,66 @@ class LayoutQuerySet(models.query.QuerySet):
         return queryset
 
 
+# Great circle distance formula, taken on faith from StackOverflow link
+# below, see also https://en.wikipedia.org/wiki/Great-circle_distance
+# NOTE: We use psql-specific COALESCE() to choose marker lat/long values when
+# available (non-NULL) otherwise center lat/long values
+GCD = """
+    6371
+    * ACOS(
+        COS(RADIANS(%s))
+        * COS(RADIANS(
+            COALESCE(map_marker_lat, map_center_lat)
+          ))
+        * COS(RADIANS(
+            COALESCE(map_marker_long, map_center_long)
+          )
+        - RADIANS(%s))
+        + SIN(RADIANS(%s))
+        * SIN(RADIANS(
+            COALESCE(map_marker_lat, map_center_lat)
+        ))
+    )
+    """
+
+
+def get_bounding_box(latitude, longitude, proximity_in_km):
+    """
+    Return the `(min_lat, max_lat, min_long, max_long)` of a box containing
+    all points within `proximity_in_km` of the given location. The longitude
+    range is `None` if the box includes a pole, and `min_long` is greater
+    than `max_long` if it crosses the antimeridian.
+    """
+    # Angular distance, see
+    # http://janmatuschek.de/LatitudeLongitudeBoundingCoordinates
+    delta = math.degrees(float(proximity_in_km) / EARTH_RADIUS_IN_KM)
+    min_lat = float(latitude) - delta
+    max_lat = float(latitude) + delta
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90), min(max_lat, 90), None, None
+    delta_long = math.degrees(math.asin(
+        math.sin(math.radians(delta)) / math.cos(math.radians(latitude))))
+    min_long = float(longitude) - delta_long
+    max_long = float(longitude) + delta_long
+    if min_long < -180:
+        min_long += 360
+    if max_long > 180:
+        max_long -= 360
+    return min_lat, max_lat, min_long, max_long
+
+
 # Adapted from https://stackoverflow.com/a/26219292/4970
 class GoogleMapManager(models.Manager):
 
-    def annotate_distance_in_km(self, latitude, longitude):
+    def annotate_distance_in_km(self, latitude, longitude, queryset=None):
         """
         Return all records with non-null latitude/longitude values with the
         annotation value `distance_in_km` which is the distance between
         the record and the given `latitude`/`longitude` location.
         """
-        # Great circle distance formula, taken on faith from StackOverflow link
-        # above, see also https://en.wikipedia.org/wiki/Great-circle_distance
-        # NOTE: We use psql-specific COALESCE() to choose marker lat/long
-        # values when available (non-NULL) otherwise center lat/long values
-        GCD = """
-            6371
-            * ACOS(
-                COS(RADIANS(%s))
-                * COS(RADIANS(
-                    COALESCE(map_marker_lat, map_center_lat)
-                  ))
-                * COS(RADIANS(
-                    COALESCE(map_marker_long, map_center_long)
-                  )
-                - RADIANS(%s))
-                + SIN(RADIANS(%s))
-                * SIN(RADIANS(
-                    COALESCE(map_marker_lat, map_center_lat)
-                ))
-            )
-            """
-        return self.get_queryset() \
+        if queryset is None:
+            queryset = self.get_queryset()
+        return queryset \
             .exclude(map_center_lat=None) \
             .exclude(map_center_long=None) \
             .annotate(
@@ -56,7 +90,36 @@ class GoogleMapManager(models.Manager):
             ) \
             .order_by('distance_in_km')
 
+    def within_bounding_box(self, latitude, longitude, proximity_in_km):
+        """
+        Return records whose marker, or otherwise center, lat/long values are
+        within a box containing all points within `proximity_in_km` of the
+        given location. Unlike the distance, this can use an index on the
+        coalesced values.
+        """
+        min_lat, max_lat, min_long, max_long = get_bounding_box(
+            latitude, longitude, proximity_in_km)
+        qs = self.get_queryset().annotate(
+            map_lat=Coalesce('map_marker_lat', 'map_center_lat'),
+            map_long=Coalesce('map_marker_long', 'map_center_long'),
+        ).filter(map_lat__range=(min_lat, max_lat))
+        if min_long is None:
+            return qs
+        if min_long <= max_long:
+            return qs.filter(map_long__range=(min_long, max_long))
+        # Box crosses the antimeridian
+        return qs.filter(
+            models.Q(map_long__gte=min_long) | models.Q(map_long__lte=max_long))
+
     def nearby(self, latitude, longitude, proximity_in_km):
+        """
+        Return records within `proximity_in_km` of the given location, ordered
+        by distance. The distance is only calculated for records within a
+        bounding box of the location.
+        """
         return self \
-            .annotate_distance_in_km(latitude, longitude) \
+            .annotate_distance_in_km(
+                latitude, longitude,
+                queryset=self.within_bounding_box(
+                    latitude, longitude, proximity_in_km)) \
             .filter(distance_in_km__lt=proximity_in_km)
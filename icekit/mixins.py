@@ -16,9 +16,10 @@ from django.utils.translation import ugettext_lazy as _
 
 from fluent_contents.models import \
     ContentItemRelation, Placeholder, PlaceholderRelation
-from fluent_contents.rendering import render_content_items
+from fluent_contents.extensions import PluginNotFound
 
-from icekit.tasks import store_readability_score
+from icekit.tasks import schedule_readability_score
+from icekit.utils.fluent_contents import render_content_item
 from icekit.utils.readability.readability import Readability
 from icekit import managers
 
@@ -104,10 +105,18 @@ class ReadabilityMixin(models.Model):
         abstract = True
 
     def extract_text(self):
-        # return the rendered content, with HTML tags stripped.
-        html = render_content_items(
-            request=None, items=self.contentitem_set.all())
-        return striptags(html)
+        # return the rendered content, with HTML tags stripped. Output
+        # cached by front-end rendering is reused where available.
+        content_items = self.contentitem_set \
+            .non_polymorphic() \
+            .select_related('placeholder')
+        html = []
+        for content_item in content_items:
+            try:
+                html.append(render_content_item(None, content_item).html)
+            except PluginNotFound:
+                continue
+        return striptags(u''.join(html))
 
     def calculate_readability_score(self):
         try:
@@ -116,7 +125,7 @@ class ReadabilityMixin(models.Model):
             return None
 
     def store_readability_score(self):
-        store_readability_score.delay(
+        schedule_readability_score(
             self._meta.app_label, self._meta.model_name, self.pk)
 
     def save(self, *args, **kwargs):
@@ -224,8 +233,8 @@ class ListableMixin(models.Model):
         """
         li = self.get_list_image()
         if li:
-            from easy_thumbnails.files import get_thumbnailer
-            thumb_url = get_thumbnailer(li)['og_image'].url
+            from icekit.utils.thumbnails import get_thumbnail_url
+            thumb_url = get_thumbnail_url(li, 'og_image')
             # TODO: looks like this may fail if SITE_DOMAIN = "acmi.lvh.me"
             return urljoin(settings.SITE_DOMAIN, thumb_url)
 
@@ -16,6 +16,7 @@ class AbstractNavigation(models.Model):
     post_html = models.TextField(blank=True)
     content = PlaceholderField('navigation_content')
     request = None
+    _items = None
 
     class Meta:
         abstract = True
@@ -26,13 +27,33 @@ class AbstractNavigation(models.Model):
     def set_request(self, request):
         self.request = request
 
+    def load_items(self):
+        """
+        Load the navigation's content items, and the URLs they link to, so
+        they can be kept with the navigation when it is cached.
+        """
+        try:
+            items = list(self.slots.navigation_content)
+        except AttributeError:
+            # The placeholder doesn't exist yet
+            items = []
+        for item in items:
+            if isinstance(item, AbstractNavigationItem):
+                item.resolved_url  # Resolve and keep the URL
+        self._items = items
+
+    def get_items(self):
+        if self._items is None:
+            self.load_items()
+        return self._items
+
     @cached_property
     def active_items(self):
         if not self.request:
             raise Exception('`active_items` requires access to a request object. Call `.set_request(...)`')
 
         active_items = []
-        for item in self.slots.navigation_content:
+        for item in self.get_items():
             if (
                 hasattr(item, 'is_active_for_request') and
                 item.is_active_for_request(self.request)
@@ -59,8 +80,12 @@ class AbstractNavigationItem(ContentItem):
     def get_absolute_url(self):
         return self.url
 
+    @cached_property
+    def resolved_url(self):
+        return text_type(self.get_absolute_url())
+
     def is_active_for_request(self, request):
-        url = text_type(self.get_absolute_url())
+        url = self.resolved_url
         # Note that `startswith` has an implicit equality check as well as substring matching
         return request.path.startswith(url)
 
@@ -0,0 +1,66 @@
+"""
+Caching of navigations with their items, so header and footer navigations
+rendered on every page don't need to be queried each time.
+
+Cached navigations are versioned: bumping the version, which happens whenever
+a navigation, its items or the pages they may link to change, invalidates
+every entry at once.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils.encoding import force_bytes
+from django.utils.translation import get_language
+
+VERSION_CACHE_KEY = 'icekit-navigation-version'
+NAVIGATION_CACHE_KEY = 'icekit-navigation:%s'
+
+# Cached in place of a navigation that doesn't exist, so a missing navigation
+# doesn't need to be queried on every request either.
+MISSING = 'missing'
+
+
+def get_navigation_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        # Start from the current time, not 1, to avoid reusing any entries
+        # still cached after the version key was evicted.
+        version = int(time.time() * 1000)
+        cache.add(VERSION_CACHE_KEY, version, None)
+        version = cache.get(VERSION_CACHE_KEY, version)
+    return version
+
+
+def bump_navigation_version(*args, **kwargs):
+    """
+    Invalidate all cached navigations. Can be used as a signal handler.
+    """
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        pass  # No version yet, so nothing to invalidate
+
+
+def get_cached_navigation(model, slug):
+    """
+    Return the navigation of the given model with the given slug, or `None`,
+    with its items and their URLs already loaded.
+    """
+    key = u'|'.join([
+        str(get_navigation_version()),
+        model._meta.app_label,
+        model._meta.model_name,
+        slug,
+        get_language() or '',
+    ])
+    cache_key = NAVIGATION_CACHE_KEY % hashlib.md5(force_bytes(key)).hexdigest()
+    navigation = cache.get(cache_key)
+    if navigation is None:
+        navigation = model.objects.filter(slug=slug).first()
+        if navigation is not None:
+            navigation.load_items()
+        cache.set(cache_key, navigation or MISSING)
+    elif navigation == MISSING:
+        navigation = None
+    return navigation
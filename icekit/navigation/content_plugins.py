@@ -7,6 +7,8 @@ class NavigationItemPlugin(ContentPlugin):
     model = NavigationItem
     category = 'Navigation'
     render_template = 'icekit/navigation/navigation_item.html'
+    # Output depends on the request, for the active state.
+    cache_output = False
 
 
 @plugin_pool.register
@@ -14,3 +16,5 @@ class AccountsNavigationItemPlugin(ContentPlugin):
     model = AccountsNavigationItem
     category = 'Navigation'
     render_template = 'icekit/navigation/accounts_navigation_item.html'
+    # Output depends on the request, for the active state and user.
+    cache_output = False
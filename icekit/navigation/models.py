@@ -1,3 +1,11 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from fluent_contents.models import ContentItem, Placeholder
+from fluent_pages.models import UrlNode
+from fluent_pages.models.db import UrlNode_Translation
+
+from icekit.navigation import caching
 from icekit.navigation.abstract_models import (
     AbstractNavigation, AbstractNavigationItem, AbstractAccountsNavigationItem
 )
@@ -13,3 +21,22 @@ class NavigationItem(AbstractNavigationItem):
 
 class AccountsNavigationItem(AbstractAccountsNavigationItem):
     pass
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_navigation_version(sender, instance, **kwargs):
+    """
+    Invalidate cached navigations when a navigation or its items change, or
+    pages that items may link to change URL.
+    """
+    if isinstance(instance, (ContentItem, Placeholder)):
+        if not instance.parent_type_id:
+            return
+        parent_model = ContentType.objects.get_for_id(
+            instance.parent_type_id).model_class()
+        if parent_model and issubclass(parent_model, AbstractNavigation):
+            caching.bump_navigation_version()
+    elif isinstance(instance,
+                    (AbstractNavigation, UrlNode, UrlNode_Translation)):
+        caching.bump_navigation_version()
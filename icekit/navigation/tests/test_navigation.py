@@ -6,6 +6,7 @@ from django.test.client import RequestFactory
 from django.template import engines
 from any_urlfield.models import AnyUrlValue
 from fluent_contents.models import Placeholder
+from icekit.navigation import caching
 from icekit.navigation.models import Navigation, NavigationItem, AccountsNavigationItem
 
 django_engine = engines['django']
@@ -14,6 +15,8 @@ django_engine = engines['django']
 class TestNavigation(TestCase):
     def setUp(self):
         self.factory = RequestFactory()
+        # Don't reuse navigations cached by other tests
+        caching.bump_navigation_version()
         self.test_render_template = django_engine.from_string(
             '''{% load icekit_tags %}{% render_navigation 'test-nav' %}'''
         )
@@ -223,3 +226,41 @@ class TestNavigation(TestCase):
             'request': self.create_request(),
         })
         self.assertEqual(rendered, 'test nav item title 1 /test/url/ | test nav item title 2 /test/url/nested/')
+
+    def test_render_navigation_tag_uses_cached_navigation(self):
+        navigation = Navigation.objects.create(
+            name='test nav',
+            slug='test-nav',
+        )
+        placeholder = Placeholder.objects.create(
+            slot='navigation_content',
+            parent=navigation,
+        )
+        navigation_item = NavigationItem.objects.create(
+            placeholder=placeholder,
+            parent_type_id=ContentType.objects.get_for_model(Navigation).id,
+            parent_id=navigation.id,
+            title='test nav item title',
+            url=AnyUrlValue.from_db_value('/test/url/')
+        )
+        context = {'request': self.create_request(path='/test/url/')}
+        rendered = self.test_render_template.render(context)
+        self.assertIn('ik-nav-item--active', rendered)
+
+        # Cached navigation is rendered without queries, with active items
+        # still matched against the request
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                rendered, self.test_render_template.render(context))
+            self.assertNotIn(
+                'ik-nav-item--active',
+                self.test_render_template.render({
+                    'request': self.create_request(path='/other/url/'),
+                }))
+
+        # Saving an item invalidates the cached navigation
+        navigation_item.title = 'updated nav item title'
+        navigation_item.save()
+        self.assertIn(
+            'updated nav item title',
+            self.test_render_template.render(context))
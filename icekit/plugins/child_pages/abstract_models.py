@@ -1,6 +1,61 @@
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models.query import prefetch_related_objects
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 from fluent_contents.models import ContentItem
+from fluent_pages.models import UrlNode
+
+from icekit.publishing.caching import get_path_version
+from icekit.publishing.middleware import override_draft_request_context
+
+CHILD_PAGES_CACHE_KEY = 'icekit-child-pages:%s:%s:%s'
+
+
+def get_child_pages_of_draft(parent_draft, is_draft):
+    """
+    Return the draft or published children of a draft page, with their
+    translations and hero images prefetched.
+
+    Children are found with a single MPTT range query, since published copies
+    share the tree fields of their drafts. Results are cached until page
+    trees or URLs change.
+    """
+    cache_key = CHILD_PAGES_CACHE_KEY % (
+        get_path_version(),
+        parent_draft.pk,
+        'draft' if is_draft else 'published',
+    )
+    children = cache.get(cache_key)
+    if children is None:
+        opts = parent_draft._mptt_meta
+        # Fetch plain instances, not draft items wrapped by the publishing
+        # middleware, so they can be cached.
+        with override_draft_request_context(True):
+            children = UrlNode.objects.filter(**{
+                opts.tree_id_attr: parent_draft._mpttfield('tree_id'),
+                '%s__gt' % opts.left_attr: parent_draft._mpttfield('left'),
+                '%s__lt' % opts.right_attr: parent_draft._mpttfield('right'),
+                opts.level_attr: parent_draft._mpttfield('level') + 1,
+            }).order_by(opts.left_attr)
+            if is_draft:
+                children = [p for p in children if getattr(p, 'is_draft', True)]
+            else:
+                children = [p for p in children if getattr(p, 'is_published', True)]
+
+        # Children can be of different page types, so prefetch per type.
+        children_by_type = defaultdict(list)
+        for child in children:
+            children_by_type[type(child)].append(child)
+        for model, objs in children_by_type.items():
+            lookups = ['translations']
+            if 'hero_image' in [f.name for f in model._meta.fields]:
+                lookups.append('hero_image')
+            prefetch_related_objects(objs, lookups)
+
+        cache.set(cache_key, children)
+    return children
 
 
 @python_2_unicode_compatible
@@ -18,6 +73,11 @@ class AbstractChildPagesItem(ContentItem):
         parent = self.parent
 
         if parent.is_draft:
-            return [p for p in parent.get_draft().get_children() if p.publishing_is_draft]
+            return get_child_pages_of_draft(parent, is_draft=True)
         else:
-            return parent.get_draft().get_children().published()
+            return [
+                p for p in get_child_pages_of_draft(
+                    parent.get_draft(), is_draft=False)
+                if not hasattr(p, 'is_within_publication_dates')
+                or p.is_within_publication_dates()
+            ]
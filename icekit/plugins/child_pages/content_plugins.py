@@ -12,3 +12,6 @@ class ChildPagesPlugin(ContentPlugin):
     model = models.ChildPageItem
     category = _('Navigation')
     render_template = 'icekit/plugins/child_pages/default.html'
+    # Child pages change without this item being saved, and are cached
+    # separately until the page tree changes.
+    cache_output = False
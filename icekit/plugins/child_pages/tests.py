@@ -90,3 +90,15 @@ class ChildPagesTestCase(WebTest):
         expected_children = [self.page_3.get_published()]
         for child in expected_children:
             self.assertIn(child, pcp2.get_child_pages())
+
+    def test_get_child_pages_is_cached_until_tree_changes(self):
+        pcp2 = self.page_2.get_published().contentitem_set.all()[0]
+        self.assertEqual(len(pcp2.get_child_pages()), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(pcp2.get_child_pages()), 1)
+
+        self.page_4.publish()
+        self.assertEqual(
+            set([self.page_3.get_published().pk,
+                 self.page_4.get_published().pk]),
+            set([x.pk for x in pcp2.get_child_pages()]))
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import mimetypes
 
 from django.core.exceptions import ValidationError
 from django.template import Context
@@ -75,6 +77,24 @@ class AbstractImage(models.Model):
     width = models.PositiveIntegerField(editable=False)
     height = models.PositiveIntegerField(editable=False)
 
+    # Metadata of the image file, recorded when it is uploaded so it doesn't
+    # need to be requested from storage, which may be remote.
+    image_size = models.BigIntegerField(
+        blank=True, null=True,
+        editable=False,
+    )
+    image_content_type = models.CharField(
+        max_length=100,
+        blank=True,
+        editable=False,
+    )
+    image_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text=_("SHA-256 hash of the image file."),
+    )
+
     date_created = models.DateTimeField(
         default=timezone.now,
         editable=False
@@ -103,12 +123,30 @@ class AbstractImage(models.Model):
         default=False
     )
 
+    def __init__(self, *args, **kwargs):
+        super(AbstractImage, self).__init__(*args, **kwargs)
+        # Stored metadata is for the stored image file. Don't load the image
+        # field if it is deferred.
+        image = self.__dict__.get('image')
+        self._metadata_image_name = getattr(image, 'name', image) \
+            if self.pk else None
+
     def clean(self):
         if not (self.title or self.alt_text):
             raise ValidationError("You must specify either title or alt text")
 
+    def save(self, *args, **kwargs):
+        if self.image and (
+            not self.image._committed or
+            self.image.name != self._metadata_image_name
+        ):
+            self.update_image_metadata()
+        super(AbstractImage, self).save(*args, **kwargs)
+
     class Meta:
         abstract = True
+        # Supports keyset pagination of the image API
+        index_together = (('date_modified', 'id'),)
 
     def __str__(self):
         return self.title or self.alt_text
@@ -125,11 +163,55 @@ class AbstractImage(models.Model):
 
         :return: String of file size with unit.
         """
+        if self.image_size is not None:
+            return filesizeformat(self.image_size)
+        # Metadata is not recorded for images uploaded before it was added,
+        # until the `update_image_metadata` command is run.
         try:
             return filesizeformat(self.image.size)
         except (OSError, IOError):
             return filesizeformat(0)
 
+    def get_image_metadata(self):
+        """
+        Read the size, content type and hash of the image file, from the
+        upload if there is one, otherwise from storage.
+
+        :return: Dict of metadata field values.
+        """
+        content_type = getattr(self.image.file, 'content_type', None) or \
+            mimetypes.guess_type(self.image.name)[0] or ''
+        sha256 = hashlib.sha256()
+        size = 0
+        self.image.open('rb')
+        try:
+            for chunk in self.image.chunks():
+                sha256.update(chunk)
+                size += len(chunk)
+        finally:
+            if self.image._committed:
+                self.image.close()
+        return {
+            'image_size': size,
+            'image_content_type': content_type,
+            'image_hash': sha256.hexdigest(),
+        }
+
+    def update_image_metadata(self):
+        """
+        Set the metadata of the image file. Doesn't save the image.
+        """
+        try:
+            metadata = self.get_image_metadata()
+        except (OSError, IOError):
+            metadata = {
+                'image_size': None,
+                'image_content_type': '',
+                'image_hash': '',
+            }
+        for name, value in metadata.items():
+            setattr(self, name, value)
+        self._metadata_image_name = self.image.name
 
 
 @python_2_unicode_compatible
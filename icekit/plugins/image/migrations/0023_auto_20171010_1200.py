@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('icekit_plugins_image', '0022_auto_20170622_1024'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='image',
+            index_together=set([('date_modified', 'id')]),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('icekit_plugins_image', '0023_auto_20171010_1200'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='image_content_type',
+            field=models.CharField(max_length=100, blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='image_hash',
+            field=models.CharField(help_text='SHA-256 hash of the image file.', max_length=64, blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='image_size',
+            field=models.BigIntegerField(blank=True, null=True, editable=False),
+        ),
+    ]
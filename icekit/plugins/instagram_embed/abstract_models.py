@@ -1,5 +1,4 @@
 import json
-import requests
 from django.core import exceptions
 from django.db import models
 from django.utils.encoding import python_2_unicode_compatible
@@ -7,9 +6,11 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext_lazy as _
 from fluent_contents.models import ContentItem
 
+from icekit.utils.embeds import RefreshableEmbedMixin, get_embed_response
+
 
 @python_2_unicode_compatible
-class AbstractInstagramEmbedItem(ContentItem):
+class AbstractInstagramEmbedItem(RefreshableEmbedMixin, ContentItem):
     """
     An embeded instagram image.
     """
@@ -31,6 +32,14 @@ class AbstractInstagramEmbedItem(ContentItem):
     author_url = models.CharField(max_length=255, blank=True)
     author_id = models.PositiveIntegerField(blank=True, null=True)
     type = models.CharField(max_length=50, blank=True)
+    fetched_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    embed_data_fields = (
+        'provider_url', 'media_id', 'author_name', 'height', 'width',
+        'thumbnail_url', 'thumbnail_width', 'thumbnail_height',
+        'provider_name', 'title', 'html', 'version', 'author_url',
+        'author_id', 'type',
+    )
 
     class Meta:
         abstract = True
@@ -39,13 +48,13 @@ class AbstractInstagramEmbedItem(ContentItem):
     def __str__(self):
         return 'Instagram Embed: %s' % self.url
 
-    def clean(self, *args, **kwargs):
+    def fetch_embed_data(self):
+        return self.fetch_instagram_data()
+
+    def set_embed_data(self, instagram_data):
         """
-        Prefetch instagram data and clean it.
+        Set the instagram data returned by `fetch_instagram_data()`.
         """
-        # Get the instagram data.
-        instagram_data = self.fetch_instagram_data()
-
         # If a dict is returned assume it is the JSON data returned from instagram.
         if isinstance(instagram_data, dict):
             # Set each of the data attributes.
@@ -54,8 +63,6 @@ class AbstractInstagramEmbedItem(ContentItem):
         else:
             raise exceptions.ValidationError(instagram_data)
 
-        super(AbstractInstagramEmbedItem, self).clean(*args, **kwargs)
-
     def fetch_instagram_data(self):
         """
         Get the instagram data for the url.
@@ -66,7 +73,8 @@ class AbstractInstagramEmbedItem(ContentItem):
         # can happen if a user enters an invalid URL in the admin form.
         if not self.url:
             return ''
-        r = requests.get('http://api.instagram.com/publicapi/oembed/?url=%s' % self.url)
+        r = get_embed_response(
+            'http://api.instagram.com/publicapi/oembed/?url=%s' % self.url)
         if r.status_code is 200:
             return json.loads(r.content.decode())
         return r.content
@@ -1,3 +1,7 @@
+from django.db.models.signals import post_save
+
+from icekit.utils.embeds import queue_embed_refresh
+
 from . import abstract_models
 
 
@@ -6,3 +10,6 @@ class InstagramEmbedItem(abstract_models.AbstractInstagramEmbedItem):
     An embeded instagram image.
     """
     pass
+
+
+post_save.connect(queue_embed_refresh, sender=InstagramEmbedItem)
@@ -1,7 +1,7 @@
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
 from django.contrib.auth import get_user_model
-from django.core import exceptions
+from django.utils import timezone
 from django_dynamic_fixture import G
 from django_webtest import WebTest
 from mock import Mock
@@ -56,13 +56,40 @@ class InstagramEmbedItemTestCase(WebTest):
         self.assertEqual(str(self.instagram_1), 'Instagram Embed: %s' % self.instagram_1.url)
 
     def test_clean(self):
+        # Changing the URL stores placeholder data, without fetching the new
+        # data while the admin waits.
+        self.instagram_1.html = '<p>html</p>'
+        self.instagram_1.fetched_at = timezone.now()
+        self.instagram_1.url = 'https://instagram.com/p/5O26siFtv8/'
+        self.instagram_1.fetch_instagram_data = Mock()
+        self.instagram_1.clean()
+        self.assertFalse(self.instagram_1.fetch_instagram_data.called)
+        self.assertEqual(self.instagram_1.html, '')
+        self.assertIsNone(self.instagram_1.fetched_at)
+
+        # Cleaning again keeps the data for an unchanged URL.
+        self.instagram_1.html = '<p>html</p>'
+        self.instagram_1.clean()
+        self.assertEqual(self.instagram_1.html, '<p>html</p>')
+
+        # A deferred URL isn't loaded by instantiating the item, and the
+        # stored data is kept while the URL is unchanged.
+        self.instagram_2.html = '<p>html</p>'
+        self.instagram_2.save()
+        item = models.InstagramEmbedItem.objects \
+            .defer('url').get(pk=self.instagram_2.pk)
+        self.assertNotIn('url', item.__dict__)
+        item.clean()
+        self.assertEqual(item.html, '<p>html</p>')
+
+    def test_refresh_embed_data(self):
         initial_fetch_instagram_data = self.instagram_1.fetch_instagram_data
         self.instagram_1.fetch_instagram_data = Mock(
             return_value='Please provide a valid link.'
         )
 
-        with self.assertRaises(exceptions.ValidationError):
-            self.instagram_1.clean()
+        self.assertFalse(self.instagram_1.refresh_embed_data())
+        self.assertIsNotNone(self.instagram_1.fetched_at)
 
         self.instagram_1.fetch_instagram_data = initial_fetch_instagram_data
         initial_fetch_instagram_data = self.instagram_2.fetch_instagram_data
@@ -85,7 +112,7 @@ class InstagramEmbedItemTestCase(WebTest):
                 'author_url': 'https://instagram.com/test'
             }
         )
-        self.instagram_2.clean()
+        self.instagram_2.refresh_embed_data()
         self.instagram_2.fetch_instagram_data = initial_fetch_instagram_data
         self.assertEqual(self.instagram_2.provider_url, 'https://instagram.com/')
 
@@ -110,7 +137,7 @@ class InstagramEmbedItemTestCase(WebTest):
                 'author_url': 'https://instagram.com/test'
             }
         )
-        self.instagram_2.clean()
+        self.instagram_2.refresh_embed_data()
         self.instagram_2.fetch_instagram_data = initial_fetch_instagram_data
 
         initial_fetch_instagram_data = self.instagram_3.fetch_instagram_data
@@ -133,7 +160,7 @@ class InstagramEmbedItemTestCase(WebTest):
                 'author_url': 'https://instagram.com/test'
             }
         )
-        self.instagram_3.clean()
+        self.instagram_3.refresh_embed_data()
         self.instagram_3.fetch_instagram_data = initial_fetch_instagram_data
         self.assertEqual(self.instagram_1.get_thumbnail(), '')
         self.assertEqual(self.instagram_2.get_thumbnail(), self.instagram_2.thumbnail_url)
@@ -161,7 +188,7 @@ class InstagramEmbedItemTestCase(WebTest):
                 'author_url': 'https://instagram.com/test'
             }
         )
-        self.instagram_2.clean()
+        self.instagram_2.refresh_embed_data()
         self.instagram_2.fetch_instagram_data = initial_fetch_instagram_data
         self.assertEqual(self.instagram_1.get_default_embed(), '')
         self.assertEqual(self.instagram_2.get_default_embed(), self.instagram_2.html)
@@ -215,10 +242,9 @@ class InstagramEmbedItemTestCase(WebTest):
             return_value='The page is not available'
         )
         self.assertFalse(form.is_valid())
-        self.assertEqual(len(form.errors.keys()), 2)
-        expected_keys = ['url', '__all__']
-        for key in expected_keys:
-            self.assertIn(key, form.errors.keys())
+        # The instagram data isn't requested until after the item is saved.
+        self.assertEqual(list(form.errors.keys()), ['url'])
+        self.assertFalse(form.instance.fetch_instagram_data.called)
         self.assertEqual(form.errors['url'][0], 'Please provide a valid instagram link.')
         form.instance.fetch_instagram_data = initial_fetch_instagram_data
 
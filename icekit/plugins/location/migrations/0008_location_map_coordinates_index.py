@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('icekit_plugins_location', '0007_auto_20171005_1708'),
+    ]
+
+    # Index the marker, or otherwise center, coordinates used by the bounding
+    # box filter of `GoogleMapManager.nearby()`.
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX icekit_plugins_location_location_map_coords "
+            "ON icekit_plugins_location_location ("
+            "(COALESCE(map_marker_lat, map_center_lat)), "
+            "(COALESCE(map_marker_long, map_center_long)));",
+            "DROP INDEX icekit_plugins_location_location_map_coords;",
+        ),
+    ]
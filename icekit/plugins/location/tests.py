@@ -10,6 +10,7 @@ from django.core.urlresolvers import reverse
 
 from django_dynamic_fixture import G
 from django_webtest import WebTest
+from icekit.managers import get_bounding_box
 from icekit.models import Layout
 from icekit.page_types.layout_page.models import LayoutPage
 from icekit.utils import fluent_contents
@@ -130,6 +131,67 @@ class LocationModelTests(unittest.TestCase):
             '//maps.google.com/maps?ll=100.1234%2C100.2345',
             self.location.get_map_href())
 
+    def test_nearby(self):
+        # Centered on the Sydney CBD, with a marker in Parramatta about 20km
+        # away, which is used for distances.
+        parramatta = models.Location.objects.create(
+            title='Parramatta',
+            slug='parramatta',
+            map_center_lat='-33.87',
+            map_center_long='151.21',
+            map_marker_lat='-33.82',
+            map_marker_long='151.00',
+        )
+        manly = models.Location.objects.create(
+            title='Manly',
+            slug='manly',
+            map_center_lat='-33.80',
+            map_center_long='151.29',
+        )
+        melbourne = models.Location.objects.create(
+            title='Melbourne',
+            slug='melbourne',
+            map_center_lat='-37.81',
+            map_center_long='144.96',
+        )
+        # From the Sydney CBD
+        self.assertEqual(
+            [manly],
+            list(models.Location.objects.nearby(-33.87, 151.21, 15)))
+        self.assertEqual(
+            [manly, parramatta],
+            list(models.Location.objects.nearby(-33.87, 151.21, 25)))
+        self.assertEqual(
+            [manly, parramatta, melbourne],
+            list(models.Location.objects.nearby(-33.87, 151.21, 1000)))
+        # Distances are the same with or without the bounding box filter
+        self.assertEqual(
+            [(l.pk, l.distance_in_km) for l in
+             models.Location.objects.annotate_distance_in_km(-33.87, 151.21)],
+            [(l.pk, l.distance_in_km) for l in
+             models.Location.objects.nearby(-33.87, 151.21, 1000)])
+
+    def test_get_bounding_box(self):
+        min_lat, max_lat, min_long, max_long = get_bounding_box(0, 0, 111.2)
+        self.assertAlmostEqual(-1, min_lat, places=2)
+        self.assertAlmostEqual(1, max_lat, places=2)
+        self.assertAlmostEqual(-1, min_long, places=2)
+        self.assertAlmostEqual(1, max_long, places=2)
+        # Longitude range is wider away from the equator
+        min_lat, max_lat, min_long, max_long = get_bounding_box(60, 0, 111.2)
+        self.assertAlmostEqual(59, min_lat, places=2)
+        self.assertAlmostEqual(61, max_lat, places=2)
+        self.assertAlmostEqual(-2, min_long, places=1)
+        self.assertAlmostEqual(2, max_long, places=1)
+        # Box crossing the antimeridian
+        min_lat, max_lat, min_long, max_long = get_bounding_box(0, 179.5, 111.2)
+        self.assertAlmostEqual(178.5, min_long, places=2)
+        self.assertAlmostEqual(-179.5, max_long, places=2)
+        # Box including a pole has no longitude range
+        min_lat, max_lat, min_long, max_long = get_bounding_box(89.5, 0, 111.2)
+        self.assertAlmostEqual(88.5, min_lat, places=2)
+        self.assertEqual((90, None, None), (max_lat, min_long, max_long))
+
     def test_get_map_element_id(self):
         self.assertEqual(
             'google-map-%d' % id(self.location),
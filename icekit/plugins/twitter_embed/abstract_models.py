@@ -1,5 +1,4 @@
 import json
-import requests
 from django.core import exceptions
 from django.db import models
 from django.utils.encoding import python_2_unicode_compatible
@@ -7,9 +6,11 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext_lazy as _
 from fluent_contents.models import ContentItem
 
+from icekit.utils.embeds import RefreshableEmbedMixin, get_embed_response
+
 
 @python_2_unicode_compatible
-class AbstractTwitterEmbedItem(ContentItem):
+class AbstractTwitterEmbedItem(RefreshableEmbedMixin, ContentItem):
     """
     An embeded twitter tweet.
     """
@@ -27,6 +28,13 @@ class AbstractTwitterEmbedItem(ContentItem):
     author_url = models.CharField(max_length=255, blank=True)
     type = models.CharField(max_length=50, blank=True)
     html = models.TextField(blank=True)
+    fetched_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    embed_url_field = 'twitter_url'
+    embed_data_fields = (
+        'url', 'provider_url', 'cache_age', 'author_name', 'height', 'width',
+        'provider_name', 'version', 'author_url', 'type', 'html',
+    )
 
     class Meta:
         abstract = True
@@ -35,13 +43,13 @@ class AbstractTwitterEmbedItem(ContentItem):
     def __str__(self):
         return 'Twitter Embed: %s' % self.twitter_url
 
-    def clean(self, *args, **kwargs):
+    def fetch_embed_data(self):
+        return self.fetch_twitter_data()
+
+    def set_embed_data(self, twitter_data):
         """
-        Prefetch twitter data and clean it.
+        Set the twitter data returned by `fetch_twitter_data()`.
         """
-        # Get the twitter data.
-        twitter_data = self.fetch_twitter_data()
-
         # If a dict is returned assume it is the JSON data returned from twitter.
         if isinstance(twitter_data, dict):
             if 'errors' in twitter_data.keys():
@@ -52,15 +60,14 @@ class AbstractTwitterEmbedItem(ContentItem):
         else:
             raise exceptions.ValidationError(twitter_data)
 
-        super(AbstractTwitterEmbedItem, self).clean(*args, **kwargs)
-
     def fetch_twitter_data(self):
         """
         Get the twitter data for the url.
 
         :return: Dict of data if successful or String if error.
         """
-        r = requests.get('https://api.twitter.com/1/statuses/oembed.json?url=%s' % self.twitter_url)
+        r = get_embed_response(
+            'https://api.twitter.com/1/statuses/oembed.json?url=%s' % self.twitter_url)
         if r.status_code in [200, 404]:
             # Force the decode here for python-3 support..
             return json.loads(r.content.decode('utf-8'))
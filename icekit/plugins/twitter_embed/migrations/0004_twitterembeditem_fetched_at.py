@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('icekit_plugins_twitter_embed', '0003_auto_20160821_2140'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='twitterembeditem',
+            name='fetched_at',
+            field=models.DateTimeField(blank=True, null=True, editable=False),
+        ),
+    ]
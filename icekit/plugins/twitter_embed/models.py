@@ -1,3 +1,7 @@
+from django.db.models.signals import post_save
+
+from icekit.utils.embeds import queue_embed_refresh
+
 from . import abstract_models
 
 
@@ -6,3 +10,6 @@ class TwitterEmbedItem(abstract_models.AbstractTwitterEmbedItem):
     An embeded twitter tweet.
     """
     pass
+
+
+post_save.connect(queue_embed_refresh, sender=TwitterEmbedItem)
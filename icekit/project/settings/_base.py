@@ -378,6 +378,14 @@ CELERYBEAT_SCHEDULE = {
         'task': 'icekit.tasks.UpdateSearchIndexTask',
         'schedule': crontab(minute='*/15'),  # Every 15 minutes.
     },
+    'refresh_stale_embed_items': {
+        'task': 'icekit.tasks.refresh_stale_embed_items',
+        'schedule': crontab(minute=0),  # Every hour.
+    },
+    'refresh_event_next_starts': {
+        'task': 'icekit_events.tasks.refresh_event_next_starts',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes.
+    },
 }
 
 # Redis (by setting CELERY_RESULT_BACKEND to BROKER_URL) is an alternative
@@ -12,7 +12,7 @@ from polymorphic.models import PolymorphicModel
 
 from mptt.models import MPTTModel
 
-from . import monkey_patches
+from . import caching, monkey_patches
 from .managers import PublishingQuerySet, PublishingPolymorphicManager, \
     PublishingUrlNodeManager, UrlNodeQuerySetWithPublishingFeatures, \
     _queryset_iterator
@@ -74,6 +74,7 @@ class AppConfig(AppConfig):
         monkey_patches.APPLY_patch_urlnodeadminform_clean_for_publishable_items()
         monkey_patches.APPLY_patch_django_17_collector_collect()
         monkey_patches.APPLY_patch_django_18_get_candidate_relations_to_delete()
+        monkey_patches.APPLY_patch_placeholder_rendering_pipe_render_placeholder()
 
         # Monkey-patch `UrlNodeQuerySet.published` to avoid filtering out draft
         # items when we are in a draft request context when the special-case
@@ -104,6 +105,12 @@ class AppConfig(AppConfig):
             if language_code is None:
                 language_code = self._language or get_language()
 
+            cache_key = caching.get_path_cache_key(
+                self, 'get_for_path', path, language_code)
+            obj = _get_cached_routable(self, cache_key, language_code)
+            if obj is not None:
+                return obj
+
             # Don't normalize slashes, expect the URLs to be sane.
             qs = self._single_site().filter(
                 translations___cached_url=path,
@@ -111,9 +118,11 @@ class AppConfig(AppConfig):
             )
 
             matches = _filter_candidates_by_published_status(qs)
-            return _get_first_routable(
+            obj = _get_first_routable(
                 matches, self.model, path, language_code,
                 enforce_single_result=True)
+            caching.set_cached_node_id(cache_key, obj.pk)
+            return obj
 
         # Monkey-patch `UrlNodeQuerySet.best_match_for_path` to add filtering
         # by publishing status.
@@ -122,6 +131,12 @@ class AppConfig(AppConfig):
             if language_code is None:
                 language_code = self._language or get_language()
 
+            cache_key = caching.get_path_cache_key(
+                self, 'best_match_for_path', path, language_code)
+            obj = _get_cached_routable(self, cache_key, language_code)
+            if obj is not None:
+                return obj
+
             # Based on FeinCMS:
             paths = self._split_path_levels(path)
 
@@ -132,9 +147,31 @@ class AppConfig(AppConfig):
                 .order_by('-level', '-_url_length')  # / and /news/ is both level 0
 
             matches = _filter_candidates_by_published_status(qs)
-            return _get_first_routable(
+            obj = _get_first_routable(
                 matches, self.model, path, language_code,
                 enforce_single_result=False)
+            caching.set_cached_node_id(cache_key, obj.pk)
+            return obj
+
+        def _get_cached_routable(queryset, cache_key, language_code):
+            """
+            Return the node previously resolved for a path, or `None` if
+            there is no cached node or it is no longer routable.
+
+            Nodes are re-checked against the publishing status and dates,
+            which are time-dependent and so can't be part of the cache key.
+            """
+            node_id = caching.get_cached_node_id(cache_key)
+            if node_id is None:
+                return None
+            try:
+                obj = queryset.get(pk=node_id)
+            except queryset.model.DoesNotExist:
+                return None
+            if not _filter_candidates_by_published_status([obj]) == [obj]:
+                return None
+            obj.set_current_language(language_code)
+            return obj
 
         def _filter_candidates_by_published_status(candidates):
             # Filter candidate results by published status, using
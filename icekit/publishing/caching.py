@@ -0,0 +1,108 @@
+"""
+Caching for front-end requests of publishable items.
+
+The URL node resolved for a path is cached, so requests don't need to fetch
+and filter every candidate node by publishing status. These entries are
+versioned: bumping the version, which happens whenever URL nodes are saved,
+deleted, moved, published or unpublished, or their cached URLs are updated,
+invalidates every entry at once.
+
+The rendered output of placeholders on published copies is cached by
+publication time, so needs no invalidation.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.utils.encoding import force_bytes
+
+from fluent_contents.models import DEFAULT_TIMEOUT, get_parent_language_code
+
+from .middleware import is_draft_request_context
+
+VERSION_CACHE_KEY = 'icekit-publishing-path-version'
+PATH_CACHE_KEY = 'icekit-publishing-path:%s'
+PLACEHOLDER_CACHE_KEY = 'icekit-publishing-placeholder:%s'
+
+
+def get_path_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        # Start from the current time, not 1, to avoid reusing any entries
+        # still cached after the version key was evicted.
+        version = int(time.time() * 1000)
+        cache.add(VERSION_CACHE_KEY, version, None)
+        version = cache.get(VERSION_CACHE_KEY, version)
+    return version
+
+
+def bump_path_version(*args, **kwargs):
+    """
+    Invalidate all cached path resolutions. Can be used as a signal handler.
+    """
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        pass  # No version yet, so nothing to invalidate
+
+
+def get_path_cache_key(queryset, lookup, path, language_code):
+    """
+    Return the cache key for resolving `path` with the given queryset
+    `lookup` method.
+
+    The key is built from the inputs that can change the result, including
+    how the queryset was filtered by `published(for_user=...)`, but not from
+    the queryset's SQL: that includes the current time for public requests.
+    Cached nodes are fetched with the queryset, so are filtered by it anyway.
+    """
+    opts = queryset.model._meta
+    for_user = getattr(queryset, 'publishing_for_user', None)
+    key = u'|'.join([
+        str(get_path_version()),
+        '%s.%s' % (opts.app_label, opts.model_name),
+        lookup,
+        str(getattr(settings, 'SITE_ID', '')),
+        language_code,
+        path,
+        'draft' if is_draft_request_context() else 'published',
+        'for-user:%s,%s' % for_user if for_user else 'for-user:',
+    ])
+    return PATH_CACHE_KEY % hashlib.md5(force_bytes(key)).hexdigest()
+
+
+def get_cached_node_id(cache_key):
+    return cache.get(cache_key)
+
+
+def set_cached_node_id(cache_key, node_id):
+    cache.set(cache_key, node_id)
+
+
+def get_placeholder_cache_key(published_obj, slot):
+    """
+    Return the cache key for the output of a placeholder on a published copy,
+    which is only valid for the copy's current publication.
+    """
+    key = u'|'.join([
+        str(ContentType.objects.get_for_model(published_obj).pk),
+        str(published_obj.pk),
+        published_obj.publishing_published_at.isoformat(),
+        slot,
+        get_parent_language_code(published_obj) or '',
+    ])
+    return PLACEHOLDER_CACHE_KEY % hashlib.md5(force_bytes(key)).hexdigest()
+
+
+def get_cached_placeholder_output(cache_key):
+    return cache.get(cache_key)
+
+
+def set_cached_placeholder_output(cache_key, output):
+    if output.cache_timeout is not DEFAULT_TIMEOUT:
+        # The timeout is based on the minimal timeout used in plugins.
+        cache.set(cache_key, output, output.cache_timeout)
+    else:
+        cache.set(cache_key, output)
@@ -376,11 +376,30 @@ class UrlNodeQuerySetWithPublishingFeatures(UrlNodeQuerySet):
     instances of `PublishingModel`.
     """
 
+    # How `published()` filtered the queryset for a user, if it did, as a
+    # `(for_user is given, for_user.is_staff)` tuple. Part of the cache keys
+    # of path resolutions, see `icekit.publishing.caching`.
+    publishing_for_user = None
+
+    def _clone(self, *args, **kwargs):
+        clone = super(UrlNodeQuerySetWithPublishingFeatures, self) \
+            ._clone(*args, **kwargs)
+        clone.publishing_for_user = self.publishing_for_user
+        return clone
+
     def published(self, for_user=None, force_exchange=True):
         """
         Customise `UrlNodeQuerySet.published()` to add filtering by publication
         date constraints and exchange of draft items for published ones.
         """
+        qs = self._publishing_published(for_user, force_exchange)
+        qs.publishing_for_user = (
+            for_user is not None,
+            bool(for_user is not None and for_user.is_staff),
+        )
+        return qs
+
+    def _publishing_published(self, for_user, force_exchange):
         qs = self._single_site()
         # Avoid filtering to only published items when we are in a draft
         # context and we know this method is triggered by Fluent (because
@@ -10,7 +10,9 @@ from django.utils import timezone
 
 from fluent_contents.models import Placeholder
 from fluent_pages.models import UrlNode
+from fluent_pages.models.db import UrlNode_Translation
 from fluent_pages.integration.fluent_contents import FluentContentsPage
+from mptt.signals import node_moved
 
 from icekit.mixins import FluentFieldsMixin
 
@@ -18,7 +20,7 @@ from .managers import PublishingManager, PublishingUrlNodeManager
 from .middleware import is_draft_request_context
 from .utils import PublishingException, assert_draft, \
     is_automatic_publishing_enabled
-from . import signals as publishing_signals
+from . import caching, signals as publishing_signals
 
 
 class PublishingModel(models.Model):
@@ -861,6 +863,7 @@ def update_fluent_cached_urls(item, dry_run=False):
                 translation.save()
         if not dry_run:
             item._expire_url_caches()
+            caching.bump_path_version()
         # Also process all the item's children, in case changes to this item
         # affect the URL that should be cached for the children. We process
         # only draft-or-published children, according to the item's status.
@@ -876,6 +879,20 @@ def update_fluent_cached_urls(item, dry_run=False):
     return change_report
 
 
+@receiver(models.signals.post_save)
+@receiver(models.signals.post_delete)
+@receiver(node_moved)
+@receiver(publishing_signals.publishing_post_publish)
+@receiver(publishing_signals.publishing_post_unpublish)
+def bump_path_version_for_url_node(sender, instance, **kwargs):
+    """
+    Invalidate cached path resolutions when URL nodes or their translations
+    change.
+    """
+    if isinstance(instance, (UrlNode, UrlNode_Translation)):
+        caching.bump_path_version()
+
+
 @receiver(models.signals.pre_delete)
 def delete_published_copy_when_draft_deleted(sender, **kwargs):
     # Skip missing or unpublishable instances
@@ -206,3 +206,54 @@ def APPLY_patch_django_17_collector_collect():
     if not hasattr(deletion, 'get_candidate_relations_to_delete'):
         deletion.Collector._original_collect = deletion.Collector.collect
         deletion.Collector.collect = patch_django_17_collector_collect
+
+
+# Patch fluent-contents' placeholder rendering to cache the complete output of
+# placeholders on published copies of publishable items. A published copy's
+# content only changes when it is republished, so its output can be cached by
+# publication time without any invalidation. Plugins whose output depends on
+# the time or request opt out with the standard `cache_output = False`, which
+# marks the merged placeholder output as uncacheable.
+from fluent_contents.models import ContentItemOutput
+from fluent_contents.rendering.core import PlaceholderRenderingPipe
+
+
+def patch_placeholder_rendering_pipe_render_placeholder(
+        self, placeholder, parent_object=None, template_name=None,
+        cachable=None, **kwargs):
+    from . import caching
+    from .middleware import is_draft_request_context
+    from .models import PublishableFluentContents, \
+        PublishableFluentContentsPage
+
+    if parent_object is None:
+        parent_object = placeholder.parent
+    cache_key = None
+    if isinstance(parent_object,
+                  (PublishableFluentContentsPage, PublishableFluentContents)) \
+            and parent_object.is_published \
+            and parent_object.publishing_published_at \
+            and self.may_cache_placeholders() \
+            and self._can_cache_merged_output(template_name, cachable) \
+            and not self.edit_mode \
+            and not is_draft_request_context():
+        cache_key = caching.get_placeholder_cache_key(
+            parent_object, placeholder.slot)
+        output = caching.get_cached_placeholder_output(cache_key)
+        if isinstance(output, ContentItemOutput):
+            return output
+
+    output = self._original_render_placeholder(
+        placeholder, parent_object=parent_object,
+        template_name=template_name, cachable=cachable, **kwargs)
+    if cache_key and output.cacheable:
+        caching.set_cached_placeholder_output(cache_key, output)
+    return output
+
+
+def APPLY_patch_placeholder_rendering_pipe_render_placeholder():
+    if not hasattr(PlaceholderRenderingPipe, '_original_render_placeholder'):
+        PlaceholderRenderingPipe._original_render_placeholder = \
+            PlaceholderRenderingPipe.render_placeholder
+        PlaceholderRenderingPipe.render_placeholder = \
+            patch_placeholder_rendering_pipe_render_placeholder
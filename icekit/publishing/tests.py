@@ -18,6 +18,7 @@ from mock import patch, Mock
 from django_dynamic_fixture import G
 
 from fluent_contents.plugins.rawhtml.models import RawHtmlItem
+from fluent_contents import appsettings as fluent_contents_appsettings
 from fluent_contents.models import Placeholder
 
 from fluent_pages.models.db import UrlNode
@@ -27,6 +28,7 @@ from icekit.plugins.slideshow.models import SlideShow
 from icekit.page_types.layout_page.models import LayoutPage
 from icekit.utils import fluent_contents
 
+from icekit.publishing import caching
 from icekit.publishing.managers import DraftItemBoobyTrap, \
     UrlNodeQuerySetWithPublishingFeatures
 from icekit.publishing.middleware import PublishingMiddleware, \
@@ -1551,6 +1553,96 @@ class TestPublishingForPageViews(BaseAdminTest):
         response = response.follow(expect_errors=True)
         self.assertEqual(response.status_code, 404)
 
+    def test_path_resolution_is_cached_and_invalidated(self):
+        self.layoutpage.publish()
+        published_page = self.layoutpage.get_published()
+        self.assertEqual(
+            published_page,
+            UrlNode.objects.get_for_path('/test-layoutpage/'))
+
+        # Cached resolution avoids fetching and filtering candidates
+        with patch.object(caching, 'set_cached_node_id') as set_cached:
+            self.assertEqual(
+                published_page,
+                UrlNode.objects.get_for_path('/test-layoutpage/'))
+            self.assertFalse(set_cached.called)
+
+        # Draft context resolves to the draft copy, cached separately
+        with override_draft_request_context(True):
+            self.assertEqual(
+                self.layoutpage,
+                UrlNode.objects.get_for_path('/test-layoutpage/'))
+
+        # Unpublishing invalidates the cached resolution
+        self.layoutpage.unpublish()
+        self.assertRaises(
+            UrlNode.DoesNotExist,
+            UrlNode.objects.get_for_path, '/test-layoutpage/')
+
+    def test_placeholder_output_is_cached_for_published_copy(self):
+        self.layoutpage.publish()
+        published_page = self.layoutpage.get_published()
+        cache_key = caching.get_placeholder_cache_key(published_page, 'main')
+        self.assertIsNone(caching.get_cached_placeholder_output(cache_key))
+
+        response = self.app.get('/test-layoutpage/')
+        self.assertContains(response, '<b>test content instance</b>')
+        output = caching.get_cached_placeholder_output(cache_key)
+        self.assertIn('<b>test content instance</b>', output.html)
+
+        # Draft copies are not cached
+        response = self.app.get(
+            '/test-layoutpage/?preview', user=self.super_user).follow()
+        self.assertContains(response, '<b>test content instance</b>')
+        self.assertIsNone(caching.get_cached_placeholder_output(
+            caching.get_placeholder_cache_key(self.layoutpage, 'main')))
+
+        # Republishing renders the new content
+        self.content_instance.html = '<b>updated content instance</b>'
+        self.content_instance.save()
+        self.layoutpage.publish()
+        response = self.app.get('/test-layoutpage/')
+        self.assertContains(response, '<b>updated content instance</b>')
+
+    def test_placeholder_output_is_not_cached_when_disabled(self):
+        self.layoutpage.publish()
+        published_page = self.layoutpage.get_published()
+        cache_key = caching.get_placeholder_cache_key(published_page, 'main')
+        with patch.object(
+                fluent_contents_appsettings,
+                'FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT', False):
+            response = self.app.get('/test-layoutpage/')
+        self.assertContains(response, '<b>test content instance</b>')
+        self.assertIsNone(caching.get_cached_placeholder_output(cache_key))
+
+    def test_path_resolution_is_cached_for_anonymous_users(self):
+        self.layoutpage.publish()
+        published_page = self.layoutpage.get_published()
+        # As resolved by Fluent's page views
+        qs = UrlNode.objects.published(for_user=AnonymousUser()) \
+            .prefetch_related('translations')
+        self.assertEqual(
+            published_page, qs.get_for_path('/test-layoutpage/'))
+
+        # Publication date filters, which use the current time, don't stop
+        # the next request's resolution from being cached
+        with patch.object(caching, 'set_cached_node_id') as set_cached:
+            qs = UrlNode.objects.published(for_user=AnonymousUser()) \
+                .prefetch_related('translations')
+            self.assertEqual(
+                published_page, qs.get_for_path('/test-layoutpage/'))
+            self.assertFalse(set_cached.called)
+
+        # Staff users are cached separately
+        staff = G(get_user_model(), is_staff=True)
+        self.assertNotEqual(
+            caching.get_path_cache_key(
+                UrlNode.objects.published(for_user=AnonymousUser()),
+                'get_for_path', '/test-layoutpage/', 'en'),
+            caching.get_path_cache_key(
+                UrlNode.objects.published(for_user=staff),
+                'get_for_path', '/test-layoutpage/', 'en'))
+
     def test_verified_draft_url_for_publishingmodel(self):
         # Unpublished page is not visible to anonymous users
         response = self.app.get(
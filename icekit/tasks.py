@@ -14,6 +14,8 @@ from django.conf import settings
 from django.core.management import call_command
 from django.db.models.loading import get_model
 
+from icekit import appsettings
+
 
 logger = logging.getLogger(__name__)
 
@@ -67,11 +69,144 @@ def one_instance(function=None, key='', timeout=DEFAULT_ONE_INSTANCE_TIMEOUT):
 def store_readability_score(app_label, model_name, pk):
     # non-blockingly update the readability score for this work. Needs to happen after save, as all the m2m content
     # items are relevant
+    store_readability_scores(app_label, model_name, [pk])
+
+
+@shared_task
+def store_readability_scores(app_label, model_name, pks):
+    """
+    Calculate and store readability scores for a batch of objects of one model.
+    """
     cls = get_model(app_label, model_name)
-    obj = cls.objects.get(pk=pk)
-    obj.readability_score = obj.calculate_readability_score()
-     # avoid calling save() recursively
-    type(obj).objects.filter(pk=obj.pk).update(readability_score=obj.readability_score)
+    for obj in cls.objects.filter(pk__in=pks):
+        obj.readability_score = obj.calculate_readability_score()
+        # avoid calling save() recursively
+        cls.objects.filter(pk=obj.pk).update(readability_score=obj.readability_score)
+
+
+# Resources for coalescing readability score updates.
+READABILITY_PENDING_KEY = 'icekit:readability:pending'
+READABILITY_SCHEDULED_KEY = 'icekit:readability:scheduled'
+
+
+def schedule_readability_score(app_label, model_name, pk):
+    """
+    Queue a readability score update for an object.
+
+    Updates are coalesced: however often an object is saved within
+    `READABILITY_SCORE_DELAY` seconds, its score is calculated once, by a
+    single `store_pending_readability_scores` task that processes every
+    object queued in that time.
+    """
+    REDIS_CLIENT.sadd(
+        READABILITY_PENDING_KEY, '%s.%s.%s' % (app_label, model_name, pk))
+    delay = appsettings.READABILITY_SCORE_DELAY
+    # Only schedule a task if one isn't already waiting to run. The flag
+    # expires in case the task is lost.
+    if REDIS_CLIENT.set(READABILITY_SCHEDULED_KEY, 1, nx=True, ex=delay * 10 + 60):
+        store_pending_readability_scores.apply_async(countdown=delay)
+
+
+@shared_task
+def store_pending_readability_scores():
+    """
+    Store readability scores for all objects queued with
+    `schedule_readability_score`, in batches per model.
+    """
+    # Clear the flag first, so objects queued from now on schedule a new task.
+    REDIS_CLIENT.delete(READABILITY_SCHEDULED_KEY)
+
+    batch_size = appsettings.READABILITY_SCORE_BATCH_SIZE
+    failed = []
+    # Only process the objects queued so far, so objects that fail and are
+    # queued again aren't retried by this task.
+    remaining = REDIS_CLIENT.scard(READABILITY_PENDING_KEY)
+    while remaining > 0:
+        # Dequeue objects before scoring them, so objects saved again while
+        # they are scored are queued again, and scored by a later task.
+        pipe = REDIS_CLIENT.pipeline()
+        for i in range(min(batch_size, remaining)):
+            pipe.spop(READABILITY_PENDING_KEY)
+        members = [member for member in pipe.execute() if member is not None]
+        if not members:
+            break
+        remaining -= len(members)
+
+        pending_by_model = {}
+        for member in members:
+            app_label, model_name, pk = member.decode('utf-8').split('.', 2)
+            pending_by_model.setdefault((app_label, model_name), []) \
+                .append((pk, member))
+
+        for (app_label, model_name), pending in pending_by_model.items():
+            pks = [pk for pk, member in pending]
+            try:
+                store_readability_scores(app_label, model_name, pks)
+            except Exception:
+                logger.exception(
+                    'Failed to store readability scores of %s.%s objects %s'
+                    % (app_label, model_name, ', '.join(pks)))
+                failed.extend(member for pk, member in pending)
+
+    if failed:
+        # Queue failed objects again, to be retried by the task scheduled by
+        # the next save.
+        REDIS_CLIENT.sadd(READABILITY_PENDING_KEY, *failed)
+
+
+@shared_task
+def refresh_oembed_data(url, params):
+    """
+    Refresh stale cached OEmbed data for a URL.
+
+    If the provider fails, the stale data is kept and the refresh lock is
+    left to expire, so the data is refreshed again after that.
+    """
+    from django.core.cache import cache
+    from micawber import ProviderException
+    from icekit.utils import oembed
+    try:
+        oembed.refresh_oembed_data(url, **params)
+    except ProviderException as e:
+        logger.warning("Could not refresh OEmbed data for %s: %s", url, e)
+        return
+    cache.delete(
+        oembed.OEMBED_REFRESH_LOCK_KEY % oembed._get_key_hash(url, params))
+
+
+@shared_task
+def refresh_embed_items(app_label, model_name, pks):
+    """
+    Fetch and store the data of a batch of embed items of one model.
+    """
+    from icekit.utils import embeds
+    cls = get_model(app_label, model_name)
+    embeds.refresh_embed_items(cls.objects.filter(pk__in=pks))
+
+
+@shared_task
+def refresh_stale_embed_items():
+    """
+    Queue tasks to refresh embed items with placeholder or stale data, in
+    batches per model.
+    """
+    from icekit.utils import embeds
+    batch_size = appsettings.EMBED_REFRESH_BATCH_SIZE
+    for cls in embeds.get_embed_models():
+        pks = list(embeds.get_stale_embed_items(cls).values_list('pk', flat=True))
+        for i in range(0, len(pks), batch_size):
+            refresh_embed_items.delay(
+                cls._meta.app_label, cls._meta.model_name,
+                pks[i:i + batch_size])
+
+
+@shared_task
+def generate_thumbnail(app_label, model_name, pk, field_name, alias):
+    """
+    Generate a thumbnail queued by `icekit.utils.thumbnails`.
+    """
+    from icekit.utils import thumbnails
+    thumbnails.generate_thumbnail(app_label, model_name, pk, field_name, alias)
 
 
 class UpdateSearchIndexTask(Task):
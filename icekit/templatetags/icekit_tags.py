@@ -12,10 +12,11 @@ from django.template.loader_tags import do_include
 from django.utils.text import slugify
 from django.utils.encoding import force_text
 from django.utils.safestring import mark_safe
-from fluent_contents.plugins.oembeditem.backend import get_oembed_data
-from micawber import ProviderException
+from fluent_contents.rendering import render_content_items
 from icekit.admin_tools.utils import admin_link as admin_link_fn, admin_url as admin_url_fn
-from icekit.navigation import models as navigation_models
+from icekit.navigation import caching as navigation_caching, \
+    models as navigation_models
+from icekit.utils.oembed import get_cached_oembed_data
 
 register = Library()
 
@@ -231,21 +232,40 @@ def oembed(url, params=""):
     :param url: A URL of an OEmbed provider.
     :return: The OEMbed ``<embed>`` code.
     """
-    # Note: this method isn't currently very efficient - the data isn't
-    # cached or stored.
+    # Data is cached, so only URLs not seen before block on the provider.
     kwargs = dict(urlparse.parse_qsl(params))
 
     try:
-        return mark_safe(get_oembed_data(
+        return mark_safe(get_cached_oembed_data(
             url,
             **kwargs
         )['html'])
-    except (KeyError, ProviderException):
+    except (KeyError, TypeError):
         if settings.DEBUG:
             return "No OEmbed data returned"
         return ""
 
 
+@register.filter
+def thumbnail_alias_url(source, alias):
+    """
+    Return the thumbnail URL for a source file using an aliased set of
+    thumbnail options, like easy_thumbnails' `thumbnail_url` filter, but
+    queueing missing thumbnails if `ICEKIT['THUMBNAIL_ASYNC']` is enabled.
+
+    If no matching alias is found, returns an empty string.
+
+    Example usage::
+
+        <img src="{{ page.list_image|thumbnail_alias_url:'list_image' }}">
+    """
+    try:
+        from icekit.utils.thumbnails import get_thumbnail_url
+        return get_thumbnail_url(source, alias)
+    except Exception:
+        return ''
+
+
 @register.filter
 def admin_link(obj):
     """
@@ -372,7 +392,8 @@ def render_navigation(context, identifier):
     request = context['request']
 
     navigation_slug = slugify(identifier)
-    navigation = navigation_models.Navigation.objects.filter(slug=navigation_slug).first()
+    navigation = navigation_caching.get_cached_navigation(
+        navigation_models.Navigation, navigation_slug)
     if navigation:
         navigation.set_request(request)
 
@@ -391,9 +412,28 @@ def get_navigation(context, identifier):
     request = context['request']
 
     navigation_slug = slugify(identifier)
-    navigation = navigation_models.Navigation.objects.get(slug=navigation_slug)
+    navigation = navigation_caching.get_cached_navigation(
+        navigation_models.Navigation, navigation_slug)
+    if navigation is None:
+        raise navigation_models.Navigation.DoesNotExist(
+            "Navigation matching slug '%s' does not exist." % navigation_slug)
     if request:
         navigation.set_request(request)
 
     return navigation
 
+
+@register.simple_tag(takes_context=True)
+def render_navigation_items(context, navigation):
+    """
+    Render the (cached) items of a navigation, marking those active for the
+    current request with `is_active`.
+    """
+    items = navigation.get_items()
+    if not items:
+        return ''
+    active_items = navigation.active_items
+    for item in items:
+        item.is_active = item in active_items
+    return render_content_items(context['request'], items).html
+
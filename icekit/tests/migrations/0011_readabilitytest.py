@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0010_auto_20170522_1600'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadabilityTest',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('readability_score', models.DecimalField(null=True, max_digits=4, decimal_places=2)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
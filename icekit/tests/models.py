@@ -37,6 +37,10 @@ class BazWithLayout(mixins.LayoutFieldMixin):
     pass
 
 
+class ReadabilityTest(mixins.ReadabilityMixin):
+    pass
+
+
 class ImageTest(models.Model):
     image = models.ImageField(upload_to='testing/')
 
@@ -12,6 +12,7 @@ from django.contrib.auth.hashers import make_password
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
 from django.core import exceptions
+from django.core.management import CommandError, call_command
 from django.core.urlresolvers import reverse
 from django.utils import six
 from django_dynamic_fixture import G
@@ -41,7 +42,7 @@ from mock import patch, Mock
 from icekit.utils import fluent_contents, implementation
 from icekit.admin_tools import mixins
 
-from icekit import models, validators
+from icekit import appsettings, models, tasks, validators
 from icekit.tests import models as test_models
 
 # Conditional imports
@@ -591,3 +592,137 @@ class TestIceKitTags(WebTest):
         response.mustcontain('<div class="tag-fake-slot-render">None</div>')
         response.mustcontain('div class="filter-fake-slot">None</div>')
 
+
+
+class TestReadabilityScores(WebTest):
+    def setUp(self):
+        # Keep the pending set and scheduled flag in memory, as Redis would.
+        self.pending = set()
+        self.flags = set()
+
+        def set_flag(key, value, nx=False, ex=None):
+            if nx and key in self.flags:
+                return None
+            self.flags.add(key)
+            return True
+
+        def add_pending(key, *members):
+            self.pending.update(
+                m if isinstance(m, bytes) else m.encode('utf-8')
+                for m in members)
+
+        def pop_pending(key):
+            return self.pending.pop() if self.pending else None
+
+        def pipeline():
+            pipe = Mock()
+            popped = []
+            pipe.spop.side_effect = lambda key: popped.append(pop_pending(key))
+            pipe.execute.side_effect = lambda: popped
+            return pipe
+
+        redis_client = Mock()
+        redis_client.sadd.side_effect = add_pending
+        redis_client.scard.side_effect = lambda key: len(self.pending)
+        redis_client.pipeline.side_effect = pipeline
+        redis_client.set.side_effect = set_flag
+        redis_client.delete.side_effect = lambda key: self.flags.discard(key)
+
+        patchers = [
+            patch('icekit.tasks.REDIS_CLIENT', redis_client),
+            patch.object(tasks.store_pending_readability_scores, 'apply_async'),
+            patch.object(
+                test_models.ReadabilityTest, 'calculate_readability_score',
+                return_value=5),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_saves_are_coalesced(self):
+        obj_1 = G(test_models.ReadabilityTest)
+        obj_2 = G(test_models.ReadabilityTest)
+        obj_1.save()
+        self.assertEqual(
+            set([
+                ('tests.readabilitytest.%s' % obj_1.pk).encode('utf-8'),
+                ('tests.readabilitytest.%s' % obj_2.pk).encode('utf-8'),
+            ]),
+            self.pending)
+        # A single delayed task scores every object saved in the meantime
+        tasks.store_pending_readability_scores.apply_async \
+            .assert_called_once_with(
+                countdown=appsettings.READABILITY_SCORE_DELAY)
+
+    def test_store_pending_readability_scores(self):
+        objs = [G(test_models.ReadabilityTest) for i in range(3)]
+        with patch.object(appsettings, 'READABILITY_SCORE_BATCH_SIZE', 2), \
+                patch('icekit.tasks.store_readability_scores',
+                      wraps=tasks.store_readability_scores) as store:
+            tasks.store_pending_readability_scores()
+        # Objects are scored in batches per model
+        self.assertEqual(2, store.call_count)
+        for obj in objs:
+            obj = test_models.ReadabilityTest.objects.get(pk=obj.pk)
+            self.assertEqual(5, obj.readability_score)
+        self.assertEqual(set(), self.pending)
+        # Objects saved from now on schedule a new task
+        objs[0].save()
+        self.assertEqual(
+            2, tasks.store_pending_readability_scores.apply_async.call_count)
+
+    def test_store_pending_readability_scores_failure(self):
+        G(test_models.ReadabilityTest)
+        G(test_models.ReadabilityTest)
+        with patch.object(appsettings, 'READABILITY_SCORE_BATCH_SIZE', 1), \
+                patch('icekit.tasks.store_readability_scores',
+                      side_effect=[ValueError, None]) as store, \
+                patch('icekit.tasks.logger') as logger:
+            tasks.store_pending_readability_scores()
+        # A failed batch doesn't stop later batches
+        self.assertEqual(2, store.call_count)
+        self.assertEqual(1, logger.exception.call_count)
+        # Failed objects are queued again, to be scored by a later task
+        failed_pk = store.call_args_list[0][0][2][0]
+        self.assertEqual(
+            set([('tests.readabilitytest.%s' % failed_pk).encode('utf-8')]),
+            self.pending)
+
+    def test_objects_saved_while_scored_are_queued_again(self):
+        obj = G(test_models.ReadabilityTest)
+
+        def save_while_scoring(*args):
+            test_models.ReadabilityTest.objects.get(pk=obj.pk).save()
+
+        with patch('icekit.tasks.store_readability_scores',
+                   side_effect=save_while_scoring):
+            tasks.store_pending_readability_scores()
+        self.assertEqual(
+            set([('tests.readabilitytest.%s' % obj.pk).encode('utf-8')]),
+            self.pending)
+        self.assertEqual(
+            2, tasks.store_pending_readability_scores.apply_async.call_count)
+
+    def test_update_readability_scores_command(self):
+        objs = [G(test_models.ReadabilityTest) for i in range(3)]
+        with patch('icekit.management.commands.update_readability_scores.'
+                   'store_readability_scores') as store:
+            call_command(
+                'update_readability_scores', 'tests.ReadabilityTest',
+                batch_size=2, stdout=six.StringIO())
+        batches = [c[0][2] for c in store.delay.call_args_list]
+        self.assertEqual([2, 1], [len(batch) for batch in batches])
+        self.assertEqual(
+            sorted(obj.pk for obj in objs), sorted(sum(batches, [])))
+
+        call_command(
+            'update_readability_scores', 'tests.ReadabilityTest', sync=True,
+            stdout=six.StringIO())
+        for obj in objs:
+            obj = test_models.ReadabilityTest.objects.get(pk=obj.pk)
+            self.assertEqual(5, obj.readability_score)
+
+        with self.assertRaises(CommandError):
+            call_command('update_readability_scores', 'tests.Nonexistent')
+        with self.assertRaises(CommandError):
+            call_command('update_readability_scores', 'tests.BaseModel')
@@ -0,0 +1,207 @@
+"""
+Fetching and refreshing the OEmbed data stored on embed items, e.g. Instagram
+and Twitter embeds.
+
+Saving an embed item in the admin doesn't request its data from the provider.
+Placeholder data is stored instead, and the data is fetched by a background
+task. Stored data older than ``ICEKIT['EMBED_REFRESH_INTERVAL']`` seconds is
+refreshed periodically by the ``refresh_stale_embed_items`` task.
+
+Models with refreshable embed data subclass `RefreshableEmbedMixin`.
+"""
+import logging
+from datetime import timedelta
+from multiprocessing.pool import ThreadPool
+
+import requests
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+
+from icekit import appsettings
+
+logger = logging.getLogger(__name__)
+
+_session = None
+
+
+def get_session():
+    """
+    Return a `requests` session shared by all embed requests, so connections
+    to providers are pooled and reused.
+    """
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=appsettings.EMBED_REFRESH_CONCURRENCY,
+            pool_maxsize=appsettings.EMBED_REFRESH_CONCURRENCY,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _session = session
+    return _session
+
+
+def get_embed_response(url):
+    """
+    Request `url` from a provider, giving up after
+    ``ICEKIT['EMBED_REQUEST_TIMEOUT']`` seconds.
+    """
+    return get_session().get(url, timeout=appsettings.EMBED_REQUEST_TIMEOUT)
+
+
+# Marks the stored URL as not loaded, see `RefreshableEmbedMixin`.
+_DEFERRED = object()
+
+
+class RefreshableEmbedMixin(object):
+    """
+    Defer fetching the embed data of a model to a background task.
+
+    Models define a nullable `fetched_at` field, the `embed_url_field` holding
+    the URL to embed, the `embed_data_fields` to clear when the URL changes,
+    and implement `fetch_embed_data()` and `set_embed_data()`.
+    """
+    embed_url_field = 'url'
+    embed_data_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        super(RefreshableEmbedMixin, self).__init__(*args, **kwargs)
+        # Stored data, fetched or placeholder, is for the stored URL. Don't
+        # load the URL field if it is deferred.
+        self._data_embed_url = None
+        if self.pk:
+            self._data_embed_url = self.__dict__.get(
+                self.embed_url_field, _DEFERRED)
+
+    def get_embed_url(self):
+        return getattr(self, self.embed_url_field)
+
+    def get_data_embed_url(self):
+        """
+        Return the URL the stored embed data is for, looking up the stored URL
+        if the URL field was deferred.
+        """
+        if self._data_embed_url is _DEFERRED:
+            self._data_embed_url = type(self)._default_manager \
+                .filter(pk=self.pk) \
+                .values_list(self.embed_url_field, flat=True) \
+                .first()
+        return self._data_embed_url
+
+    def clean(self, *args, **kwargs):
+        """
+        Store placeholder data if the URL has changed, to be replaced by the
+        task queued when the item is saved.
+        """
+        if self.get_embed_url() != self.get_data_embed_url():
+            self.clear_embed_data()
+        super(RefreshableEmbedMixin, self).clean(*args, **kwargs)
+
+    def clear_embed_data(self):
+        for name in self.embed_data_fields:
+            field = self._meta.get_field(name)
+            setattr(self, name, None if field.null else field.get_default())
+        self.fetched_at = None
+        self._data_embed_url = self.get_embed_url()
+
+    def fetch_embed_data(self):
+        """
+        Request the embed data from the provider, without changing the item.
+
+        :return: Dict of data if successful or String if error.
+        """
+        raise NotImplementedError
+
+    def set_embed_data(self, data):
+        """
+        Set the data returned by `fetch_embed_data()`, or raise
+        `ValidationError` if it is an error.
+        """
+        raise NotImplementedError
+
+    def refresh_embed_data(self, data=None):
+        """
+        Fetch and set the embed data, keeping the current data if the
+        provider returns an error. Doesn't save the item.
+
+        :return: `True` if the data was updated.
+        """
+        if data is None:
+            data = self.fetch_embed_data()
+        self.fetched_at = timezone.now()
+        try:
+            self.set_embed_data(data)
+        except ValidationError as e:
+            logger.warning(
+                "Could not refresh embed data for %s: %s",
+                self.get_embed_url(), '; '.join(e.messages))
+            return False
+        self._data_embed_url = self.get_embed_url()
+        return True
+
+
+def get_embed_models():
+    """
+    Return all concrete models with refreshable embed data.
+    """
+    return [
+        model for model in apps.get_models()
+        if issubclass(model, RefreshableEmbedMixin)
+    ]
+
+
+def queue_embed_refresh(sender, instance, raw=False, **kwargs):
+    """
+    Queue a task to fetch the data of an item saved with placeholder data.
+    Used as a `post_save` signal handler.
+    """
+    if raw or instance.fetched_at is not None:
+        return
+    from icekit.tasks import refresh_embed_items
+    refresh_embed_items.apply_async(
+        (sender._meta.app_label, sender._meta.model_name, [instance.pk]),
+        # Give the transaction saving the item time to commit.
+        countdown=appsettings.EMBED_FETCH_DELAY,
+    )
+
+
+def _fetch_embed_data(item):
+    try:
+        return item.fetch_embed_data()
+    except requests.RequestException as e:
+        return str(e)
+
+
+def refresh_embed_items(items):
+    """
+    Fetch and store embed data for a batch of items, requesting up to
+    ``ICEKIT['EMBED_REFRESH_CONCURRENCY']`` items from providers at once.
+    """
+    items = list(items)
+    if not items:
+        return
+    # Only the requests are made in threads. Database connections are per
+    # thread, so items are saved in this one.
+    pool = ThreadPool(min(len(items), appsettings.EMBED_REFRESH_CONCURRENCY))
+    try:
+        results = pool.map(_fetch_embed_data, items)
+    finally:
+        pool.close()
+        pool.join()
+    for item, data in zip(items, results):
+        item.refresh_embed_data(data)
+        item.save()
+
+
+def get_stale_embed_items(model):
+    """
+    Return items of `model` with placeholder data, or data fetched more than
+    ``ICEKIT['EMBED_REFRESH_INTERVAL']`` seconds ago.
+    """
+    stale_before = timezone.now() - timedelta(
+        seconds=appsettings.EMBED_REFRESH_INTERVAL)
+    return model.objects.filter(
+        Q(fetched_at__isnull=True) | Q(fetched_at__lt=stale_before))
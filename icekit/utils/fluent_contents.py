@@ -1,5 +1,9 @@
 from django.contrib.contenttypes.models import ContentType
 
+from fluent_contents import appsettings as fluent_contents_appsettings
+from fluent_contents.rendering.utils import get_render_language
+from parler.utils.context import smart_override
+
 
 # USEFUL FUNCTIONS FOR FLUENT CONTENTS #############################################################
 
@@ -45,4 +49,39 @@ def create_content_instance(content_plugin_class, page, placeholder_name='main',
         )
     return content_instance
 
+
+def render_content_item(request, content_item):
+    """
+    Renders a single content item, sharing fluent's per-item output cache.
+
+    The cache is the same one used when the item is rendered as part of a
+    placeholder on the front-end, so output rendered by either is reused by
+    the other. Fluent clears the entry whenever the item is saved or deleted.
+
+    :param request: The current request object.
+    :param content_item: A content item, which may be a non-polymorphic
+    (base class) instance; the derived instance is only fetched when there
+    is no cached output.
+    :return: The `ContentItemOutput` for the content item.
+    """
+    plugin = content_item.plugin
+    if content_item.placeholder_id:
+        placeholder_name = content_item.placeholder.slot
+    else:
+        placeholder_name = '@global@'
+    use_cache = fluent_contents_appsettings.FLUENT_CONTENTS_CACHE_OUTPUT \
+        and plugin.cache_output and content_item.pk
+
+    with smart_override(get_render_language(content_item)):
+        if use_cache:
+            output = plugin.get_cached_output(placeholder_name, content_item)
+            if output is not None and hasattr(output, 'html'):
+                return output
+
+        content_item = content_item.get_real_instance()
+        output = plugin._render_contentitem(request, content_item)
+        if use_cache and output.cacheable:
+            plugin.set_cached_output(placeholder_name, content_item, output)
+    return output
+
 # END Fluent Contents Helper Functions #############################################################
@@ -0,0 +1,88 @@
+"""
+A cache of OEmbed data, so rendering embedded items doesn't block on requests
+to OEmbed providers for URLs that have been seen before.
+
+Cached data older than ``ICEKIT['OEMBED_CACHE_TIMEOUT']`` seconds is still
+returned, but refreshed in a background task (stale-while-revalidate).
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils.encoding import force_bytes
+from fluent_contents.plugins.oembeditem.backend import get_oembed_data
+from micawber import ProviderException
+from micawber.exceptions import ProviderNotFoundException
+
+from icekit import appsettings
+
+OEMBED_CACHE_KEY = 'icekit-oembed:%s'
+OEMBED_REFRESH_LOCK_KEY = 'icekit-oembed-refresh:%s'
+
+
+def _get_key_hash(url, params):
+    key = u'|'.join([url] + [
+        u'%s=%s' % (k, v) for k, v in sorted(params.items())])
+    return hashlib.md5(force_bytes(key)).hexdigest()
+
+
+def _store_oembed_data(url, params, data, timeout):
+    entry = {
+        'data': data,
+        'fetched': time.time(),
+    }
+    cache.set(OEMBED_CACHE_KEY % _get_key_hash(url, params), entry, timeout)
+
+
+def refresh_oembed_data(url, **params):
+    """
+    Request OEmbed data from the provider and store it in the cache.
+
+    Data is `None` if there is no provider for the URL, which is cached too
+    so the provider isn't asked again on every render. Other provider errors
+    are raised, leaving any cached data as it is.
+    """
+    try:
+        data = get_oembed_data(url, **params)
+    except ProviderNotFoundException:
+        data = None
+    _store_oembed_data(
+        url, params, data,
+        appsettings.OEMBED_CACHE_TIMEOUT + appsettings.OEMBED_CACHE_STALE_TIMEOUT)
+    return data
+
+
+def fetch_oembed_data(url, **params):
+    """
+    Request OEmbed data for a URL that is not cached yet, like
+    `refresh_oembed_data()`, but return `None` if the provider fails. This is
+    cached for ``ICEKIT['OEMBED_CACHE_ERROR_TIMEOUT']`` seconds, after which
+    the provider is asked again.
+    """
+    try:
+        return refresh_oembed_data(url, **params)
+    except ProviderException:
+        _store_oembed_data(
+            url, params, None, appsettings.OEMBED_CACHE_ERROR_TIMEOUT)
+        return None
+
+
+def get_cached_oembed_data(url, **params):
+    """
+    Return OEmbed data for a URL, or `None` if the provider has none.
+
+    Only URLs that are not yet cached are requested from the provider while
+    the caller waits. Stale data is returned as-is and refreshed in the
+    background.
+    """
+    key_hash = _get_key_hash(url, params)
+    entry = cache.get(OEMBED_CACHE_KEY % key_hash)
+    if entry is None:
+        return fetch_oembed_data(url, **params)
+
+    if time.time() - entry['fetched'] > appsettings.OEMBED_CACHE_TIMEOUT:
+        # Queue a single refresh, even if many requests find the data stale.
+        if cache.add(OEMBED_REFRESH_LOCK_KEY % key_hash, True, 300):
+            from icekit.tasks import refresh_oembed_data
+            refresh_oembed_data.delay(url, params)
+    return entry['data']
@@ -2,11 +2,7 @@
 
 import math
 
-from .readability_utils import get_char_count
-from .readability_utils import get_words
-from .readability_utils import get_sentences
-from .readability_utils import count_syllables
-from .readability_utils import count_complex_words
+from .readability_utils import get_text_stats
 
 
 class Readability:
@@ -16,22 +12,23 @@ class Readability:
         self.analyze_text(text)
 
     def analyze_text(self, text):
-        words = get_words(text)
-        char_count = get_char_count(words)
-        word_count = len(words)
-        sentence_count = len(get_sentences(text))
-        syllable_count = count_syllables(words)
-        complexwords_count = count_complex_words(text)
+        stats = get_text_stats(text)
+        char_count = stats['char_count']
+        word_count = stats['word_count']
+        sentence_count = stats['sentence_count']
+        syllable_count = stats['syllable_count']
+        complexwords_count = stats['complex_word_count']
         avg_words_p_sentence = word_count/sentence_count
 
         self.analyzedVars = {
-            'words': words,
+            'words': stats['words'],
             'char_cnt': float(char_count),
             'word_cnt': float(word_count),
             'sentence_cnt': float(sentence_count),
             'syllable_cnt': float(syllable_count),
             'complex_word_cnt': float(complexwords_count),
-            'avg_words_p_sentence': float(avg_words_p_sentence)
+            'avg_words_p_sentence': float(avg_words_p_sentence),
+            'long_word_cnt': float(stats['long_word_count']),
         }
 
     def ARI(self):
@@ -71,22 +68,16 @@ class Readability:
         return round(score, 4)
 
     def LIX(self):
-        longwords = 0.0
+        longwords = self.analyzedVars['long_word_cnt']
         score = 0.0
         if self.analyzedVars['word_cnt'] > 0.0:
-            for word in self.analyzedVars['words']:
-                if len(word) >= 7:
-                    longwords += 1.0
             score = self.analyzedVars['word_cnt'] / self.analyzedVars['sentence_cnt'] + float(100 * longwords) / self.analyzedVars['word_cnt']
         return score
 
     def RIX(self):
-        longwords = 0.0
+        longwords = self.analyzedVars['long_word_cnt']
         score = 0.0
         if self.analyzedVars['word_cnt'] > 0.0:
-            for word in self.analyzedVars['words']:
-                if len(word) >= 7:
-                    longwords += 1.0
             score = longwords / self.analyzedVars['sentence_cnt']
         return score
 
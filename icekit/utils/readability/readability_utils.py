@@ -3,6 +3,8 @@ utility functions for breaking down a given block of text
 into it's component syntactic parts.
 """
 
+import bisect
+
 import nltk
 
 from nltk.tokenize import RegexpTokenizer
@@ -10,65 +12,118 @@ from . import syllables_en
 
 TOKENIZER = RegexpTokenizer('(?u)\W+|\$[\d\.]+|\S+')
 SPECIAL_CHARS = ['.', ',', '!', '?']
+SYLLABLE_CACHE_SIZE = 100000
 
 def get_char_count(words):
     characters = 0
     for word in words:
-        characters += len(word.decode("utf-8"))
+        characters += _get_word_length(word)
     return characters
 
+def _get_word_length(word):
+    if isinstance(word, bytes):
+        word = word.decode("utf-8")
+    return len(word)
+
+def _clean_word(word):
+    return word.replace(",","").replace(".","").replace("!","").replace("?","")
+
 def get_words(text=''):
-    words = []
-    words = TOKENIZER.tokenize(text)
     filtered_words = []
-    for word in words:
+    for word in TOKENIZER.tokenize(text):
         if word in SPECIAL_CHARS or word == " ":
             pass
         else:
-            new_word = word.replace(",","").replace(".","")
-            new_word = new_word.replace("!","").replace("?","")
-            filtered_words.append(new_word)
+            filtered_words.append(_clean_word(word))
     return filtered_words
 
+# The punkt tokenizer is expensive to unpickle, so load it once per process.
+_sentence_tokenizer = None
+
+def get_sentence_tokenizer():
+    global _sentence_tokenizer
+    if _sentence_tokenizer is None:
+        _sentence_tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
+    return _sentence_tokenizer
+
 def get_sentences(text=''):
-    tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
-    sentences = tokenizer.tokenize(text)
-    return sentences
+    return get_sentence_tokenizer().tokenize(text)
+
+def starts_a_sentence(word, sorted_sentences):
+    """
+    Return whether any of `sorted_sentences` starts with `word`. Sentences
+    that start with `word` sort together, from where `word` would be inserted.
+    """
+    i = bisect.bisect_left(sorted_sentences, word)
+    return i < len(sorted_sentences) and sorted_sentences[i].startswith(word)
+
+# Syllable counts by word. Words repeat a lot within (and across) texts, and
+# `syllables_en.count` runs a dozen regular expressions for each new word.
+_syllable_counts = {}
+
+def count_word_syllables(word):
+    try:
+        return _syllable_counts[word]
+    except KeyError:
+        if len(_syllable_counts) >= SYLLABLE_CACHE_SIZE:
+            _syllable_counts.clear()
+        count = _syllable_counts[word] = syllables_en.count(word)
+        return count
 
 def count_syllables(words):
     syllableCount = 0
     for word in words:
-        syllableCount += syllables_en.count(word)
+        syllableCount += count_word_syllables(word)
     return syllableCount
 
-#This method must be enhanced. At the moment it only
-#considers the number of syllables in a word.
-#This often results in that too many complex words are detected.
+def is_complex_word(word, syllable_count, sorted_sentences):
+    #This method must be enhanced. At the moment it only
+    #considers the number of syllables in a word.
+    #This often results in that too many complex words are detected.
+    if syllable_count < 3:
+        return False
+    #Checking proper nouns. If a word starts with a capital letter
+    #and is NOT at the beginning of a sentence we don't add it
+    #as a complex word.
+    return not word[0].isupper() or starts_a_sentence(word, sorted_sentences)
+
 def count_complex_words(text=''):
+    sorted_sentences = sorted(get_sentences(text))
+    complex_words = 0
+    for word in get_words(text):
+        if is_complex_word(word, count_word_syllables(word), sorted_sentences):
+            complex_words += 1
+    return complex_words
+
+def get_text_stats(text=''):
+    """
+    Tokenize `text` once into words and sentences, and return the counts
+    that readability metrics are calculated from.
+    """
     words = get_words(text)
     sentences = get_sentences(text)
-    complex_words = 0
-    found = False
-    cur_word = []
+    sorted_sentences = sorted(sentences)
 
+    char_count = 0
+    syllable_count = 0
+    complex_word_count = 0
+    long_word_count = 0
     for word in words:
-        cur_word.append(word)
-        if count_syllables(cur_word)>= 3:
-
-            #Checking proper nouns. If a word starts with a capital letter
-            #and is NOT at the beginning of a sentence we don't add it
-            #as a complex word.
-            if not(word[0].isupper()):
-                complex_words += 1
-            else:
-                for sentence in sentences:
-                    if str(sentence).startswith(word):
-                        found = True
-                        break
-                if found:
-                    complex_words += 1
-                    found = False
-
-        cur_word.remove(word)
-    return complex_words
+        word_length = _get_word_length(word)
+        word_syllables = count_word_syllables(word)
+        char_count += word_length
+        syllable_count += word_syllables
+        if len(word) >= 7:
+            long_word_count += 1
+        if is_complex_word(word, word_syllables, sorted_sentences):
+            complex_word_count += 1
 
+    return {
+        'words': words,
+        'char_count': char_count,
+        'word_count': len(words),
+        'sentence_count': len(sentences),
+        'syllable_count': syllable_count,
+        'complex_word_count': complex_word_count,
+        'long_word_count': long_word_count,
+    }
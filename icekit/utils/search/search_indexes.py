@@ -1,9 +1,10 @@
 from django.utils.text import capfirst
 from easy_thumbnails.exceptions import InvalidImageFormatError
-from easy_thumbnails.files import get_thumbnailer
 from haystack import indexes
 from haystack.utils import get_model_ct
 
+from icekit.utils.thumbnails import get_thumbnail_url
+
 
 # Doesn't extend `indexes.Indexable` to avoid auto-detection for 'Search In'
 class AbstractLayoutIndex(indexes.SearchIndex):
@@ -69,7 +70,7 @@ class AbstractLayoutIndex(indexes.SearchIndex):
         if list_image:
             # resize according to the `list_image` alias
             try:
-                return get_thumbnailer(list_image)['list_image'].url
+                return get_thumbnail_url(list_image, 'list_image')
             except InvalidImageFormatError:
                 pass
         return ""
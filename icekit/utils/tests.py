@@ -1,14 +1,21 @@
+import math
 import os
 import shutil
 
 from django.conf import settings
 from django_dynamic_fixture import G
 from django_webtest import WebTest
+from micawber import ProviderException
+from micawber.exceptions import ProviderNotFoundException
+from mock import patch
 
-from icekit.utils import testing
+from icekit import appsettings
+from icekit.utils import oembed, testing, thumbnails
 from icekit.tests.models import ImageTest
 from icekit.utils.sequences import slice_sequences
 from icekit.utils.pagination import describe_page_numbers, parse_page_number
+from icekit.utils.readability import readability_utils, syllables_en
+from icekit.utils.readability.readability import Readability
 
 
 class TestingUtils(WebTest):
@@ -205,3 +212,188 @@ class TestingUtils(WebTest):
         self.assertEqual(parse_page_number('2'), 2)
         self.assertEqual(parse_page_number('-2'), 1)
         self.assertEqual(parse_page_number('2.1'), 1)
+
+
+class TestOEmbedCache(WebTest):
+
+    def test_get_cached_oembed_data(self):
+        url = 'https://www.youtube.com/watch?v=%s' % os.getpid()
+        with patch.object(oembed, 'get_oembed_data') as get_oembed_data:
+            get_oembed_data.return_value = {'html': '<iframe></iframe>'}
+            self.assertEqual(
+                {'html': '<iframe></iframe>'},
+                oembed.get_cached_oembed_data(url, max_width='100'))
+            self.assertEqual(1, get_oembed_data.call_count)
+
+            # Cached data is returned without requesting it again
+            self.assertEqual(
+                {'html': '<iframe></iframe>'},
+                oembed.get_cached_oembed_data(url, max_width='100'))
+            self.assertEqual(1, get_oembed_data.call_count)
+
+            # Data is cached separately for different parameters, including
+            # when there is no provider for the URL
+            get_oembed_data.side_effect = ProviderNotFoundException
+            self.assertIsNone(oembed.get_cached_oembed_data(url))
+            self.assertIsNone(oembed.get_cached_oembed_data(url))
+            self.assertEqual(2, get_oembed_data.call_count)
+
+            # Stale data is returned, and refreshed in the background
+            with patch.object(appsettings, 'OEMBED_CACHE_TIMEOUT', -1), \
+                    patch('icekit.tasks.refresh_oembed_data') as refresh:
+                self.assertEqual(
+                    {'html': '<iframe></iframe>'},
+                    oembed.get_cached_oembed_data(url, max_width='100'))
+                refresh.delay.assert_called_once_with(
+                    url, {'max_width': '100'})
+            self.assertEqual(2, get_oembed_data.call_count)
+
+
+    def test_refresh_oembed_data_failure(self):
+        from icekit.tasks import refresh_oembed_data
+        url = 'https://vimeo.com/%s' % os.getpid()
+        key_hash = oembed._get_key_hash(url, {})
+        with patch.object(oembed, 'get_oembed_data') as get_oembed_data:
+            get_oembed_data.return_value = {'html': '<iframe></iframe>'}
+            oembed.get_cached_oembed_data(url)
+
+            # A failed refresh keeps the stale data, and the refresh lock so
+            # it isn't retried until the lock expires
+            get_oembed_data.side_effect = ProviderException
+            oembed.cache.add(oembed.OEMBED_REFRESH_LOCK_KEY % key_hash, True)
+            refresh_oembed_data(url, {})
+            self.assertEqual(
+                {'html': '<iframe></iframe>'},
+                oembed.get_cached_oembed_data(url))
+            self.assertTrue(
+                oembed.cache.get(oembed.OEMBED_REFRESH_LOCK_KEY % key_hash))
+
+            # A successful refresh stores the new data
+            get_oembed_data.side_effect = None
+            get_oembed_data.return_value = {'html': '<video></video>'}
+            refresh_oembed_data(url, {})
+            self.assertEqual(
+                {'html': '<video></video>'},
+                oembed.get_cached_oembed_data(url))
+            self.assertIsNone(
+                oembed.cache.get(oembed.OEMBED_REFRESH_LOCK_KEY % key_hash))
+
+    def test_fetch_oembed_data_failure(self):
+        url = 'https://vimeo.com/%s/failure' % os.getpid()
+        with patch.object(oembed, 'get_oembed_data') as get_oembed_data, \
+                patch.object(oembed, '_store_oembed_data') as store:
+            get_oembed_data.side_effect = ProviderException
+            self.assertIsNone(oembed.get_cached_oembed_data(url))
+            # No data is only cached briefly when the provider fails
+            store.assert_called_once_with(
+                url, {}, None, appsettings.OEMBED_CACHE_ERROR_TIMEOUT)
+
+
+class TestThumbnailQueue(WebTest):
+
+    def test_get_thumbnail_url(self):
+        image_test = G(ImageTest)
+        with testing.get_test_image(image_test.image.storage) as image_name:
+            image_test.image = image_name
+            image_test.save()
+            args = (
+                image_test._meta.app_label,
+                image_test._meta.model_name,
+                image_test.pk,
+                'image',
+                'admin',
+            )
+
+            with patch.object(appsettings, 'THUMBNAIL_ASYNC', True), \
+                    patch('icekit.tasks.generate_thumbnail') as task:
+                # The source image is used until the thumbnail is generated,
+                # which is queued once
+                self.assertEqual(
+                    image_test.image.url,
+                    thumbnails.get_thumbnail_url(image_test.image, 'admin'))
+                self.assertEqual(
+                    image_test.image.url,
+                    thumbnails.get_thumbnail_url(image_test.image, 'admin'))
+                task.delay.assert_called_once_with(*args)
+
+                thumbnails.generate_thumbnail(*args)
+                thumbnail_url = thumbnails.get_thumbnail_url(
+                    image_test.image, 'admin')
+                self.assertNotEqual(image_test.image.url, thumbnail_url)
+                self.assertIn(settings.THUMBNAIL_BASEDIR, thumbnail_url)
+                self.assertEqual(1, task.delay.call_count)
+
+
+def _previous_count_complex_words(text):
+    # `count_complex_words()` as it was before readability metrics were
+    # calculated in a single pass, for comparison.
+    words = readability_utils.get_words(text)
+    sentences = readability_utils.get_sentences(text)
+    complex_words = 0
+    for word in words:
+        if syllables_en.count(word) >= 3:
+            if not word[0].isupper():
+                complex_words += 1
+            else:
+                for sentence in sentences:
+                    if str(sentence).startswith(word):
+                        complex_words += 1
+                        break
+    return complex_words
+
+
+class TestReadability(WebTest):
+    TEXTS = [
+        "Australian museums collect contemporary art. Curators in "
+        "Australia and America organise exhibitions every year.",
+        "Exhibitions are popular. Everybody visits the Exhibition of "
+        "Contemporary Photography! Is it educational? Absolutely, it is.",
+        "Melbourne's galleries, libraries and universities cooperate "
+        "regularly... Universities benefit. Melbourne benefits.",
+        "",
+    ]
+
+    def test_get_text_stats(self):
+        for text in self.TEXTS:
+            words = readability_utils.get_words(text)
+            stats = readability_utils.get_text_stats(text)
+            self.assertEqual(words, stats['words'])
+            self.assertEqual(len(words), stats['word_count'])
+            self.assertEqual(
+                len(readability_utils.get_sentences(text)),
+                stats['sentence_count'])
+            self.assertEqual(
+                sum(len(word) for word in words), stats['char_count'])
+            self.assertEqual(
+                sum(syllables_en.count(word) for word in words),
+                stats['syllable_count'])
+            self.assertEqual(
+                len([word for word in words if len(word) >= 7]),
+                stats['long_word_count'])
+            self.assertEqual(
+                _previous_count_complex_words(text),
+                stats['complex_word_count'])
+            self.assertEqual(
+                _previous_count_complex_words(text),
+                readability_utils.count_complex_words(text))
+
+    def test_capitalised_words_prefixing_a_sentence_are_complex(self):
+        # "Australia" starts a sentence, as a prefix of "Australian"
+        text = "Australian museums exist. People in Australia agree."
+        self.assertEqual(
+            2, readability_utils.get_text_stats(text)['complex_word_count'])
+
+    def test_readability_scores(self):
+        text = self.TEXTS[0]
+        words = readability_utils.get_words(text)
+        sentence_count = float(len(readability_utils.get_sentences(text)))
+        complex_word_count = float(_previous_count_complex_words(text))
+        long_word_count = float(len([w for w in words if len(w) >= 7]))
+        readability = Readability(text)
+        self.assertEqual(
+            math.sqrt(complex_word_count * (30 / sentence_count)) + 3,
+            readability.SMOGIndex())
+        self.assertEqual(
+            len(words) / sentence_count + 100 * long_word_count / len(words),
+            readability.LIX())
+        self.assertEqual(long_word_count / sentence_count, readability.RIX())
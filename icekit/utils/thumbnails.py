@@ -0,0 +1,86 @@
+"""
+Getting thumbnail URLs without generating missing thumbnails while a request
+waits, e.g. for listing pages with many images after a deploy.
+
+With ``ICEKIT['THUMBNAIL_ASYNC']`` enabled, missing thumbnails of model
+image fields are generated by a background task, and the URL of
+``ICEKIT['THUMBNAIL_PLACEHOLDER_URL']``, or of the source image, is returned
+until they exist.
+"""
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models.fields.files import FieldFile
+from easy_thumbnails.alias import aliases
+from easy_thumbnails.files import get_thumbnailer
+
+from icekit import appsettings
+
+THUMBNAIL_QUEUED_KEY = 'icekit-thumbnail-queued:%s:%s:%s:%s:%s'
+
+
+def _get_queued_key(app_label, model_name, pk, field_name, alias):
+    return THUMBNAIL_QUEUED_KEY % (app_label, model_name, pk, field_name, alias)
+
+
+def get_alias_options(thumbnailer, alias):
+    options = aliases.get(alias, target=thumbnailer.alias_target)
+    if not options:
+        raise KeyError(alias)
+    return options
+
+
+def get_thumbnail_url(source, alias):
+    """
+    Return the URL of the thumbnail of `source` for the thumbnail `alias`,
+    like ``get_thumbnailer(source)[alias].url``.
+    """
+    thumbnailer = get_thumbnailer(source)
+    if not appsettings.THUMBNAIL_ASYNC or not can_queue_thumbnail(source):
+        return thumbnailer[alias].url
+
+    thumbnail = thumbnailer.get_existing_thumbnail(
+        get_alias_options(thumbnailer, alias))
+    if thumbnail:
+        return thumbnail.url
+    queue_thumbnail(source, alias)
+    return appsettings.THUMBNAIL_PLACEHOLDER_URL or source.url
+
+
+def can_queue_thumbnail(source):
+    """
+    Return whether a task can find `source` again, which is only possible for
+    the file of a saved model field.
+    """
+    return isinstance(source, FieldFile) and source.instance.pk is not None
+
+
+def queue_thumbnail(source, alias):
+    """
+    Queue a task to generate the thumbnail of `source` for `alias`, unless
+    one is already queued.
+    """
+    opts = source.instance._meta
+    args = (opts.app_label, opts.model_name, source.instance.pk,
+            source.field.name, alias)
+    # Queue a single task, even if many requests find the thumbnail missing.
+    # The key expires in case the task is lost.
+    if cache.add(_get_queued_key(*args), True, 300):
+        from icekit.tasks import generate_thumbnail
+        generate_thumbnail.delay(*args)
+
+
+def generate_thumbnail(app_label, model_name, pk, field_name, alias):
+    """
+    Generate the thumbnail for `alias` of a model field file, if it is
+    missing.
+    """
+    try:
+        model = apps.get_model(app_label, model_name)
+        obj = model._default_manager.filter(pk=pk).first()
+        source = getattr(obj, field_name, None)
+        if source:
+            # Generates the thumbnail if it doesn't exist
+            get_thumbnailer(source)[alias]
+    finally:
+        cache.delete(
+            _get_queued_key(app_label, model_name, pk, field_name, alias))
@@ -18,9 +18,10 @@ import six
 from django.contrib import admin
 from django.contrib.admin import SimpleListFilter
 from django.contrib.admin.views.main import ChangeList
+from django.contrib.contenttypes.models import ContentType
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.urlresolvers import reverse
-from django.db.models import Count, Min, Max
+from django.db.models import Count
 from django.http import HttpResponse, JsonResponse
 from django.template.defaultfilters import slugify
 from django.template.response import TemplateResponse
@@ -43,7 +44,9 @@ from timezone import timezone as djtz  # django-timezone
 
 from icekit import admin as icekit_admin
 
-from . import admin_forms, forms, models
+from . import admin_forms, appsettings, forms, models
+from .caching import event_types, get_event_types
+from .utils.recurrence import get_limited_occurrences
 
 logger = logging.getLogger(__name__)
 
@@ -155,11 +158,11 @@ class PrimaryCategoryFilter(SimpleListFilter):
         in the right sidebar.
         """
 
-        types = models.EventType.objects.filter(is_public=True).order_by('slug')
+        types = sorted(
+            (t for t in get_event_types().values() if t.is_public),
+            key=lambda t: t.slug)
 
-        types = [(t.id, t.swatch()) for t in types]
-
-        return types
+        return [(t.id, event_types.get_swatch(t.id)) for t in types]
 
     def queryset(self, request, queryset):
         if self.value():
@@ -167,6 +170,15 @@ class PrimaryCategoryFilter(SimpleListFilter):
         return queryset
 
 
+class CalendarChangeList(ChangeList):
+    """
+    A change list that only filters events for the admin calendar, without
+    counting or fetching a page of results.
+    """
+    def get_results(self, request):
+        pass
+
+
 class EventAdmin(ChildModelPluginPolymorphicParentModelAdmin,
                  icekit_admin.ICEkitFluentContentsAdmin):
     """
@@ -191,29 +203,38 @@ class EventAdmin(ChildModelPluginPolymorphicParentModelAdmin,
     child_model_plugin_class = EventChildModelPlugin
     child_model_admin = EventChildAdmin
 
+    # Occurrence values needed to show occurrences in the calendar.
+    calendar_occurrence_fields = (
+        'pk',
+        'start',
+        'end',
+        'is_all_day',
+        'is_cancelled',
+        'cancel_reason',
+        'is_protected_from_regeneration',
+        'event',
+        'event__title',
+        'event__show_in_calendar',
+        'event__polymorphic_ctype',
+        'event__primary_type__color',
+    )
+
     class Media:
         css = {
             'all': ('font-awesome/css/font-awesome.css',),
         }
 
-    def get_queryset(self, request):
-        return super(EventAdmin, self).get_queryset(request).annotate(
-            last_occurrence=Max('occurrences__start'),
-            first_occurrence=Min('occurrences__start'),
-            occurrence_count=Count('occurrences')
-        )
-
     def occurrence_count(self, inst):
         return inst.occurrence_count
     occurrence_count.admin_order_field = 'occurrence_count'
 
     def first_occurrence(self, inst):
-        return inst.first_occurrence
-    first_occurrence.admin_order_field = 'first_occurrence'
+        return inst.first_start
+    first_occurrence.admin_order_field = 'first_start'
 
     def last_occurrence(self, inst):
-        return inst.last_occurrence
-    last_occurrence.admin_order_field = 'last_occurrence'
+        return inst.last_end
+    last_occurrence.admin_order_field = 'last_end'
 
     def part_of_display(self, inst):
         return admin_link(inst.part_of)
@@ -284,18 +305,23 @@ class EventAdmin(ChildModelPluginPolymorphicParentModelAdmin,
             end = None
 
         # filter the qs like the changelist filters
-        cl = ChangeList(request, self.model, self.list_display,
-                        self.list_display_links, self.list_filter,
-                        self.date_hierarchy, self.search_fields,
-                        self.list_select_related, self.list_per_page,
-                        self.list_max_show_all, self.list_editable, self)
-
-        filtered_event_ids = cl.get_queryset(request).values_list('id', flat=True)
-        all_occurrences = models.Occurrence.objects.filter(event__id__in=filtered_event_ids).overlapping(start, end)
-
-        data = []
-        for occurrence in all_occurrences.all():
-            data.append(self._calendar_json_for_occurrence(occurrence))
+        cl = CalendarChangeList(
+            request, self.model, self.list_display,
+            self.list_display_links, self.list_filter,
+            self.date_hierarchy, self.search_fields,
+            self.list_select_related, self.list_per_page,
+            self.list_max_show_all, self.list_editable, self)
+
+        # Select occurrences of the filtered events with a subquery, and
+        # everything shown for them in a single query.
+        filtered_events = cl.queryset.order_by().values('pk')
+        rows = models.Occurrence.objects \
+            .filter(event__in=filtered_events) \
+            .overlapping(start, end) \
+            .values(*self.calendar_occurrence_fields) \
+            .annotate(contained_event_count=Count('event__contained_events'))
+
+        data = [self._calendar_json_for_occurrence_row(row) for row in rows]
         data = json.dumps(data, cls=DjangoJSONEncoder)
         return HttpResponse(content=data, content_type='application/json')
 
@@ -310,59 +336,59 @@ class EventAdmin(ChildModelPluginPolymorphicParentModelAdmin,
             dt = None
         return dt
 
-    def _calendar_json_for_occurrence(self, occurrence):
+    def _calendar_json_for_occurrence_row(self, row):
         """
-        Return JSON for a single Occurrence
+        Return JSON for a single Occurrence, from a row of
+        `calendar_occurrence_fields` values.
         """
-        # Slugify the plugin's verbose name for use as a class name.
-        if occurrence.is_all_day:
-            start = occurrence.start
+        if row['is_all_day']:
+            start = row['start']
             # `end` is exclusive according to the doc in
             # http://fullcalendar.io/docs/event_data/Event_Object/, so
             # we need to add 1 day to ``end`` to have the end date
             # included in the calendar.
-            end = occurrence.start + timedelta(days=1)
+            end = row['start'] + timedelta(days=1)
         else:
-            start = djtz.localize(occurrence.start)
-            end = djtz.localize(occurrence.end)
-        if occurrence.is_cancelled and occurrence.cancel_reason:
+            start = djtz.localize(row['start'])
+            end = djtz.localize(row['end'])
+        if row['is_cancelled'] and row['cancel_reason']:
             title = u"{0} [{1}]".format(
-                occurrence.event.title, occurrence.cancel_reason)
+                row['event__title'], row['cancel_reason'])
         else:
-            title = occurrence.event.title
+            title = row['event__title']
 
-        if occurrence.event.primary_type:
-            color = occurrence.event.primary_type.color
-        else:
-            color = "#cccccc"
         return {
             'title': title,
-            'allDay': occurrence.is_all_day or occurrence.event.contained_events.exists(),
+            'allDay': row['is_all_day'] or bool(row['contained_event_count']),
             'start': start,
             'end': end,
             'url': reverse('admin:icekit_events_eventbase_change',
-                           args=[occurrence.event.pk]),
-            'className': self._calendar_classes_for_occurrence(occurrence),
-            'backgroundColor': color,
+                           args=[row['event']]),
+            'className': self._calendar_classes_for_occurrence_row(row),
+            'backgroundColor': row['event__primary_type__color'] or "#cccccc",
         }
 
-    def _calendar_classes_for_occurrence(self, occurrence):
+    def _calendar_classes_for_occurrence_row(self, row):
         """
         Return css classes to be used in admin calendar JSON
         """
-        classes = [slugify(occurrence.event.polymorphic_ctype.name)]
+        # Slugify the plugin's verbose name for use as a class name.
+        # Content types are cached, so this doesn't query for each row.
+        ctype = ContentType.objects.get_for_id(
+            row['event__polymorphic_ctype'])
+        classes = [slugify(ctype.name)]
 
         # Add a class name for the type of event.
-        if occurrence.is_all_day:
+        if row['is_all_day']:
             classes.append('is-all-day')
-        if occurrence.is_protected_from_regeneration:
+        if row['is_protected_from_regeneration']:
             classes.append('is-user-modified')
-        if occurrence.is_cancelled:
+        if row['is_cancelled']:
             classes.append('is-cancelled')
 
         # if an event isn't published or does not have show_in_calendar ticked,
         # indicate that it is hidden
-        if not occurrence.event.show_in_calendar:
+        if not row['event__show_in_calendar']:
             classes.append('do-not-show-in-calendar')
 
         # Prefix class names with "fcc-" (full calendar class).
@@ -371,9 +397,7 @@ class EventAdmin(ChildModelPluginPolymorphicParentModelAdmin,
         return classes
 
     def primary_type_swatch(self, obj):
-        if obj.primary_type:
-            return obj.primary_type.swatch(color_only=True)
-        return None
+        return obj.get_primary_type_swatch(color_only=True)
     primary_type_swatch.short_description = u'⬤'
     primary_type_swatch.admin_order_field = 'primary_type'
 
@@ -382,6 +406,30 @@ class EventWithLayoutsAdmin(EventChildAdmin, FluentLayoutsMixin):
     pass
 
 
+# Parsed rule sets, by rule and start.
+_parsed_rules = {}
+PARSED_RULES_MAX_SIZE = 256
+
+
+def parse_recurrence_rule(recurrence_rule, dtstart):
+    """
+    Return a ``rruleset`` for `recurrence_rule` starting at `dtstart`.
+
+    Rule sets are memoized, since the preview parses the same rules as users
+    type. They are expanded through the copies made by `limit_expansion()`,
+    so they don't cache their occurrences.
+    """
+    key = (recurrence_rule, dtstart)
+    try:
+        return _parsed_rules[key]
+    except KeyError:
+        if len(_parsed_rules) >= PARSED_RULES_MAX_SIZE:
+            _parsed_rules.clear()
+        rruleset = _parsed_rules[key] = rrule.rrulestr(
+            recurrence_rule, dtstart=dtstart, forceset=True)
+        return rruleset
+
+
 class RecurrenceRuleAdmin(admin.ModelAdmin):
     formfield_overrides = {
         models.RecurrenceRuleField: {'widget': forms.RecurrenceRuleWidget},
@@ -407,23 +455,63 @@ class RecurrenceRuleAdmin(admin.ModelAdmin):
     @csrf_exempt
     def preview(self, request):
         """
-        Return a occurrences in JSON format up until the configured limit.
+        Return occurrences in JSON format up until the given limit, which is
+        capped at ``RECURRENCE_RULE_PREVIEW_LIMIT``.
+
+        Several rules can be previewed at once by posting ``recurrence_rules``
+        instead of ``recurrence_rule``, to get a list of previews.
         """
-        recurrence_rule = request.POST.get('recurrence_rule')
-        limit = int(request.POST.get('limit', 10))
         try:
-            rruleset = rrule.rrulestr(
-                recurrence_rule, dtstart=djtz.now(), forceset=True)
-        except ValueError as e:
+            limit = int(request.POST.get('limit', 10))
+        except ValueError:
+            limit = 10
+        limit = max(0, min(limit, appsettings.RECURRENCE_RULE_PREVIEW_LIMIT))
+        # Start at the current minute, so parsed rules are reused
+        dtstart = djtz.now().replace(second=0, microsecond=0)
+
+        recurrence_rules = request.POST.getlist('recurrence_rules')
+        if recurrence_rules:
+            batch_limit = appsettings.RECURRENCE_RULE_PREVIEW_BATCH_LIMIT
+            if len(recurrence_rules) > batch_limit:
+                data = {
+                    'error': 'Up to %d rules can be previewed at once.'
+                        % batch_limit,
+                }
+                return JsonResponse(data, status=400)
             data = {
-                'error': six.text_type(e),
+                'previews': [
+                    self._preview_data(rule, dtstart, limit)
+                    for rule in recurrence_rules
+                ],
             }
         else:
-            data = {
-                'occurrences': rruleset[:limit]
-            }
+            data = self._preview_data(
+                request.POST.get('recurrence_rule', ''), dtstart, limit)
         return JsonResponse(data)
 
+    def _preview_data(self, recurrence_rule, dtstart, limit):
+        try:
+            rruleset = parse_recurrence_rule(recurrence_rule, dtstart)
+        except ValueError as e:
+            return {
+                'error': six.text_type(e),
+            }
+        # Only expand the occurrences that are shown, and stop scanning rules
+        # that rarely or never match, e.g. February 30
+        try:
+            occurrences = get_limited_occurrences(
+                rruleset, limit,
+                appsettings.RECURRENCE_RULE_PREVIEW_MAX_PERIODS)
+        except ValueError as e:
+            # Some rules that can never match are only rejected by `dateutil`
+            # once expanded, e.g. ``FREQ=SECONDLY;BYHOUR=25``
+            return {
+                'error': six.text_type(e),
+            }
+        return {
+            'occurrences': occurrences,
+        }
+
 
 class EventTypeAdmin(TitleSlugAdmin):
     list_display = TitleSlugAdmin.list_display + ('color', 'is_public')
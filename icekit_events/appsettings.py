@@ -58,3 +58,14 @@ DEFAULT_DATE_ENDS_DELTA = ICEKIT_EVENTS.get(
 REPEAT_LIMIT = ICEKIT_EVENTS.get('REPEAT_LIMIT', timedelta(weeks=13))
 
 DEFAULT_DAYS_TO_SHOW = ICEKIT_EVENTS.get('DEFAULT_DAYS_TO_SHOW', 1)
+
+# Maximum number of occurrences shown by the recurrence rule preview in the
+# admin, and of rules that can be previewed at once.
+RECURRENCE_RULE_PREVIEW_LIMIT = ICEKIT_EVENTS.get(
+    'RECURRENCE_RULE_PREVIEW_LIMIT', 100)
+RECURRENCE_RULE_PREVIEW_BATCH_LIMIT = ICEKIT_EVENTS.get(
+    'RECURRENCE_RULE_PREVIEW_BATCH_LIMIT', 20)
+
+# Months (or years, for yearly rules) scanned for occurrences to preview
+RECURRENCE_RULE_PREVIEW_MAX_PERIODS = ICEKIT_EVENTS.get(
+    'RECURRENCE_RULE_PREVIEW_MAX_PERIODS', 12 * 50)
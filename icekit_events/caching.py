@@ -0,0 +1,192 @@
+"""
+Caching of text derived from the occurrences of events, e.g. the date and time
+ranges shown for every event in listings, so the occurrences don't need to be
+queried each time.
+
+Cached text is versioned per event: bumping the version of an event, which
+happens whenever one of its occurrences is saved or deleted, invalidates
+every entry for that event.
+
+Event types, which rarely change but are shown for every event, are also
+kept in memory by each process, see `get_event_types()`.
+"""
+import hashlib
+import threading
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.utils.encoding import force_bytes
+from django.utils.html import format_html
+from django.utils.timezone import get_current_timezone_name
+from django.utils.translation import get_language
+
+from icekit.publishing.middleware import is_draft_request_context
+
+VERSION_CACHE_KEY = 'icekit-events-occurrences-version:%s'
+EVENT_TEXT_CACHE_KEY = 'icekit-events-text:%s'
+EVENT_TYPES_VERSION_CACHE_KEY = 'icekit-events-event-types-version'
+
+# Seconds between checks for event types changed by other processes.
+EVENT_TYPES_CHECK_INTERVAL = 10
+
+SWATCH_HTML = u'<i title="{0}" style="background-color:{1};width:1em;' \
+    u'height:1em;display:inline-block;border-radius:50%;' \
+    u'margin-bottom:-0.15em;"></i>'
+
+
+def get_occurrences_version(event_id):
+    key = VERSION_CACHE_KEY % event_id
+    version = cache.get(key)
+    if version is None:
+        # Start from the current time, not 1, to avoid reusing any entries
+        # still cached after the version key was evicted.
+        version = int(time.time() * 1000)
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+def bump_event_occurrences_version(event_id):
+    """
+    Invalidate cached text for the event, and for the events part of it.
+    """
+    try:
+        cache.incr(VERSION_CACHE_KEY % event_id)
+    except ValueError:
+        pass  # No version yet, so nothing to invalidate
+
+
+def bump_occurrences_version(sender, instance, raw=False, **kwargs):
+    """
+    Invalidate cached text for the event of an occurrence. Used as a
+    `post_save` and `post_delete` signal handler for occurrences.
+    """
+    if raw:
+        return
+    bump_event_occurrences_version(instance.event_id)
+
+
+def get_cached_event_text(event, name, format, render):
+    """
+    Return the text for `event` returned by `render(event, format)`, caching
+    it until the occurrences of the event change.
+
+    Events without occurrences of their own show those of the visible version
+    of the event they are part of, so the text is also cached until the
+    occurrences of that event change, or it is (un)published. The visible
+    version is only looked up to render the text.
+    """
+    versions = [str(get_occurrences_version(event.pk))]
+    if event.part_of_id:
+        versions.append(str(get_occurrences_version(event.part_of_id)))
+    key = u'|'.join(versions + [
+        str(event.pk),
+        str(event.part_of_id),
+        str(is_draft_request_context()),
+        # The part of event and other fields may have changed
+        event.modified.isoformat(),
+        name,
+        format or '',
+        get_language() or '',
+        get_current_timezone_name(),
+    ])
+    cache_key = EVENT_TEXT_CACHE_KEY % hashlib.md5(force_bytes(key)).hexdigest()
+    text = cache.get(cache_key)
+    if text is None:
+        text = render(event, format)
+        cache.set(cache_key, text)
+    return text
+
+
+EventTypeInfo = namedtuple(
+    'EventTypeInfo', ['id', 'title', 'slug', 'color', 'is_public'])
+
+
+def render_swatch(title, color, color_only=False):
+    """
+    Return HTML for a dot of an event type's color, followed by its title
+    unless `color_only`.
+    """
+    html = format_html(SWATCH_HTML, title, color)
+    if not color_only:
+        html += format_html(u'&nbsp;{0}', title)
+    return html
+
+
+class EventTypeRegistry(object):
+    """
+    The event types of this process, by ID, with their swatches.
+
+    Types are reloaded when they have been saved or deleted, by this process
+    immediately, or by another within `EVENT_TYPES_CHECK_INTERVAL` seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self._types = None
+        self._swatches = {}
+        self._version = None
+        self._checked_at = 0
+
+    def _get_version(self):
+        version = cache.get(EVENT_TYPES_VERSION_CACHE_KEY)
+        if version is None:
+            version = int(time.time() * 1000)
+            cache.add(EVENT_TYPES_VERSION_CACHE_KEY, version, None)
+            version = cache.get(EVENT_TYPES_VERSION_CACHE_KEY, version)
+        return version
+
+    def get_types(self):
+        with self._lock:
+            now = time.time()
+            if now - self._checked_at > EVENT_TYPES_CHECK_INTERVAL:
+                version = self._get_version()
+                if version != self._version:
+                    self._types = None
+                self._version = version
+                self._checked_at = now
+            if self._types is None:
+                from icekit_events.models import EventType
+                self._types = dict(
+                    (row[0], EventTypeInfo(*row))
+                    for row in EventType.objects.values_list(
+                        *EventTypeInfo._fields)
+                )
+                self._swatches = {}
+            return self._types
+
+    def get_swatch(self, type_id, color_only=False):
+        info = self.get_types().get(type_id)
+        if info is None:
+            return None
+        key = (type_id, color_only)
+        swatch = self._swatches.get(key)
+        if swatch is None:
+            swatch = self._swatches[key] = render_swatch(
+                info.title, info.color, color_only=color_only)
+        return swatch
+
+    def bump(self, *args, **kwargs):
+        """
+        Reload event types in all processes. Can be used as a signal handler.
+        """
+        try:
+            cache.incr(EVENT_TYPES_VERSION_CACHE_KEY)
+        except ValueError:
+            pass  # No version yet, so no process has loaded types
+        with self._lock:
+            self.clear()
+
+
+event_types = EventTypeRegistry()
+
+
+def get_event_types():
+    """
+    Return a dict of `EventTypeInfo` tuples of all event types, by ID.
+    """
+    return event_types.get_types()
@@ -0,0 +1,16 @@
+from django.core.management.base import NoArgsCommand
+
+from ...models import EventBase, refresh_event_occurrence_fields
+
+
+class Command(NoArgsCommand):
+    help = 'Refresh the fields of events denormalized from their occurrences'
+
+    def handle_noargs(self, *args, **options):
+        verbosity = int(options.get('verbosity'))
+        pks = list(EventBase.objects.values_list('pk', flat=True))
+        batch_size = 500
+        for i in range(0, len(pks), batch_size):
+            refresh_event_occurrence_fields(pks[i:i + batch_size])
+        if verbosity:
+            self.stdout.write('Refreshed %s events.' % len(pks))
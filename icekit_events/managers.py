@@ -6,8 +6,7 @@ Models for ``icekit_events`` app.
 from collections import OrderedDict
 from datetime import datetime, timedelta, time
 
-from django.db.models import F
-from django.utils.timezone import make_aware
+from django.db.models import Case, F, Min, Value, When
 from icekit.publishing.managers import PublishingPolymorphicManager, \
     PublishingPolymorphicQuerySet
 
@@ -58,14 +57,38 @@ class EventQueryset(PublishingPolymorphicQuerySet):
         return self.with_occurrence_qs(Occurrence.objects.available_within(start, end))
 
     def upcoming(self):
+        """
+        :return: events having upcoming occurrences of their own.
+
+        Events whose `next_start` is still ahead are upcoming. Occurrences are
+        only queried for events whose `next_start` has passed since it was
+        refreshed, which may have started (or, for drop-in events, still be
+        running).
+        """
         from icekit_events.models import Occurrence
-        return self.with_occurrence_qs(Occurrence.objects.upcoming()).distinct()
+        now = djtz.now()
+        return self.filter(
+            Q(next_start__gte=now) |
+            Q(pk__in=Occurrence.objects.upcoming()
+              .filter(event__next_start__lt=now).values('event'))
+        )
+
+    def expand_occurrences(self, start, end):
+        """
+        :return: A list of the occurrences of these events overlapping the
+        given start and end datetimes, including those beyond the stored
+        occurrences of repeating events, which are not saved.
+        """
+        from icekit_events.utils.expansion import expand_occurrences
+        return expand_occurrences(self, start, end)
 
     def order_by_first_occurrence(self):
         """
         :return: The event in order of minimum occurrence. 
         """
         def _key(e):
+            if e.first_start:
+                return e.first_start
             try:
                 return e.occurrence_list[0].start
             except IndexError: # no occurrences; put last
@@ -75,36 +98,90 @@ class EventQueryset(PublishingPolymorphicQuerySet):
 
     def order_by_next_occurrence(self):
         """
-        
-        :return: A list of events in order of minimum occurrence greater than 
-        now (or overlapping now in the case of drop-in events). 
-        
-        This is an expensive operation - use with as small a source 
-        queryset as possible.
-        
-        Events with no upcoming occurrence appear last (in order of their first 
-        occurrence). Events with no occurrences at all appear right at the end 
-        (in no order). To remove these, use "with_upcoming_occurrences" or 
+        :return: The events in order of their next occurrence, i.e. the first
+        starting after now (or overlapping now in the case of drop-in events).
+        Events without occurrences of their own are ordered by those of the
+        event they are part of.
+
+        Events with no upcoming occurrence appear last (in order of their first
+        occurrence). Events with no occurrences at all appear right at the end
+        (in no order). To remove these, use "with_upcoming_occurrences" or
         "with_upcoming_or_no_occurrences".
-        """
 
-        qs = self.prefetch_related('occurrences')
-        def _sort(x):
-            try:
-                # If there's an upcoming occurrence, use it.
-                return x.get_next_occurrence().start
-            except AttributeError:
-                try:
-                    # If there's any occurrence, use the first one, plus 1000 years.
-                    return x.get_first_occurrence().start + timedelta(days=1000*365)
-                except AttributeError:
-                    # If no occurence, use a localised datetime.max (minus a
-                    # few days to avoid overflow)
-                    return make_aware(datetime.max-timedelta(2))
-
-        sorted_qs = sorted(qs, key=_sort)
-
-        return sorted_qs
+        Events are ordered by their occurrence fields in the database. The
+        next occurrences of events whose `next_start` has passed since it was
+        refreshed are queried instead, without updating the events, which is
+        left to the `refresh_event_next_starts` task.
+        """
+        from icekit_events.models import Occurrence
+        now = djtz.now()
+        stale_ids = set()
+        for pk, part_of_id, occurrence_count in self \
+                .filter(
+                    Q(next_start__lt=now) |
+                    Q(occurrence_count=0, part_of__next_start__lt=now)) \
+                .values_list('pk', 'part_of', 'occurrence_count'):
+            stale_ids.add(pk if occurrence_count else part_of_id)
+        stale_next_starts = dict((pk, None) for pk in stale_ids)
+        if stale_ids:
+            stale_next_starts.update(
+                Occurrence.objects.upcoming()
+                .filter(event__in=stale_ids)
+                .order_by()
+                .values('event')
+                .annotate(next_start=Min('start'))
+                .values_list('event', 'next_start'))
+
+        def own_or_part_of(pks):
+            # Events with occurrences of their own among `pks`, or without
+            # occurrences of their own and part of one of `pks`
+            return Q(occurrence_count__gt=0, pk__in=pks) | \
+                Q(occurrence_count=0, part_of__in=pks)
+
+        def own_or_part_of_field(field, stale_values=None):
+            whens = [
+                When(own_or_part_of([pk]), then=Value(value))
+                for pk, value in (stale_values or {}).items()
+            ]
+            whens.append(
+                When(occurrence_count=0, then=F('part_of__%s' % field)))
+            return Case(
+                *whens,
+                default=F(field),
+                output_field=models.DateTimeField())
+
+        rank_whens = []
+        finished_ids = [
+            pk for pk, next_start in stale_next_starts.items()
+            if next_start is None
+        ]
+        if finished_ids:
+            # Stale events with no upcoming occurrences left
+            rank_whens.append(
+                When(own_or_part_of(finished_ids), then=Value(1)))
+        rank_whens += [
+            When(
+                Q(occurrence_count__gt=0, next_start__isnull=False) |
+                Q(occurrence_count=0, part_of__next_start__isnull=False),
+                then=Value(0)),
+            When(
+                Q(occurrence_count__gt=0) |
+                Q(occurrence_count=0, part_of__occurrence_count__gt=0),
+                then=Value(1)),
+        ]
+        return self.annotate(
+            next_occurrence_rank=Case(
+                *rank_whens,
+                default=Value(2),
+                output_field=models.IntegerField()),
+            next_occurrence_start=own_or_part_of_field(
+                'next_start', stale_next_starts),
+            first_occurrence_start=own_or_part_of_field('first_start'),
+        ).order_by(
+            'next_occurrence_rank',
+            'next_occurrence_start',
+            'first_occurrence_start',
+        )
 
 
 EventManager = PublishingPolymorphicManager.from_queryset(EventQueryset)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+from icekit_events.models import refresh_event_occurrence_fields
+
+
+def forwards_migration(apps, schema_editor):
+    """
+    Fill in the occurrence fields of existing events, which are otherwise
+    missing from upcoming event listings until the fields are refreshed.
+    """
+    EventBase = apps.get_model('icekit_events', 'EventBase')
+    Occurrence = apps.get_model('icekit_events', 'Occurrence')
+    pks = list(EventBase.objects.values_list('pk', flat=True))
+    batch_size = 500
+    for i in range(0, len(pks), batch_size):
+        refresh_event_occurrence_fields(
+            pks[i:i + batch_size],
+            event_model=EventBase,
+            occurrence_model=Occurrence,
+        )
+
+
+def reverse_migration(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('icekit_events', '0030_auto_20171002_1551'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventbase',
+            name='first_start',
+            field=models.DateTimeField(blank=True, null=True, db_index=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='eventbase',
+            name='last_end',
+            field=models.DateTimeField(blank=True, null=True, db_index=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='eventbase',
+            name='next_start',
+            field=models.DateTimeField(blank=True, null=True, db_index=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='eventbase',
+            name='occurrence_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(forwards_migration, reverse_migration),
+    ]
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('icekit_events', '0031_eventbase_occurrence_fields'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='occurrence',
+            index_together=set([('is_all_day', 'start', 'end'), ('is_all_day', 'end', 'start'), ('event', 'start')]),
+        ),
+    ]
@@ -3,7 +3,9 @@ Models for ``icekit_events`` app.
 """
 
 # Compose concrete models from abstract models and mixins, to facilitate reuse.
+import threading
 from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import timedelta
 
 from colorful.fields import RGBColorField
@@ -11,13 +13,14 @@ from dateutil import rrule
 import six
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
-from django.db.models import Q
-from django.template import Context
-from django.template import Template
+from django.db.models import Count, Max, Min, Q
 from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 
-from icekit_events.managers import EventManager, OccurrenceManager
+from icekit_events.caching import bump_event_occurrences_version, \
+    bump_occurrences_version, event_types, get_event_types, render_swatch
+from icekit_events.managers import EventManager, OccurrenceManager, \
+    OccurrenceQueryset
 from icekit_events.utils.timeutils import coerce_naive, format_naive_ical_dt, \
     zero_datetime
 from timezone import timezone as djtz  # django-timezone
@@ -34,6 +37,7 @@ from polymorphic.models import PolymorphicModel
 from icekit.content_collections.abstract_models import AbstractListingPage, \
     TitleSlugMixin, PluralTitleSlugMixin
 from icekit.models import ICEkitContentsMixin
+from icekit.publishing import signals as publishing_signals
 from icekit.fields import ICEkitURLField
 from icekit.mixins import FluentFieldsMixin
 from django.template.defaultfilters import date as datefilter
@@ -45,6 +49,9 @@ from .utils import timeutils
 # Constant object used as a flag for unset kwarg parameters
 UNSET = object()
 
+# Fields of `EventBase` denormalized from its occurrences.
+OCCURRENCE_FIELDS = ('first_start', 'last_end', 'next_start', 'occurrence_count')
+
 DATE_FORMAT = settings.DATE_FORMAT
 DATETIME_FORMAT = settings.DATE_FORMAT + " " + settings.TIME_FORMAT
 
@@ -138,8 +145,7 @@ class EventType(PluralTitleSlugMixin):
         return reverse("icekit_events_eventtype_detail", args=(self.slug, ))
 
     def swatch(self, color_only=False):
-        return Template("""<i title="{{ o }}" style="background-color:{{ o.color }};width:1em;height:1em;display:inline-block;border-radius:50%;margin-bottom:-0.15em;"></i>{% if not color_only %}&nbsp;{{ o }}{% endif %}
-        """).render(Context({'o': self, 'color_only': color_only}))
+        return render_swatch(self.title, self.color, color_only=color_only)
 
     class Meta:
         # changing the verbose name rather than renaming because model rename
@@ -267,6 +273,17 @@ class EventBase(PolymorphicModel, AbstractBaseModel, ICEkitContentsMixin,
         on_delete=models.SET_NULL
     )
 
+    # Denormalized from the event's own occurrences when they change, see
+    # `refresh_occurrence_fields()`. `next_start` is the start of the next
+    # occurrence at that time, or of the current one for drop-in events.
+    first_start = models.DateTimeField(
+        blank=True, null=True, db_index=True, editable=False)
+    last_end = models.DateTimeField(
+        blank=True, null=True, db_index=True, editable=False)
+    next_start = models.DateTimeField(
+        blank=True, null=True, db_index=True, editable=False)
+    occurrence_count = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
         ordering = ('title', 'pk')
         verbose_name = 'Event'
@@ -284,6 +301,15 @@ class EventBase(PolymorphicModel, AbstractBaseModel, ICEkitContentsMixin,
         else:
             return self.__getattribute__(attr)
 
+    def save(self, *args, **kwargs):
+        if self.pk:
+            # The occurrence fields are updated directly when occurrences
+            # change, so those of this instance may be out of date.
+            self.__dict__.update(
+                EventBase.objects.filter(pk=self.pk)
+                .values(*OCCURRENCE_FIELDS).first() or {})
+        super(EventBase, self).save(*args, **kwargs)
+
     def get_cloneable_fieldnames(self):
         return ['title']
 
@@ -344,7 +370,8 @@ class EventBase(PolymorphicModel, AbstractBaseModel, ICEkitContentsMixin,
         self.end_repeat = occurrence.start
         qs_overlapping_occurrences = self.occurrences \
             .filter(start__gte=occurrence.start)
-        qs_overlapping_occurrences.delete()
+        with deferred_occurrence_fields_refresh(self):
+            qs_overlapping_occurrences.delete()
 
         self.save()
         return variation_event
@@ -382,11 +409,11 @@ class EventBase(PolymorphicModel, AbstractBaseModel, ICEkitContentsMixin,
         the time given by the ``until`` parameter or the configured
         ``REPEAT_LIMIT`` for unlimited events.
         """
-        # Create occurrences for this event
-        count = 0
+        # Create occurrences for this event, in bulk
+        occurrences = []
         for start_dt, end_dt, generator \
                 in self.missing_occurrence_data(until=until):
-            Occurrence.objects.create(
+            occurrence = Occurrence(
                 event=self,
                 generator=generator,
                 start=start_dt,
@@ -395,20 +422,27 @@ class EventBase(PolymorphicModel, AbstractBaseModel, ICEkitContentsMixin,
                 original_end=end_dt,
                 is_all_day=generator.is_all_day,
             )
-            count += 1
+            # As `Occurrence.save()`, which `bulk_create()` doesn't call
+            occurrence.zero_all_day_times()
+            occurrences.append(occurrence)
+        if occurrences:
+            with deferred_occurrence_fields_refresh(self):
+                Occurrence.objects.bulk_create(occurrences)
+                occurrences_changed(self.pk)
 
         self.invalidate_caches()
-        return count
+        return len(occurrences)
 
     @transaction.atomic
     def regenerate_occurrences(self, until=None):
         """
         Delete and re-create occurrences for this Event.
         """
-        # Nuke any occurrences that are not user-modified
-        self.occurrences.regeneratable().delete()
-        # Generate occurrences for this event
-        self.extend_occurrences(until=until)
+        with deferred_occurrence_fields_refresh(self):
+            # Nuke any occurrences that are not user-modified
+            self.occurrences.regeneratable().delete()
+            # Generate occurrences for this event
+            self.extend_occurrences(until=until)
 
     def publishing_clone_relations(self, src_obj):
         super(EventBase, self).publishing_clone_relations(src_obj)
@@ -425,15 +459,28 @@ class EventBase(PolymorphicModel, AbstractBaseModel, ICEkitContentsMixin,
         # NOTE: Occurrences *must* be cloned first to ensure later occurrence
         # generation by cloned generators are aware of user-modifications.
 
-        # include occurrences that weren't generated OR were user-modified.
-        for occurrence in self.occurrences.filter(Q(generator__isnull=True) | Q(is_protected_from_regeneration=True)):
-            occurrence.pk = None
-            occurrence.event = dst_obj
-            occurrence.save()
-        for generator in self.repeat_generators.all():
-            generator.pk = None
-            generator.event = dst_obj
-            generator.save()
+        # Both are inserted in bulk, without the signals that would
+        # regenerate the destination's occurrences for every generator, and
+        # occurrences are regenerated once afterwards instead.
+        now = djtz.now()
+        with deferred_occurrence_fields_refresh(dst_obj):
+            # include occurrences that weren't generated OR were user-modified.
+            occurrences = list(self.occurrences.filter(Q(generator__isnull=True) | Q(is_protected_from_regeneration=True)))
+            for occurrence in occurrences:
+                occurrence.pk = None
+                occurrence.event = dst_obj
+                occurrence.modified = now
+            if occurrences:
+                Occurrence.objects.bulk_create(occurrences)
+                occurrences_changed(dst_obj.pk)
+            generators = list(self.repeat_generators.all())
+            for generator in generators:
+                generator.pk = None
+                generator.event = dst_obj
+                generator.modified = now
+            if generators:
+                EventRepeatsGenerator.objects.bulk_create(generators)
+                dst_obj.regenerate_occurrences()
 
     @cached_property
     def visible_part_of(self):
@@ -567,16 +614,62 @@ class EventBase(PolymorphicModel, AbstractBaseModel, ICEkitContentsMixin,
     def get_all_types(self):
         return self.secondary_types.all() | EventType.objects.filter(id__in=[self.primary_type_id])
 
+    def get_all_type_ids(self):
+        """
+        :return: the IDs of the primary and secondary types of the event,
+        without a query if secondary types were prefetched.
+        """
+        ids = set(t.pk for t in self.secondary_types.all())
+        if self.primary_type_id:
+            ids.add(self.primary_type_id)
+        return ids
+
+    def get_all_type_slugs(self):
+        types = get_event_types()
+        return set(
+            types[pk].slug for pk in self.get_all_type_ids() if pk in types)
+
+    def get_primary_type_swatch(self, color_only=False):
+        """
+        :return: the swatch of the primary type of the event, or None, without
+        a query.
+        """
+        if self.primary_type_id:
+            return event_types.get_swatch(
+                self.primary_type_id, color_only=color_only)
+
     def is_educational(self):
-        return self.get_all_types().filter(slug='education')
+        return 'education' in self.get_all_type_slugs()
 
     def is_members(self):
-        return self.get_all_types().filter(slug='members')
+        return 'members' in self.get_all_type_slugs()
+
+    def _has_upcoming_occurrences(self):
+        """
+        :return: Whether the event's own occurrences include upcoming ones
+        according to its occurrence fields, or None if it can't be told
+        without querying them.
+        """
+        if not self.occurrence_count:
+            # May be part of an event with occurrences
+            return None
+        if self.next_start is None:
+            # Occurrences don't become upcoming as time passes
+            return False
+        if self.next_start >= djtz.now():
+            return True
+        # The next occurrence may have started since it was refreshed
+        return None
 
     def is_upcoming(self):
+        has_upcoming = self._has_upcoming_occurrences()
+        if has_upcoming is not None:
+            return has_upcoming
         return len(self.upcoming_occurrence_list) != 0
 
     def get_next_occurrence(self):
+        if self._has_upcoming_occurrences() is False:
+            return None
         try:
             return self.upcoming_occurrence_list[0]
         except IndexError:
@@ -588,9 +681,18 @@ class EventBase(PolymorphicModel, AbstractBaseModel, ICEkitContentsMixin,
             There are occurrences, and
             There are no upcoming occurrences
         """
-
+        has_upcoming = self._has_upcoming_occurrences()
+        if has_upcoming is not None:
+            return not has_upcoming
         return self.occurrence_list and not self.upcoming_occurrence_list
 
+    def refresh_occurrence_fields(self):
+        """
+        Update the fields denormalized from the event's occurrences.
+        """
+        values = refresh_event_occurrence_fields([self.pk])
+        self.__dict__.update(values[self.pk])
+
     # Commenting for now, because it sits earlier in the MRO than a
     # project-specific mixin.
     # def get_occurrence_url(self, occurrence):
@@ -854,6 +956,14 @@ class Occurrence(AbstractBaseModel):
 
     class Meta:
         ordering = ['start', '-is_all_day', 'event', 'pk']
+        # `OccurrenceQueryset` range lookups filter on `start` or `end` with
+        # a different bound for all-day occurrences, and occurrences of an
+        # event are usually wanted in order.
+        index_together = (
+            ('is_all_day', 'start', 'end'),
+            ('is_all_day', 'end', 'start'),
+            ('event', 'start'),
+        )
 
     def time_range_string(self):
         if self.is_all_day:
@@ -904,11 +1014,7 @@ class Occurrence(AbstractBaseModel):
                 self.is_cancelled = True
             else:
                 self.is_cancelled = False
-        # Convert datetime field values to date-compatible versions in the
-        # UTC timezone when we save an all-day occurrence
-        if self.is_all_day:
-            self.start = zero_datetime(self.start)
-            self.end = zero_datetime(self.end)
+        self.zero_all_day_times()
         # Set original start/end times, if necessary
         if not self.original_start:
             self.original_start = self.start
@@ -916,6 +1022,13 @@ class Occurrence(AbstractBaseModel):
             self.original_end = self.end
         super(Occurrence, self).save(*args, **kwargs)
 
+    def zero_all_day_times(self):
+        # Convert datetime field values to date-compatible versions in the
+        # UTC timezone when we save an all-day occurrence
+        if self.is_all_day:
+            self.start = zero_datetime(self.start)
+            self.end = zero_datetime(self.end)
+
     # TODO Return __str__ as title for now, improve it later
     def title(self):
         return unicode(self)
@@ -1005,3 +1118,116 @@ def regenerate_event_occurrences(sender, instance, **kwargs):
     e.regenerate_occurrences()
 post_save.connect(regenerate_event_occurrences, sender=EventRepeatsGenerator)
 post_delete.connect(regenerate_event_occurrences, sender=EventRepeatsGenerator)
+post_save.connect(bump_occurrences_version, sender=Occurrence)
+post_delete.connect(bump_occurrences_version, sender=Occurrence)
+post_save.connect(event_types.bump, sender=EventType)
+post_delete.connect(event_types.bump, sender=EventType)
+
+
+def bump_published_occurrences_version(sender, instance, **kwargs):
+    """
+    Invalidate cached text for the events part of a published or unpublished
+    event, which show the occurrences of its visible version.
+    """
+    if isinstance(instance, EventBase):
+        bump_event_occurrences_version(instance.pk)
+publishing_signals.publishing_post_publish.connect(
+    bump_published_occurrences_version)
+publishing_signals.publishing_post_unpublish.connect(
+    bump_published_occurrences_version)
+
+
+_deferred_refresh = threading.local()
+
+
+def refresh_event_occurrence_fields(event_ids, event_model=None,
+                                    occurrence_model=None):
+    """
+    Update the fields of events denormalized from their occurrences.
+
+    Migrations pass the historical `EventBase` and `Occurrence` models as
+    `event_model` and `occurrence_model`.
+
+    :return: A dict of the field values by event ID.
+    """
+    event_model = event_model or EventBase
+    values = dict(
+        (pk, {
+            'first_start': None,
+            'last_end': None,
+            'next_start': None,
+            'occurrence_count': 0,
+        })
+        for pk in set(event_ids)
+    )
+    occurrences = OccurrenceQueryset(occurrence_model or Occurrence) \
+        .filter(event__in=values.keys())
+    for row in occurrences.order_by().values('event').annotate(
+            first_start=Min('start'),
+            last_end=Max('end'),
+            occurrence_count=Count('pk')):
+        values[row.pop('event')].update(row)
+    for row in occurrences.upcoming().order_by().values('event') \
+            .annotate(next_start=Min('start')):
+        values[row['event']]['next_start'] = row['next_start']
+    for pk, fields in values.items():
+        # Update directly, so the events aren't modified.
+        event_model.objects.filter(pk=pk).update(**fields)
+    return values
+
+
+@contextmanager
+def deferred_occurrence_fields_refresh(*events):
+    """
+    Refresh the occurrence fields of each event whose occurrences are
+    written within the block once, at the end of the block, rather than for
+    every occurrence. The fields of `events` are updated too.
+    """
+    is_outermost = getattr(_deferred_refresh, 'event_ids', None) is None
+    if is_outermost:
+        _deferred_refresh.event_ids = set()
+        _deferred_refresh.events = []
+    _deferred_refresh.events.extend(events)
+    try:
+        yield
+        if is_outermost:
+            event_ids = _deferred_refresh.event_ids
+            events = _deferred_refresh.events
+            _deferred_refresh.event_ids = None
+            values = refresh_event_occurrence_fields(event_ids)
+            for event in events:
+                event.__dict__.update(values.get(event.pk, {}))
+    finally:
+        if is_outermost:
+            _deferred_refresh.event_ids = None
+            _deferred_refresh.events = []
+
+
+def refresh_occurrence_event_fields(sender, instance, raw=False, **kwargs):
+    """
+    Refresh the occurrence fields of the event of an occurrence. Used as a
+    `post_save` and `post_delete` signal handler for occurrences.
+    """
+    if raw:
+        return
+    event_ids = getattr(_deferred_refresh, 'event_ids', None)
+    if event_ids is not None:
+        event_ids.add(instance.event_id)
+        return
+    values = refresh_event_occurrence_fields([instance.event_id])
+    event = getattr(instance, Occurrence.event.cache_name, None)
+    if event is not None:
+        event.__dict__.update(values[instance.event_id])
+post_save.connect(refresh_occurrence_event_fields, sender=Occurrence)
+post_delete.connect(refresh_occurrence_event_fields, sender=Occurrence)
+
+
+def occurrences_changed(event_id):
+    """
+    Do what the `post_save` and `post_delete` signal handlers of occurrences
+    do, once for all the occurrences of an event written without signals,
+    e.g. by `bulk_create()`.
+    """
+    instance = Occurrence(event_id=event_id)
+    bump_occurrences_version(Occurrence, instance)
+    refresh_occurrence_event_fields(Occurrence, instance)
@@ -10,4 +10,6 @@ class TodaysOccurrencesPlugin(ContentPlugin):
     filter_horizontal = ('types_to_show', )
     category = "Events"
     render_template = 'plugins/todays_occurrences/default.html'
+    # Output changes daily, so must not be cached with the placeholder.
+    cache_output = False
 
@@ -0,0 +1,25 @@
+try:
+    from celery import shared_task
+except ImportError:
+    def shared_task(f):
+        f.delay = f
+        return f
+
+from timezone import timezone as djtz  # django-timezone
+
+
+@shared_task
+def refresh_event_next_starts():
+    """
+    Refresh the occurrence fields of events whose next occurrence has started
+    since they were refreshed, so their `next_start` moves on to the
+    following occurrence.
+    """
+    from icekit_events.models import EventBase, \
+        refresh_event_occurrence_fields
+    pks = list(
+        EventBase.objects.filter(next_start__lte=djtz.now())
+        .values_list('pk', flat=True))
+    batch_size = 500
+    for i in range(0, len(pks), batch_size):
+        refresh_event_occurrence_fields(pks[i:i + batch_size])
@@ -2,11 +2,14 @@ import re
 from datetime import timedelta
 from django import template
 from django.conf import settings
+from django.core.signals import setting_changed
 from django.template.defaultfilters import time
 from django.template.defaultfilters import date as datefilter
 from django.utils.formats import get_format
 from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
 from icekit.templatetags.icekit_tags import grammatical_join
+from icekit_events.caching import get_cached_event_text
 
 register = template.Library()
 
@@ -23,7 +26,12 @@ def timesf(times_list, format=None):
 def times_range(event, format=None):
     if event.human_times:
         return event.human_times.strip()
+    if event.pk is None:
+        return _times_range(event, format)
+    return get_cached_event_text(event, 'times_range', format, _times_range)
 
+
+def _times_range(event, format=None):
     sts = timesf(event.start_times_set(), format=format)
     all_days = [o for o in event.occurrence_list if o.is_all_day]
     if all_days:
@@ -40,9 +48,43 @@ def add_days(date, days):
     return date + timedelta(days)
 
 
-YEAR_RE = r"\W*(o|y|Y)\W*" # year markers, plus any surrounding non-word text
-MONTH_RE = r"\W*(b|E|F|m|M|n|N|S|t)\W*" # month markers, plus any surrounding non-word text
+YEAR_RE = re.compile(r"\W*(o|y|Y)\W*") # year markers, plus any surrounding non-word text
+MONTH_RE = re.compile(r"\W*(b|E|F|m|M|n|N|S|t)\W*") # month markers, plus any surrounding non-word text
+
+# Derived formats, by function, format specifier and language.
+_derived_formats = {}
+
+
+def _memoize_format(func):
+    """
+    Cache the formats derived by `func` from a format specifier for each
+    language, since resolving them is repeated for every event.
+    """
+    def wrapper(format_specifier):
+        key = (func.__name__, format_specifier, get_language())
+        try:
+            return _derived_formats[key]
+        except KeyError:
+            result = _derived_formats[key] = func(format_specifier)
+            return result
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def clear_derived_formats(**kwargs):
+    _derived_formats.clear()
+
+# Formats may change in tests
+setting_changed.connect(clear_derived_formats)
 
+
+@_memoize_format
+def _format(format_specifier):
+    return get_format(format_specifier, use_l10n=True)
+
+
+@_memoize_format
 def _format_with_same_year(format_specifier):
     """
     Return a version of `format_specifier` that renders a date
@@ -58,10 +100,11 @@ def _format_with_same_year(format_specifier):
     if test_format == test_format_specifier:
         # this format string didn't resolve to anything and may be a raw format.
         # Use a regex to remove year markers instead.
-        return re.sub(YEAR_RE, '', get_format(format_specifier))
+        return YEAR_RE.sub('', get_format(format_specifier))
     else:
         return test_format
 
+@_memoize_format
 def _format_with_same_year_and_month(format_specifier):
     """
     Return a version of `format_specifier` that renders a date
@@ -77,8 +120,8 @@ def _format_with_same_year_and_month(format_specifier):
     if test_format == test_format_specifier:
         # this format string didn't resolve to anything and may be a raw format.
         # Use a regex to remove year and month markers instead.
-        no_year = re.sub(YEAR_RE, '', get_format(format_specifier))
-        return re.sub(MONTH_RE, '', no_year)
+        no_year = YEAR_RE.sub('', get_format(format_specifier))
+        return MONTH_RE.sub('', no_year)
     else:
         return test_format
 
@@ -105,8 +148,17 @@ def dates_range(event, format=""):
 
     You can override this behaviour by specifying additional formats with
     "_SAME_YEAR" and "_SAME_YEAR_SAME_MONTH" appended to the name.
+
+    The text is cached until the event's occurrences change.
     """
+    if event.human_dates:
+        return event.human_dates.strip()
+    if event.pk is None:
+        return _dates_range(event, format)
+    return get_cached_event_text(event, 'dates_range', format, _dates_range)
+
 
+def _dates_range(event, format=""):
     # TODO: factor out a more general filter that accepts 1-2 dates and
     # renders the range.
 
@@ -126,9 +178,6 @@ def dates_range(event, format=""):
         except IndexError:
             pass
 
-    if event.human_dates:
-        return event.human_dates.strip()
-
     # Get the dates from the occurrence
     first, last = event.get_occurrences_range()
     start, end = None, None
@@ -139,7 +188,7 @@ def dates_range(event, format=""):
 
     # figure out to what extent the dates differ
     if start and end:
-        first_date_format = get_format(date_format, use_l10n=True)
+        first_date_format = _format(date_format)
         if start.year == end.year:
             # use a first_date_format without the year
             first_date_format = _format_with_same_year(date_format)
@@ -0,0 +1,157 @@
+"""
+Benchmarks for the occurrence range queries used by event listings and
+calendars, against a realistic calendar.
+
+These are slow, so are not discovered with the other tests. Run them with a
+PostgreSQL database::
+
+    ICEKIT_EVENTS_BENCHMARKS=1 runtests.sh icekit_events.tests.benchmarks
+
+The size of the calendar and the maximum time allowed for each query can be
+changed with the ``ICEKIT_EVENTS_BENCHMARK_EVENTS``,
+``ICEKIT_EVENTS_BENCHMARK_OCCURRENCES`` and
+``ICEKIT_EVENTS_BENCHMARK_MAX_SECONDS`` environment variables.
+"""
+import os
+import random
+import time
+import unittest
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from timezone import timezone as djtz  # django-timezone
+
+from icekit_events.models import EventBase, Occurrence
+
+EVENT_COUNT = int(os.environ.get('ICEKIT_EVENTS_BENCHMARK_EVENTS', 10000))
+OCCURRENCE_COUNT = int(
+    os.environ.get('ICEKIT_EVENTS_BENCHMARK_OCCURRENCES', 1000000))
+MAX_SECONDS = float(os.environ.get('ICEKIT_EVENTS_BENCHMARK_MAX_SECONDS', 0.5))
+
+BATCH_SIZE = 10000
+
+
+def seed_calendar(event_count, occurrence_count):
+    """
+    Create published events with occurrences spread over two years either
+    side of now, a tenth of them drop-in and a twentieth all-day.
+    """
+    ctype = ContentType.objects.get_for_model(EventBase)
+    now = djtz.now().replace(minute=0, second=0, microsecond=0)
+    EventBase.objects.bulk_create(
+        [
+            EventBase(
+                title='Event %d' % i,
+                slug='event-%d' % i,
+                polymorphic_ctype=ctype,
+                publishing_is_draft=False,
+                is_drop_in=i % 10 == 0,
+            )
+            for i in range(event_count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    event_ids = list(EventBase.objects.values_list('pk', flat=True))
+
+    rand = random.Random(0)
+    occurrences = []
+    for i in range(occurrence_count):
+        is_all_day = i % 20 == 0
+        start = now + timedelta(hours=rand.randint(-24 * 365, 24 * 365))
+        if is_all_day:
+            start = start.replace(hour=0)
+            end = start + timedelta(days=1) - timedelta(microseconds=1)
+        else:
+            end = start + timedelta(hours=rand.randint(1, 8))
+        occurrences.append(Occurrence(
+            event_id=rand.choice(event_ids),
+            start=start,
+            end=end,
+            is_all_day=is_all_day,
+            is_hidden=i % 100 == 0,
+        ))
+        if len(occurrences) == BATCH_SIZE:
+            Occurrence.objects.bulk_create(occurrences)
+            occurrences = []
+    Occurrence.objects.bulk_create(occurrences)
+
+    # Update the planner's statistics for the new rows
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE %s' % EventBase._meta.db_table)
+        cursor.execute('ANALYZE %s' % Occurrence._meta.db_table)
+
+
+def explain(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN ' + sql, params)
+        return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+@unittest.skipUnless(
+    os.environ.get('ICEKIT_EVENTS_BENCHMARKS'),
+    'Set ICEKIT_EVENTS_BENCHMARKS to run benchmarks')
+class OccurrenceQueryBenchmarks(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if connection.vendor != 'postgresql':
+            raise unittest.SkipTest('Benchmarks require PostgreSQL')
+        super(OccurrenceQueryBenchmarks, cls).setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_calendar(EVENT_COUNT, OCCURRENCE_COUNT)
+        cls.now = djtz.now()
+
+    def assertUsesIndexes(self, queryset):
+        plan = explain(queryset)
+        self.assertNotIn(
+            'Seq Scan on %s' % Occurrence._meta.db_table, plan,
+            msg='Occurrences are scanned sequentially:\n%s' % plan)
+
+    def assertFast(self, queryset):
+        started = time.time()
+        list(queryset)
+        seconds = time.time() - started
+        self.assertLess(
+            seconds, MAX_SECONDS,
+            msg='Query took %.3fs:\n%s' % (seconds, explain(queryset)))
+
+    def assertFastWithIndexes(self, queryset):
+        self.assertUsesIndexes(queryset)
+        self.assertFast(queryset)
+
+    def test_listing_for_date(self):
+        # As listed by `AbstractEventListingForDatePage`
+        qs = Occurrence.objects \
+            .available_within(self.now, self.now + timedelta(days=1)) \
+            .published() \
+            .filter(event__show_in_calendar=True, is_hidden=False)
+        self.assertFastWithIndexes(qs)
+
+    def test_overlapping_week(self):
+        qs = Occurrence.objects \
+            .overlapping(self.now, self.now + timedelta(days=7)) \
+            .published() \
+            .filter(is_hidden=False)
+        self.assertFastWithIndexes(qs)
+
+    def test_starts_within_month(self):
+        qs = Occurrence.objects \
+            .starts_within(self.now, self.now + timedelta(days=30)) \
+            .published()[:100]
+        self.assertFastWithIndexes(qs)
+
+    def test_upcoming_for_event(self):
+        event = EventBase.objects.filter(is_drop_in=False).first()
+        qs = event.occurrences.upcoming()[:1]
+        self.assertFastWithIndexes(qs)
+
+    def test_events_overlapping_week(self):
+        qs = EventBase.objects \
+            .overlapping(self.now, self.now + timedelta(days=7)) \
+            .distinct()
+        self.assertFast(qs)
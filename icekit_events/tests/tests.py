@@ -10,17 +10,20 @@ from icekit_events.admin_forms import BaseEventRepeatsGeneratorForm
 from timezone import timezone as djtz  # django-timezone
 from datetime import datetime, timedelta, time
 import six
+import itertools
 import json
 
+from dateutil import rrule
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.core.management import call_command
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.forms.models import fields_for_model
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 
 from django_dynamic_fixture import G
 from django_webtest import WebTest
@@ -30,8 +33,11 @@ from icekit_events import appsettings, forms, models
 from icekit_events.event_types.simple.models import SimpleEvent
 from icekit_events.models import get_occurrence_times_for_event, coerce_naive, \
     Occurrence, RecurrenceRule
+from icekit_events.caching import get_event_types
+from icekit_events.tasks import refresh_event_next_starts
+from icekit_events.templatetags.events_tags import dates_range, times_range
 from icekit_events.utils.timeutils import localize_preserving_time_of_day
-from icekit_events.utils import timeutils
+from icekit_events.utils import recurrence, timeutils
 
 
 class TestAdmin(WebTest):
@@ -737,6 +743,175 @@ class TestAdmin(WebTest):
                 occurrence.is_all_day,
                 entry['allDay'])
 
+    def test_admin_calendar_data_queries(self):
+        repeat_end = localize_preserving_time_of_day(
+            self.end + timedelta(days=7))
+
+        def get_calendar_data():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.app.get(
+                    url=reverse('admin:icekit_events_eventbase_calendar_data'),
+                    params={
+                        'start': self.start.date(),
+                        'end': repeat_end.date() + timedelta(days=1),
+                    },
+                    user=self.superuser,
+                )
+            return json.loads(response.content), len(queries)
+
+        event = G(SimpleEvent, title='Test Event', layout=self.layout)
+        G(
+            models.EventRepeatsGenerator,
+            event=event,
+            start=self.start,
+            end=self.end,
+            recurrence_rule="FREQ=DAILY",
+            repeat_end=repeat_end,
+        )
+        data, num_queries = get_calendar_data()
+
+        contained_event = G(
+            SimpleEvent,
+            title='Contained Event',
+            layout=self.layout,
+            part_of=event,
+        )
+        G(
+            models.EventRepeatsGenerator,
+            event=contained_event,
+            start=self.start,
+            end=self.end,
+            recurrence_rule="FREQ=DAILY",
+            repeat_end=repeat_end,
+        )
+        more_data, more_num_queries = get_calendar_data()
+
+        # The number of queries doesn't depend on the number of occurrences
+        self.assertEqual(len(data) * 2, len(more_data))
+        self.assertEqual(num_queries, more_num_queries)
+        # Occurrences of events with contained events are shown as all-day
+        for entry in more_data:
+            self.assertEqual(entry['title'] == 'Test Event', entry['allDay'])
+            self.assertIn('fcc-simple-event', entry['className'])
+
+        # Identical occurrences are shown separately
+        occurrence = event.occurrences.all()[0]
+        occurrence.pk = None
+        occurrence.save()
+        self.assertEqual(len(more_data) + 1, len(get_calendar_data()[0]))
+
+    def test_recurrence_rule_preview(self):
+        url = reverse('admin:icekit_events_recurrencerule_preview')
+        response = self.app.post(
+            url,
+            {'recurrence_rule': 'RRULE:FREQ=DAILY', 'limit': 5},
+            user=self.superuser,
+        )
+        self.assertEqual(5, len(response.json['occurrences']))
+        # The number of occurrences is capped
+        response = self.app.post(
+            url,
+            {'recurrence_rule': 'RRULE:FREQ=DAILY', 'limit': 100000},
+            user=self.superuser,
+        )
+        self.assertEqual(
+            appsettings.RECURRENCE_RULE_PREVIEW_LIMIT,
+            len(response.json['occurrences']))
+        # Several rules can be previewed at once
+        response = self.app.post(
+            url,
+            [
+                ('recurrence_rules', 'RRULE:FREQ=WEEKLY'),
+                ('recurrence_rules', 'RRULE:FREQ=SECONDLY'),
+                ('recurrence_rules', 'RRULE:FREQ=NONSENSE'),
+            ],
+            user=self.superuser,
+        )
+        previews = response.json['previews']
+        self.assertEqual(3, len(previews))
+        self.assertEqual(10, len(previews[0]['occurrences']))
+        self.assertEqual(10, len(previews[1]['occurrences']))
+        self.assertIn('error', previews[2])
+        # Rules that never match stop being expanded
+        response = self.app.post(
+            url,
+            {'recurrence_rule': 'RRULE:FREQ=DAILY;BYMONTH=2;BYMONTHDAY=30'},
+            user=self.superuser,
+        )
+        self.assertEqual([], response.json['occurrences'])
+        # Rules that dateutil only rejects once expanded are errors too
+        response = self.app.post(
+            url,
+            {'recurrence_rule': 'RRULE:FREQ=SECONDLY;BYHOUR=25'},
+            user=self.superuser,
+        )
+        self.assertIn('error', response.json)
+        # Rules that rarely match show the occurrences found so far
+        response = self.app.post(
+            url,
+            {'recurrence_rule': 'RRULE:FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=29'},
+            user=self.superuser,
+        )
+        self.assertEqual(10, len(response.json['occurrences']))
+
+    def test_event_ical(self):
+        event = G(
+            SimpleEvent,
+            title='Test Event',
+            slug='test-event',
+            layout=self.layout,
+        )
+        G(
+            models.EventRepeatsGenerator,
+            event=event,
+            start=self.start,
+            end=self.end,
+            recurrence_rule="FREQ=DAILY",
+            repeat_end=self.start + timedelta(days=7),
+        )
+        # Cancel an occurrence like the admin does
+        cancelled = event.occurrences.all()[1]
+        cancelled.cancel_reason = 'Closed'
+        cancelled._flag_user_modification = True
+        cancelled.save()
+        event.publish()
+
+        response = self.app.get(
+            reverse('icekit_events_eventbase_ical', args=('test-event',)))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            'text/calendar; charset=utf-8', response['content-type'])
+        lines = response.content.decode('utf-8').split('\r\n')
+        self.assertEqual('BEGIN:VCALENDAR', lines[0])
+        self.assertEqual('END:VCALENDAR', lines[-2])
+        # Local times refer to a description of the current timezone
+        self.assertEqual(1, lines.count('BEGIN:VTIMEZONE'))
+        self.assertIn('TZID:%s' % settings.TIME_ZONE, lines)
+        self.assertIn('BEGIN:DAYLIGHT', lines)
+        self.assertLess(
+            lines.index('END:VTIMEZONE'), lines.index('BEGIN:VEVENT'))
+        self.assertTrue([
+            l for l in lines
+            if l.startswith('DTSTART;TZID=%s:' % settings.TIME_ZONE)])
+        # Occurrences are described by the generator's rule, not one by one
+        self.assertEqual(1, lines.count('BEGIN:VEVENT'))
+        self.assertIn('SUMMARY:Test Event', lines)
+        rrule = [l for l in lines if l.startswith('RRULE:')]
+        self.assertEqual(1, len(rrule))
+        self.assertTrue(rrule[0].startswith('RRULE:FREQ=DAILY;UNTIL='))
+        exdates = [l for l in lines if l.startswith('EXDATE;')]
+        self.assertEqual(
+            [timeutils.format_naive_ical_dt(cancelled.start)],
+            [l.split(':', 1)[1] for l in exdates])
+
+        # The feed isn't rendered again for clients with the current version
+        response = self.app.get(
+            reverse('icekit_events_eventbase_ical', args=('test-event',)),
+            headers={'If-None-Match': response['ETag']},
+            status=304,
+        )
+        self.assertEqual(304, response.status_code)
+
     # TODO Test Event cloning
 
 
@@ -787,6 +962,28 @@ class TestRecurrenceRule(TestCase):
         )
         self.assertEqual(six.text_type(recurrence_rule), 'description')
 
+    def test_get_limited_occurrences(self):
+        rruleset = rrule.rrulestr(
+            'RRULE:FREQ=DAILY', dtstart=datetime(2017, 1, 1), forceset=True)
+        # Only the first month is scanned
+        occurrences = recurrence.get_limited_occurrences(rruleset, 100, 1)
+        self.assertEqual(31, len(occurrences))
+        self.assertEqual(datetime(2017, 1, 31), occurrences[-1])
+        self.assertEqual(
+            10, len(recurrence.get_limited_occurrences(rruleset, 10, 1)))
+        # Rules that never match stop being scanned
+        self.assertEqual([], recurrence.get_limited_occurrences(
+            rrule.rrulestr(
+                'RRULE:FREQ=DAILY;BYMONTH=2;BYMONTHDAY=30',
+                dtstart=datetime(2017, 1, 1), forceset=True),
+            10, 12))
+        # Only copies of the rules are limited
+        with self.assertRaises(recurrence.ExpansionLimitExceeded):
+            list(itertools.islice(
+                recurrence.limit_expansion(rruleset, 1), 100))
+        self.assertEqual(100, len(list(itertools.islice(rruleset, 100))))
+        self.assertIs(rrule.rrule, type(rruleset._rrule[0]))
+
 
 class TestEventModel(TestCase):
 
@@ -839,6 +1036,199 @@ class TestEventModel(TestCase):
         self.assertEqual(
             (None, None), event.get_occurrences_range())
 
+    def test_cached_dates_and_times_range(self):
+        event = G(SimpleEvent)
+        start = djtz.datetime(2017, 10, 2, 10)
+        G(Occurrence, event=event, start=start, end=start + timedelta(hours=1))
+        self.assertEqual('2017-10-02', dates_range(event, 'Y-m-d'))
+        self.assertEqual('10:00', times_range(event, 'H:i'))
+        # Cached text is used without querying occurrences
+        event = SimpleEvent.objects.get(pk=event.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual('2017-10-02', dates_range(event, 'Y-m-d'))
+            self.assertEqual('10:00', times_range(event, 'H:i'))
+        # Until the occurrences change
+        start = djtz.datetime(2017, 11, 3, 14)
+        G(Occurrence, event=event, start=start, end=start + timedelta(hours=1))
+        event = SimpleEvent.objects.get(pk=event.pk)
+        self.assertEqual(
+            '10-02&nbsp;&ndash; 2017-11-03', dates_range(event, 'Y-m-d'))
+        self.assertEqual('10:00, 14:00', times_range(event, 'H:i'))
+
+    def test_cached_dates_range_of_part_of_event(self):
+        parent = G(SimpleEvent)
+        start = djtz.datetime(2017, 10, 2, 10)
+        G(Occurrence, event=parent, start=start,
+          end=start + timedelta(hours=1))
+        parent.publish()
+        event = G(SimpleEvent, part_of=parent)
+        # Events without occurrences show those of the published event they
+        # are part of
+        self.assertEqual('2017-10-02', dates_range(event, 'Y-m-d'))
+        # Which isn't looked up for cached text
+        event = SimpleEvent.objects.get(pk=event.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual('2017-10-02', dates_range(event, 'Y-m-d'))
+        # Until the event they are part of is published again
+        start = djtz.datetime(2017, 11, 3, 14)
+        G(Occurrence, event=parent, start=start,
+          end=start + timedelta(hours=1))
+        event = SimpleEvent.objects.get(pk=event.pk)
+        self.assertEqual('2017-10-02', dates_range(event, 'Y-m-d'))
+        parent.publish()
+        event = SimpleEvent.objects.get(pk=event.pk)
+        self.assertEqual(
+            '10-02&nbsp;&ndash; 2017-11-03', dates_range(event, 'Y-m-d'))
+
+    def test_event_types(self):
+        education = G(models.EventType, title='Education', slug='education')
+        talk = G(models.EventType, title='Talk', slug='talk', color='#ff0000')
+        event = G(SimpleEvent, primary_type=talk)
+        event.secondary_types.add(education)
+        event = SimpleEvent.objects.prefetch_related('secondary_types') \
+            .get(pk=event.pk)
+        get_event_types()
+        # Types are known without querying them
+        with self.assertNumQueries(0):
+            self.assertTrue(event.is_educational())
+            self.assertFalse(event.is_members())
+            self.assertEqual(
+                talk.swatch(color_only=True),
+                event.get_primary_type_swatch(color_only=True))
+        self.assertIn('#ff0000', talk.swatch())
+        self.assertIn('&nbsp;Talk', talk.swatch())
+        # Until they change
+        talk.title = 'Lecture'
+        talk.save()
+        self.assertEqual(
+            talk.swatch(), event.get_primary_type_swatch())
+        self.assertIn('&nbsp;Lecture', event.get_primary_type_swatch())
+
+    def test_occurrence_fields(self):
+        now = djtz.now()
+        event = G(SimpleEvent)
+        self.assertEqual(0, event.occurrence_count)
+        self.assertIsNone(event.first_start)
+        # Fields are refreshed when occurrences are saved
+        past = G(Occurrence, event=event,
+                 start=now - timedelta(hours=2), end=now - timedelta(hours=1))
+        upcoming = G(Occurrence, event=event,
+                     start=now + timedelta(hours=1), end=now + timedelta(hours=2))
+        event = SimpleEvent.objects.get(pk=event.pk)
+        self.assertEqual(2, event.occurrence_count)
+        self.assertEqual(past.start, event.first_start)
+        self.assertEqual(upcoming.end, event.last_end)
+        self.assertEqual(upcoming.start, event.next_start)
+        # Upcoming events are known without querying occurrences
+        with self.assertNumQueries(0):
+            self.assertTrue(event.is_upcoming())
+            self.assertFalse(event.has_finished())
+        # Saving the event doesn't overwrite fields refreshed since it loaded
+        upcoming.delete()
+        event.save()
+        event = SimpleEvent.objects.get(pk=event.pk)
+        self.assertEqual(1, event.occurrence_count)
+        self.assertIsNone(event.next_start)
+        with self.assertNumQueries(0):
+            self.assertFalse(event.is_upcoming())
+            self.assertTrue(event.has_finished())
+            self.assertIsNone(event.get_next_occurrence())
+
+    def test_occurrence_fields_of_generated_occurrences(self):
+        event = G(SimpleEvent)
+        G(
+            models.EventRepeatsGenerator,
+            event=event,
+            start=self.start,
+            end=self.start + timedelta(hours=1),
+            recurrence_rule='FREQ=DAILY',
+            repeat_end=self.start + timedelta(days=10),
+        )
+        event = SimpleEvent.objects.get(pk=event.pk)
+        self.assertEqual(10, event.occurrence_count)
+        self.assertEqual(self.start, event.first_start)
+        self.assertEqual(
+            self.start + timedelta(days=9, hours=1), event.last_end)
+        # The next start moves on as occurrences start
+        models.EventBase.objects.filter(pk=event.pk) \
+            .update(next_start=self.start - timedelta(days=1))
+        refresh_event_next_starts()
+        event = SimpleEvent.objects.get(pk=event.pk)
+        self.assertEqual(
+            event.occurrences.upcoming()[0].start, event.next_start)
+
+    def test_clone_event_relationships(self):
+        event = G(SimpleEvent)
+        for hour in (1, 2):
+            G(
+                models.EventRepeatsGenerator,
+                event=event,
+                start=self.start + timedelta(hours=hour),
+                end=self.start + timedelta(hours=hour + 1),
+                recurrence_rule='FREQ=DAILY',
+                repeat_end=self.start + timedelta(days=30),
+            )
+        cancelled = event.occurrences.all()[3]
+        cancelled.cancel_reason = 'Closed'
+        cancelled._flag_user_modification = True
+        cancelled.save()
+        self.assertEqual(60, event.occurrences.count())
+        # Occurrences are copied in bulk, not one by one
+        published = G(SimpleEvent)
+        with CaptureQueriesContext(connection) as queries:
+            event.clone_event_relationships(published)
+        self.assertLess(len(queries), 30)
+        self.assertEqual(2, published.repeat_generators.count())
+        self.assertEqual(60, published.occurrences.count())
+        self.assertEqual(
+            [cancelled.start],
+            [o.start for o in published.occurrences.filter(is_cancelled=True)])
+        self.assertEqual(60, published.occurrence_count)
+        self.assertEqual(
+            self.start + timedelta(hours=1), published.first_start)
+
+    def test_expand_occurrences(self):
+        event = G(SimpleEvent)
+        G(
+            models.EventRepeatsGenerator,
+            event=event,
+            start=self.start,
+            end=self.start + timedelta(hours=1),
+            recurrence_rule='FREQ=DAILY',
+        )
+        events = SimpleEvent.objects.filter(pk=event.pk)
+        # Stored occurrences are returned within the repeat limit...
+        start = self.start + timedelta(hours=12)
+        occurrences = events.expand_occurrences(
+            start, start + timedelta(days=7))
+        self.assertEqual(7, len(occurrences))
+        self.assertTrue(all(o.pk for o in occurrences))
+        # ...including those modified by a user, in place of generated ones
+        cancelled = occurrences[2]
+        event.cancel_occurrence(cancelled)
+        moved = occurrences[3]
+        moved.start += timedelta(hours=2)
+        moved.end += timedelta(hours=2)
+        moved._flag_user_modification = True
+        moved.save()
+        occurrences = events.expand_occurrences(
+            start, start + timedelta(days=7))
+        self.assertEqual(7, len(occurrences))
+        self.assertTrue(occurrences[2].is_cancelled)
+        self.assertEqual(moved.start, occurrences[3].start)
+        # Beyond it, occurrences are generated but not stored
+        start = self.start + appsettings.REPEAT_LIMIT + timedelta(days=30, hours=12)
+        stored_count = Occurrence.objects.count()
+        occurrences = events.expand_occurrences(
+            start, start + timedelta(days=7))
+        self.assertEqual(7, len(occurrences))
+        self.assertTrue(all(o.pk is None for o in occurrences))
+        self.assertEqual(
+            [timedelta(days=1)] * 6,
+            [b.local_start.date() - a.local_start.date()
+             for a, b in zip(occurrences, occurrences[1:])])
+        self.assertEqual(stored_count, Occurrence.objects.count())
+
 
 class TestEventManager(TestCase):
     def setUp(self):
@@ -871,6 +1261,48 @@ class TestEventManager(TestCase):
             set(SimpleEvent.objects.with_upcoming_or_no_occurrences()),
             set([self.parent_event, self.child_event_2, self.child_event_3]))
 
+    def test_upcoming_with_stale_next_start(self):
+        self.assertEqual(
+            set(SimpleEvent.objects.upcoming()), set([self.child_event_2]))
+        # Events whose next occurrence has started since they were refreshed
+        # are only upcoming if they have a later occurrence
+        models.EventBase.objects \
+            .filter(pk__in=[self.child_event_1.pk, self.child_event_2.pk]) \
+            .update(next_start=djtz.now() - timedelta(hours=2))
+        self.assertEqual(
+            set(SimpleEvent.objects.upcoming()), set([self.child_event_2]))
+
+    def test_order_by_next_occurrence(self):
+        now = djtz.now()
+        child_event_4 = G(SimpleEvent, part_of=self.parent_event, title="4")
+        G(Occurrence, event=child_event_4,
+          start=now + timedelta(hours=3), end=now + timedelta(hours=4))
+        child_event_5 = G(SimpleEvent, title="5")
+        G(Occurrence, event=child_event_5,
+          start=now - timedelta(hours=1), end=now - timedelta(minutes=30))
+        G(Occurrence, event=child_event_5,
+          start=now + timedelta(hours=2), end=now + timedelta(hours=3))
+        # The next occurrence of event 5 has started since it was refreshed
+        models.EventBase.objects.filter(pk=child_event_5.pk) \
+            .update(next_start=now - timedelta(hours=1))
+        # Event 3 has the occurrences of the event it is part of
+        G(Occurrence, event=self.parent_event,
+          start=now + timedelta(minutes=150), end=now + timedelta(hours=3))
+        self.assertEqual(
+            [
+                self.child_event_2,
+                child_event_5,
+                self.child_event_3,
+                child_event_4,
+                self.child_event_1,
+            ],
+            list(SimpleEvent.objects.exclude(pk=self.parent_event.pk)
+                 .order_by_next_occurrence()))
+        # Ordering doesn't update stale events
+        self.assertEqual(
+            now - timedelta(hours=1),
+            SimpleEvent.objects.get(pk=child_event_5.pk).next_start)
+
     def test_contained(self):
         # fails here on travis
         self.assertEqual(
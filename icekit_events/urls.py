@@ -7,11 +7,18 @@ URLconf for ``icekit_events`` app.
 
 from django.conf.urls import url
 
-from icekit_events.views import event, event_type
+from icekit_events.views import calendar_ical, event, event_ical, \
+    event_type, event_type_ical
 
 urlpatterns = [
+    url(r'^calendar\.ics$',
+        calendar_ical, name='icekit_events_calendar_ical'),
     url(r'^(?P<slug>[\w-]+)/$',
         event, name='icekit_events_eventbase_detail'),
+    url(r'^(?P<slug>[\w-]+)\.ics$',
+        event_ical, name='icekit_events_eventbase_ical'),
     url(r'^types/(?P<slug>[\w-]+)/$',
         event_type, name='icekit_events_eventtype_detail'),
+    url(r'^types/(?P<slug>[\w-]+)\.ics$',
+        event_type_ical, name='icekit_events_eventtype_ical'),
 ]
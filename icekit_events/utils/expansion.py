@@ -0,0 +1,128 @@
+"""
+Expansion of the occurrences of events within any window of time, without
+storing occurrences first.
+
+Occurrences of repeating events are only stored up to ``REPEAT_LIMIT`` ahead,
+see `EventBase.extend_occurrences()`. `expand_occurrences()` merges the stored
+occurrences in a window with unsaved occurrences generated from the events'
+repeat generators for the times no occurrence is stored for, so views can
+show e.g. the next 12 months of a calendar.
+"""
+from datetime import timedelta
+
+from dateutil import rrule
+
+from icekit_events.models import EventRepeatsGenerator, Occurrence
+from icekit_events.utils.timeutils import coerce_dt_awareness, \
+    coerce_naive, zero_datetime
+
+
+def _get_duration(generator):
+    # As `EventRepeatsGenerator.generate()`
+    return generator.duration or timedelta(days=1)
+
+
+def _get_generated_starts(generator, start, end, starts_by_rule):
+    """
+    Return the naive start times of `generator` for occurrences overlapping
+    the window from `start` to `end`.
+
+    Start times are shared by generators with the same complete rule, e.g.
+    those of draft and published copies of events, so are only generated
+    once for each rule, in `starts_by_rule`.
+    """
+    rule = generator._build_complete_rrule(
+        until=generator.repeat_end or end)
+    duration = _get_duration(generator)
+    key = (rule, duration)
+    if key not in starts_by_rule:
+        # `between()` excludes its bounds.
+        after = coerce_naive(start) - duration - timedelta(seconds=1)
+        starts_by_rule[key] = rrule.rrulestr(rule, forceset=True) \
+            .between(after, coerce_naive(end))
+    return starts_by_rule[key]
+
+
+def _make_occurrence(generator, naive_start):
+    naive_end = naive_start + _get_duration(generator)
+    if generator.is_all_day:
+        # As `Occurrence.save()` stores all-day times
+        naive_start = zero_datetime(naive_start)
+        naive_end = zero_datetime(naive_end)
+    start = coerce_dt_awareness(naive_start)
+    end = coerce_dt_awareness(naive_end)
+    return Occurrence(
+        event=generator.event,
+        generator=generator,
+        start=start,
+        end=end,
+        original_start=start,
+        original_end=end,
+        is_all_day=generator.is_all_day,
+    )
+
+
+def _overlaps(occurrence, start, end):
+    # As `OccurrenceQueryset.overlapping()`
+    if occurrence.is_all_day:
+        return occurrence.end >= coerce_dt_awareness(zero_datetime(start)) \
+            and occurrence.start < coerce_dt_awareness(zero_datetime(end))
+    return occurrence.end > start and occurrence.start < end
+
+
+def expand_occurrences(events, start, end):
+    """
+    Return the occurrences of `events` overlapping the window from `start` to
+    `end`, ordered by start. Occurrences that are not stored yet are included
+    as unsaved `Occurrence` instances with no primary key.
+
+    Stored occurrences, including those cancelled, hidden or modified by a
+    user, take the place of any generated for the same time, so callers can
+    filter all occurrences the same way.
+
+    :param events: A queryset of events.
+    """
+    start = coerce_dt_awareness(start)
+    end = coerce_dt_awareness(end)
+    event_ids = events.order_by().values('pk')
+
+    # Stored occurrences in the window, and those that were moved out of it
+    stored_occurrences = Occurrence.objects.filter(event__in=event_ids)
+    stored = list(
+        (
+            stored_occurrences.overlapping(start, end) |
+            stored_occurrences.filter(
+                original_start__gte=start, original_start__lt=end)
+        ).select_related('event'))
+    stored_starts = set()
+    stored_ends = set()
+    for occurrence in stored:
+        stored_starts.add((
+            occurrence.event_id,
+            coerce_naive(occurrence.original_start or occurrence.start)))
+        stored_ends.add((
+            occurrence.event_id,
+            coerce_naive(occurrence.original_end or occurrence.end)))
+    occurrences = [o for o in stored if _overlaps(o, start, end)]
+
+    generators = EventRepeatsGenerator.objects \
+        .filter(event__in=event_ids) \
+        .exclude(repeat_end__lte=start) \
+        .filter(start__lt=end) \
+        .select_related('event')
+    starts_by_rule = {}
+    for generator in generators:
+        for naive_start in _get_generated_starts(
+                generator, start, end, starts_by_rule):
+            # Skip times with a stored occurrence, which may have been
+            # modified by a user, like `EventBase.missing_occurrence_data()`
+            naive_end = naive_start + _get_duration(generator)
+            if (generator.event_id, naive_start) in stored_starts \
+                    or (generator.event_id, naive_end) in stored_ends:
+                continue
+            occurrence = _make_occurrence(generator, naive_start)
+            if _overlaps(occurrence, start, end):
+                occurrences.append(occurrence)
+
+    occurrences.sort(key=lambda o: (o.start, not o.is_all_day, o.event_id))
+    return occurrences
@@ -0,0 +1,324 @@
+"""
+Rendering of iCalendar (RFC 5545) feeds of events.
+
+Repeating occurrences are described by a single VEVENT with the RRULE of the
+generator that created them, instead of a VEVENT per occurrence. Generated
+occurrences that were cancelled, hidden or modified by a user are excluded by
+EXDATEs, and modified occurrences and those added by a user get VEVENTs of
+their own.
+
+Times are local times in the current timezone, which is described by a
+VTIMEZONE, so repeating occurrences keep their time of day after daylight
+savings changes.
+
+Feeds are rendered line by line, so responses can be streamed.
+"""
+from datetime import timedelta
+
+from django.contrib.sites.models import Site
+from django.db.models import Min, Q
+from django.utils import timezone
+from django.utils.encoding import force_bytes, force_text
+from django.utils.timezone import get_current_timezone, \
+    get_current_timezone_name, utc
+
+from icekit_events.models import EventRepeatsGenerator, Occurrence
+from icekit_events.utils.timeutils import coerce_naive, format_naive_ical_dt
+
+CRLF = '\r\n'
+
+# Maximum length of a line in octets, excluding the line break.
+MAX_LINE_LENGTH = 75
+
+# Number of events to render VEVENTs for at a time.
+EVENT_CHUNK_SIZE = 100
+
+
+def escape_text(value):
+    """
+    Escape a TEXT property value.
+    """
+    return force_text(value) \
+        .replace('\\', '\\\\') \
+        .replace(';', '\\;') \
+        .replace(',', '\\,') \
+        .replace('\r\n', '\\n') \
+        .replace('\n', '\\n')
+
+
+def fold_line(line):
+    """
+    Fold a content line longer than 75 octets onto continuation lines,
+    without splitting multi-byte characters, and add the line break.
+    """
+    folded = []
+    length = 0
+    limit = MAX_LINE_LENGTH
+    for char in force_text(line):
+        char_length = len(force_bytes(char))
+        if length + char_length > limit:
+            folded.append(CRLF + ' ')
+            length = 0
+            # Continuation lines start with a space
+            limit = MAX_LINE_LENGTH - 1
+        folded.append(char)
+        length += char_length
+    folded.append(CRLF)
+    return u''.join(folded)
+
+
+def format_utc_dt(dt):
+    return dt.astimezone(utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def format_utc_offset(offset):
+    seconds = int(offset.total_seconds())
+    sign = '-' if seconds < 0 else '+'
+    minutes, seconds = divmod(abs(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    value = '%s%02d%02d' % (sign, hours, minutes)
+    if seconds:
+        value += '%02d' % seconds
+    return value
+
+
+def get_timezone_transitions(tz, since):
+    """
+    Return ``(utc_dt, offset_from, offset_to, is_dst, name)`` tuples for the
+    changes of offset of a `pytz` timezone from the naive UTC datetime `since`
+    on, as far ahead as `pytz` knows them, starting with the offset in effect
+    at `since`.
+    """
+    # Zones with a fixed offset, e.g. UTC, have no transitions
+    transition_times = getattr(tz, '_utc_transition_times', None) or [since]
+    transition_info = getattr(tz, '_transition_info', None) or [
+        (tz.utcoffset(since), tz.dst(since) or timedelta(0), tz.tzname(since))]
+    transitions = []
+    previous_offset = None
+    for utc_dt, (offset, dst, name) in zip(
+            transition_times, transition_info):
+        if utc_dt <= since:
+            # Only the last change up to `since` is in effect
+            transitions = [(since, offset, offset, bool(dst), name)]
+        else:
+            transitions.append(
+                (utc_dt, previous_offset, offset, bool(dst), name))
+        previous_offset = offset
+    return transitions
+
+
+def iter_vtimezone_lines(tz, tzid, since):
+    """
+    Yield the VTIMEZONE lines for a `pytz` timezone, with an observance for
+    each change of offset from the naive UTC datetime `since` on.
+    """
+    yield u'BEGIN:VTIMEZONE'
+    yield u'TZID:%s' % tzid
+    for utc_dt, offset_from, offset_to, is_dst, name in \
+            get_timezone_transitions(tz, since):
+        component = is_dst and u'DAYLIGHT' or u'STANDARD'
+        yield u'BEGIN:%s' % component
+        # Observances start at local times before the change
+        yield u'DTSTART:%s' % (utc_dt + offset_from).strftime('%Y%m%dT%H%M%S')
+        yield u'TZOFFSETFROM:%s' % format_utc_offset(offset_from)
+        yield u'TZOFFSETTO:%s' % format_utc_offset(offset_to)
+        yield u'TZNAME:%s' % escape_text(name)
+        yield u'END:%s' % component
+    yield u'END:VTIMEZONE'
+
+
+def format_dt_property(name, dt, is_all_day):
+    """
+    Return a DTSTART or similar property for `dt`. All-day datetimes are
+    dates, and others are local times in the current timezone, see
+    `iter_vtimezone_lines()`.
+    """
+    if is_all_day:
+        return u'%s;VALUE=DATE:%s' % (
+            name, coerce_naive(dt).date().strftime('%Y%m%d'))
+    return u'%s;TZID=%s:%s' % (
+        name, get_current_timezone_name(), format_naive_ical_dt(dt))
+
+
+def format_end_property(start, end, is_all_day):
+    if is_all_day:
+        # All-day ends are the last microsecond of the last day, but DTEND
+        # dates are exclusive.
+        end_date = coerce_naive(end).date() + timedelta(days=1)
+        if end_date <= coerce_naive(start).date():
+            end_date = coerce_naive(start).date() + timedelta(days=1)
+        return u'DTEND;VALUE=DATE:%s' % end_date.strftime('%Y%m%d')
+    return format_dt_property('DTEND', end, is_all_day)
+
+
+def get_rrule(generator):
+    """
+    Return the RRULE value for a repeating generator, with its exclusive
+    repeat end as an inclusive UNTIL constraint.
+    """
+    rule = generator.recurrence_rule
+    if rule.upper().startswith('RRULE:'):
+        rule = rule[len('RRULE:'):]
+    if generator.repeat_end:
+        if generator.is_all_day:
+            # The repeat end date of all-day generators is included
+            until = coerce_naive(generator.repeat_end).date().strftime('%Y%m%d')
+        else:
+            until = format_utc_dt(generator.repeat_end - timedelta(seconds=1))
+        rule += ';UNTIL=%s' % until
+    return rule
+
+
+def is_repeating(generator):
+    return bool(generator and generator.recurrence_rule)
+
+
+def iter_vevent_lines(event, uid, start, end, is_all_day, url,
+                      rrule=None, exdates=(), is_cancelled=False,
+                      cancel_reason=None):
+    yield u'BEGIN:VEVENT'
+    yield u'UID:%s' % uid
+    yield u'DTSTAMP:%s' % format_utc_dt(event.modified)
+    yield u'LAST-MODIFIED:%s' % format_utc_dt(event.modified)
+    yield format_dt_property('DTSTART', start, is_all_day)
+    yield format_end_property(start, end, is_all_day)
+    if rrule:
+        yield u'RRULE:%s' % rrule
+    for exdate in sorted(exdates):
+        yield format_dt_property('EXDATE', exdate, is_all_day)
+    summary = event.title
+    if is_cancelled:
+        yield u'STATUS:CANCELLED'
+        if cancel_reason:
+            summary = u'%s [%s]' % (summary, cancel_reason)
+    yield u'SUMMARY:%s' % escape_text(summary)
+    if url:
+        yield u'URL:%s' % url
+    yield u'END:VEVENT'
+
+
+def iter_event_lines(events, generators, occurrences, domain, build_url):
+    """
+    Yield VEVENT lines for a chunk of events, given their generators and the
+    occurrences that are exceptions to their generators.
+    """
+    generators_by_event = {}
+    for generator in generators:
+        generators_by_event.setdefault(generator.event_id, []).append(generator)
+    occurrences_by_event = {}
+    for occurrence in occurrences:
+        occurrences_by_event.setdefault(
+            occurrence.event_id, []).append(occurrence)
+
+    for event in events:
+        url = build_url(event.get_absolute_url())
+        event_generators = generators_by_event.get(event.pk, [])
+
+        exdates = []
+        standalone = []
+        for occurrence in occurrences_by_event.get(event.pk, []):
+            if is_repeating(occurrence.generator):
+                # Exclude generated occurrences that were cancelled, hidden
+                # or modified from the rules. Those of published events
+                # refer to the draft event's generators, so are excluded
+                # from all the event's rules, which only affects times that
+                # match a rule.
+                exdates.append(
+                    occurrence.original_start or occurrence.start)
+                if occurrence.is_cancelled or occurrence.is_hidden:
+                    continue
+            if not occurrence.is_hidden:
+                standalone.append(occurrence)
+
+        for generator in event_generators:
+            if not is_repeating(generator):
+                continue
+            for line in iter_vevent_lines(
+                event,
+                uid=u'generator-%s@%s' % (generator.pk, domain),
+                start=generator.start,
+                end=generator.end,
+                is_all_day=generator.is_all_day,
+                url=url,
+                rrule=get_rrule(generator),
+                exdates=exdates,
+            ):
+                yield line
+
+        for occurrence in standalone:
+            for line in iter_vevent_lines(
+                event,
+                uid=u'occurrence-%s@%s' % (occurrence.pk, domain),
+                start=occurrence.start,
+                end=occurrence.end,
+                is_all_day=occurrence.is_all_day,
+                url=url,
+                is_cancelled=occurrence.is_cancelled,
+                cancel_reason=occurrence.cancel_reason,
+            ):
+                yield line
+
+
+def iter_calendar(events, name, build_url):
+    """
+    Yield the folded lines of an iCalendar feed of `events`.
+
+    :param events: A queryset of events.
+    :param name: The name of the calendar.
+    :param build_url: A function returning the absolute URL of a path.
+    """
+    domain = Site.objects.get_current().domain
+    tzid = get_current_timezone_name()
+    header = [
+        u'BEGIN:VCALENDAR',
+        u'VERSION:2.0',
+        u'PRODID:-//GLAMkit//icekit-events//EN',
+        u'CALSCALE:GREGORIAN',
+        u'X-WR-CALNAME:%s' % escape_text(name),
+        u'X-WR-TIMEZONE:%s' % tzid,
+    ]
+    for line in header:
+        yield fold_line(line)
+
+    event_ids = list(events.order_by('pk').values_list('pk', flat=True))
+
+    # The timezone is described from the earliest time in the feed on
+    event_pks = events.order_by().values('pk')
+    starts = [
+        Occurrence.objects.filter(event__in=event_pks)
+        .aggregate(start=Min('start'))['start'],
+        EventRepeatsGenerator.objects.filter(event__in=event_pks)
+        .aggregate(start=Min('start'))['start'],
+        timezone.now(),
+    ]
+    since = min(s for s in starts if s is not None)
+    for line in iter_vtimezone_lines(
+            get_current_timezone(), tzid,
+            since.astimezone(utc).replace(tzinfo=None)):
+        yield fold_line(line)
+
+    for i in range(0, len(event_ids), EVENT_CHUNK_SIZE):
+        chunk_ids = event_ids[i:i + EVENT_CHUNK_SIZE]
+        chunk_events = events.model.objects \
+            .filter(pk__in=chunk_ids).non_polymorphic().order_by('pk')
+        generators = EventRepeatsGenerator.objects \
+            .filter(event_id__in=chunk_ids)
+        # Only occurrences that are exceptions to a repeating generator, or
+        # that were not generated by one, are needed.
+        occurrences = Occurrence.objects \
+            .filter(event_id__in=chunk_ids) \
+            .select_related('generator') \
+            .filter(
+                Q(generator__isnull=True) |
+                Q(generator__recurrence_rule__isnull=True) |
+                Q(generator__recurrence_rule='') |
+                Q(is_cancelled=True) |
+                Q(is_hidden=True) |
+                Q(is_protected_from_regeneration=True)
+            ) \
+            .order_by('start', 'pk')
+        for line in iter_event_lines(
+                chunk_events, generators, occurrences, domain, build_url):
+            yield fold_line(line)
+
+    yield fold_line(u'END:VCALENDAR')
@@ -0,0 +1,104 @@
+"""
+Bounded expansion of recurrence rules.
+
+`dateutil` only stops expanding a rule when it reaches the rule's ``UNTIL``
+or ``COUNT`` with an occurrence, or the year 9999. A rule that never matches,
+e.g. ``FREQ=DAILY;BYMONTH=2;BYMONTHDAY=30``, is scanned up to the year 9999
+by the first attempt to get an occurrence, which takes seconds even when the
+number of results is limited.
+
+`limit_expansion()` bounds the scan instead, by counting the periods
+`dateutil` builds the masks of candidate days for: once for each month
+scanned, or each year for yearly rules. It expands copies of the rules with
+their own `_iter()`, which builds masks with `_BudgetedIterInfo`, so rules
+expanded elsewhere, and `dateutil` itself, are not affected. This relies on
+`rrule._iter()` calling `_iterinfo.rebuild()` for each period, as it does in
+the versions of `dateutil` allowed by ``setup.py``.
+"""
+import copy
+import itertools
+import types
+
+from dateutil import rrule
+
+
+class ExpansionLimitExceeded(Exception):
+    pass
+
+
+class _Budget(object):
+
+    def __init__(self, periods):
+        self.periods = periods
+
+    def spend(self):
+        if self.periods <= 0:
+            raise ExpansionLimitExceeded()
+        self.periods -= 1
+
+
+class _BudgetedIterInfo(rrule._iterinfo):
+
+    def rebuild(self, year, month):
+        self.rrule._budget.spend()
+        super(_BudgetedIterInfo, self).rebuild(year, month)
+
+
+def _copy_function(function, **global_overrides):
+    """
+    Return a copy of `function` that looks up its globals in a copy of its
+    module's namespace, updated with `global_overrides`.
+    """
+    func_globals = dict(function.__globals__, **global_overrides)
+    return types.FunctionType(
+        function.__code__, func_globals, function.__name__,
+        function.__defaults__, function.__closure__)
+
+
+class _BudgetedRule(rrule.rrule):
+    _iter = _copy_function(
+        rrule.rrule.__dict__['_iter'], _iterinfo=_BudgetedIterInfo)
+
+
+def _budgeted_rule(rule, budget):
+    rule = copy.copy(rule)
+    rule.__class__ = _BudgetedRule
+    rule._budget = budget
+    # Expand the copy afresh, rather than from the original's cache
+    rule._cache = None
+    rule._cache_complete = False
+    return rule
+
+
+def limit_expansion(rruleset, max_periods):
+    """
+    Return a copy of `rruleset` that raises `ExpansionLimitExceeded` once its
+    rules have scanned `max_periods` months (or years, for yearly rules) in
+    total.
+    """
+    budget = _Budget(max_periods)
+    limited = rrule.rruleset()
+    for rule in rruleset._rrule:
+        limited.rrule(_budgeted_rule(rule, budget))
+    for rule in rruleset._exrule:
+        limited.exrule(_budgeted_rule(rule, budget))
+    for dt in rruleset._rdate:
+        limited.rdate(dt)
+    for dt in rruleset._exdate:
+        limited.exdate(dt)
+    return limited
+
+
+def get_limited_occurrences(rruleset, limit, max_periods):
+    """
+    Return up to `limit` occurrences of `rruleset`, found within
+    `max_periods` months (or years, for yearly rules).
+    """
+    occurrences = []
+    try:
+        for dt in itertools.islice(
+                limit_expansion(rruleset, max_periods), limit):
+            occurrences.append(dt)
+    except ExpansionLimitExceeded:
+        pass
+    return occurrences
@@ -4,17 +4,23 @@ Views for ``icekit_events`` app.
 
 # Do not use generic class based views unless there is a really good reason to.
 # Functional views are much easier to comprehend and maintain.
+import hashlib
 import warnings
 
+from django.contrib.sites.models import Site
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
-from django.http import Http404
+from django.db.models import Count, Max, Q
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.template import RequestContext
 from django.template.response import TemplateResponse
+from django.utils.encoding import force_bytes, force_text
+from django.views.decorators.http import condition
+
+from icekit.publishing.middleware import is_draft_request_context
 
 from . import models
-from .utils import permissions
+from .utils import ical, permissions
 
 
 def index(request):
@@ -109,3 +115,78 @@ def occurrence(request, event_id, occurrence_id):
     }
     return TemplateResponse(
         request,   'icekit_events/occurrence.html', context)
+
+
+def _get_calendar_events():
+    return models.EventBase.objects.visible().filter(show_in_calendar=True)
+
+
+def _get_event_type_events(slug):
+    return models.EventBase.objects.visible() \
+        .filter(Q(primary_type__slug=slug) | Q(secondary_types__slug=slug)) \
+        .distinct()
+
+
+def _get_ical_etag(events):
+    """
+    Return an ETag for an iCalendar feed of `events`, derived from the latest
+    modified time and count of the events, their generators and occurrences,
+    which changes when any of them are added, changed or deleted.
+    """
+    event_ids = events.order_by().values('pk')
+    parts = [is_draft_request_context()]
+    for qs in (
+        events,
+        models.EventRepeatsGenerator.objects.filter(event__in=event_ids),
+        models.Occurrence.objects.filter(event__in=event_ids),
+    ):
+        values = qs.order_by().aggregate(
+            modified=Max('modified'), count=Count('pk'))
+        parts += [
+            values['count'],
+            values['modified'] and values['modified'].isoformat(),
+        ]
+    return hashlib.md5(
+        force_bytes(u'|'.join(force_text(p) for p in parts))).hexdigest()
+
+
+def _ical_response(request, events, name, filename):
+    response = StreamingHttpResponse(
+        ical.iter_calendar(events, name, request.build_absolute_uri),
+        content_type='text/calendar; charset=utf-8',
+    )
+    response['Content-Disposition'] = 'inline; filename="%s.ics"' % filename
+    return response
+
+
+@condition(etag_func=lambda request: _get_ical_etag(_get_calendar_events()))
+def calendar_ical(request):
+    """
+    iCalendar feed of all events shown in the calendar.
+    """
+    return _ical_response(
+        request, _get_calendar_events(), Site.objects.get_current().name,
+        'calendar')
+
+
+@condition(etag_func=lambda request, slug: _get_ical_etag(
+    models.EventBase.objects.visible().filter(slug=slug)))
+def event_ical(request, slug):
+    """
+    iCalendar feed of an event's occurrences.
+    """
+    event = get_object_or_404(models.EventBase.objects.visible(), slug=slug)
+    return _ical_response(
+        request, models.EventBase.objects.filter(pk=event.pk), event.title,
+        slug)
+
+
+@condition(etag_func=lambda request, slug: _get_ical_etag(
+    _get_event_type_events(slug)))
+def event_type_ical(request, slug):
+    """
+    iCalendar feed of the events of a type.
+    """
+    type = get_object_or_404(models.EventType.objects.all(), slug=slug)
+    return _ical_response(
+        request, _get_event_type_events(slug), type.title, slug)
@@ -163,7 +163,9 @@ setuptools.setup(
             'recommonmark',
         ],
         'events': [
-            'python-dateutil',
+            # Recurrence rule previews rely on dateutil internals, see
+            # `icekit_events.utils.recurrence`
+            'python-dateutil>=2.5,<2.10',
             'six',
             'sqlparse',  # Required for SQL migrations, apparently
             'django-colorful',